@@ -0,0 +1,12 @@
+# Root conftest - loads the shared plugins in testkit/ for every test directory
+
+pytest_plugins = [
+    "testkit.replay",
+    "testkit.fetch",
+    "testkit.benchmark",
+    "testkit.profiling",
+    "testkit.scheduler",
+    "testkit.impact",
+    "testkit.stream",
+    "pytester",
+]
@@ -26,6 +26,27 @@ function setupEventListeners() {
         });
     }
     
+    // Todo rows: one delegated handler instead of inline handlers per row
+    const todoListDiv = document.getElementById('todo-list');
+    if (todoListDiv) {
+        todoListDiv.addEventListener('click', handleTodoClick);
+        todoListDiv.addEventListener('scroll', scheduleRenderTodos, { passive: true });
+    }
+    
+    // Write debounced todo changes before the page goes away
+    window.addEventListener('pagehide', flushPendingTodos);
+    document.addEventListener('visibilitychange', function() {
+        if (document.visibilityState === 'hidden') {
+            flushPendingTodos();
+        }
+    });
+    
+    // Event log: re-render the visible rows when scrolled
+    const eventLog = document.getElementById('event-log');
+    if (eventLog) {
+        eventLog.addEventListener('scroll', scheduleEventLogRender, { passive: true });
+    }
+    
     // Click test button
     const clickTestBtn = document.getElementById('click-test-btn');
     if (clickTestBtn) {
@@ -476,6 +497,23 @@ async function testFetchAPI() {
 }
 
 // Todo Application Functions
+//
+// Rows are keyed by todo id: a change touches only its own row, and long
+// lists (over TODO_VIRTUAL_THRESHOLD items) render just the rows in view
+// between two spacers. localStorage writes are debounced, so a burst of
+// changes serializes the list once.
+const TODO_VIRTUAL_THRESHOLD = 200;
+const TODO_ROW_PITCH = 46;      // px per row in virtual mode (see #todo-list.virtual in index.html)
+const TODO_OVERSCAN = 5;        // extra rows rendered above and below the viewport
+const TODO_SAVE_DELAY = 250;    // ms to wait for more changes before writing
+
+const todoRows = new Map();     // todo id -> rendered row element
+let todoTopSpacer = null;
+let todoBottomSpacer = null;
+let lastTodoId = 0;
+let todoSaveTimer = null;
+let todoRenderPending = false;
+
 function addTodo() {
     const input = document.getElementById('todo-input');
     const text = input.value.trim();
@@ -483,75 +521,332 @@ function addTodo() {
     if (text) {
         addTodoItem(text);
         input.value = '';
-        renderTodos();
     }
 }
 
+// Date.now() alone repeats when two todos are added in the same millisecond
+function nextTodoId() {
+    lastTodoId = Math.max(Date.now(), lastTodoId + 1);
+    return lastTodoId;
+}
+
 function addTodoItem(text) {
     const todo = {
-        id: Date.now(),
+        id: nextTodoId(),
         text: text,
         completed: false,
         createdAt: new Date()
     };
     todoList.push(todo);
-    saveTodos();
+    scheduleSaveTodos();
+    renderTodos();
 }
 
 function toggleTodo(index) {
     if (index >= 0 && index < todoList.length) {
-        todoList[index].completed = !todoList[index].completed;
-        saveTodos();
-        renderTodos();
+        const todo = todoList[index];
+        todo.completed = !todo.completed;
+        scheduleSaveTodos();
+        const row = todoRows.get(todo.id);
+        if (row) {
+            updateTodoRow(row, todo);
+        }
     }
 }
 
 function deleteTodo(index) {
     if (index >= 0 && index < todoList.length) {
         todoList.splice(index, 1);
-        saveTodos();
+        scheduleSaveTodos();
         renderTodos();
     }
 }
 
+function createTodoRow(todo) {
+    const row = document.createElement('div');
+    row.dataset.id = todo.id;
+    const text = document.createElement('span');
+    const actions = document.createElement('div');
+    const toggle = document.createElement('button');
+    toggle.dataset.action = 'toggle';
+    const remove = document.createElement('button');
+    remove.dataset.action = 'delete';
+    remove.textContent = 'Delete';
+    actions.append(toggle, remove);
+    row.append(text, actions);
+    updateTodoRow(row, todo);
+    return row;
+}
+
+// Bring a row in line with its todo, writing only what differs
+function updateTodoRow(row, todo) {
+    const className = `todo-item ${todo.completed ? 'completed' : ''}`;
+    if (row.className !== className) {
+        row.className = className;
+    }
+    const text = row.firstChild;
+    if (text.textContent !== todo.text) {
+        text.textContent = todo.text;
+    }
+    const toggle = row.querySelector('[data-action="toggle"]');
+    const label = todo.completed ? 'Undo' : 'Complete';
+    if (toggle.textContent !== label) {
+        toggle.textContent = label;
+    }
+}
+
+// Index range of todoList that should be in the DOM
+function visibleTodoRange(todoListDiv) {
+    if (todoList.length <= TODO_VIRTUAL_THRESHOLD) {
+        return [0, todoList.length];
+    }
+    const first = Math.floor(todoListDiv.scrollTop / TODO_ROW_PITCH) - TODO_OVERSCAN;
+    const count = Math.ceil(todoListDiv.clientHeight / TODO_ROW_PITCH) + 2 * TODO_OVERSCAN;
+    const start = Math.max(0, Math.min(first, todoList.length - count));
+    return [start, Math.min(todoList.length, start + count)];
+}
+
+// Patch the rendered window of rows: reuse rows by id, move them only
+// when out of order and drop rows that left the window or the list
 function renderTodos() {
     const todoListDiv = document.getElementById('todo-list');
-    todoListDiv.innerHTML = '';
-    
-    todoList.forEach((todo, index) => {
-        const todoDiv = document.createElement('div');
-        todoDiv.className = `todo-item ${todo.completed ? 'completed' : ''}`;
-        todoDiv.innerHTML = `
-            <span>${todo.text}</span>
-            <div>
-                <button onclick="toggleTodo(${index})">${todo.completed ? 'Undo' : 'Complete'}</button>
-                <button onclick="deleteTodo(${index})">Delete</button>
-            </div>
-        `;
-        todoListDiv.appendChild(todoDiv);
-    });
+    if (!todoTopSpacer || todoTopSpacer.parentNode !== todoListDiv) {
+        todoListDiv.innerHTML = '';
+        todoRows.clear();
+        todoTopSpacer = document.createElement('div');
+        todoBottomSpacer = document.createElement('div');
+        todoListDiv.append(todoTopSpacer, todoBottomSpacer);
+    }
+    todoListDiv.classList.toggle('virtual', todoList.length > TODO_VIRTUAL_THRESHOLD);
+    const [start, end] = visibleTodoRange(todoListDiv);
+    const rowPitch = todoList.length > TODO_VIRTUAL_THRESHOLD ? TODO_ROW_PITCH : 0;
+    todoTopSpacer.style.height = `${start * rowPitch}px`;
+    todoBottomSpacer.style.height = `${(todoList.length - end) * rowPitch}px`;
+
+    const wanted = new Set();
+    for (let index = start; index < end; index++) {
+        wanted.add(todoList[index].id);
+    }
+    const dropRow = (row) => {
+        const next = row.nextSibling;
+        todoRows.delete(Number(row.dataset.id));
+        row.remove();
+        return next;
+    };
+
+    let cursor = todoTopSpacer.nextSibling;
+    for (let index = start; index < end; index++) {
+        while (cursor !== todoBottomSpacer && !wanted.has(Number(cursor.dataset.id))) {
+            cursor = dropRow(cursor);
+        }
+        const todo = todoList[index];
+        let row = todoRows.get(todo.id);
+        if (row) {
+            updateTodoRow(row, todo);
+        } else {
+            row = createTodoRow(todo);
+            todoRows.set(todo.id, row);
+        }
+        if (row === cursor) {
+            cursor = cursor.nextSibling;
+        } else {
+            todoListDiv.insertBefore(row, cursor);
+        }
+    }
+    while (cursor !== todoBottomSpacer) {
+        cursor = dropRow(cursor);
+    }
+}
+
+// Scroll events can fire many times per frame; render once per frame
+function scheduleRenderTodos() {
+    if (!todoRenderPending) {
+        todoRenderPending = true;
+        requestAnimationFrame(() => {
+            todoRenderPending = false;
+            renderTodos();
+        });
+    }
+}
+
+function handleTodoClick(event) {
+    const button = event.target.closest('button[data-action]');
+    const row = button && button.closest('.todo-item');
+    if (!row) {
+        return;
+    }
+    const id = Number(row.dataset.id);
+    const index = todoList.findIndex(todo => todo.id === id);
+    if (button.dataset.action === 'toggle') {
+        toggleTodo(index);
+    } else {
+        deleteTodo(index);
+    }
+}
+
+function scheduleSaveTodos() {
+    clearTimeout(todoSaveTimer);
+    todoSaveTimer = setTimeout(saveTodos, TODO_SAVE_DELAY);
 }
 
+// Write now; also called when the page is hidden so no change is lost
 function saveTodos() {
+    clearTimeout(todoSaveTimer);
+    todoSaveTimer = null;
     localStorage.setItem('todoList', JSON.stringify(todoList));
 }
 
+function flushPendingTodos() {
+    if (todoSaveTimer !== null) {
+        saveTodos();
+    }
+}
+
 function loadTodos() {
     const saved = localStorage.getItem('todoList');
     if (saved) {
         todoList = JSON.parse(saved);
+        // Lists saved before ids were unique may repeat an id
+        const seen = new Set();
+        todoList.forEach(todo => {
+            if (seen.has(todo.id)) {
+                todo.id = nextTodoId();
+            }
+            seen.add(todo.id);
+            lastTodoId = Math.max(lastTodoId, todo.id);
+        });
         renderTodos();
     }
 }
 
 // Utility Functions
+
+// Fixed-capacity FIFO: push is O(1) and the oldest entry is overwritten
+// once the buffer is full
+class RingBuffer {
+    constructor(capacity) {
+        this.capacity = capacity;
+        this.items = new Array(capacity);
+        this.start = 0;
+        this.size = 0;
+    }
+
+    push(item) {
+        const end = (this.start + this.size) % this.capacity;
+        this.items[end] = item;
+        if (this.size < this.capacity) {
+            this.size++;
+        } else {
+            this.start = (this.start + 1) % this.capacity;
+        }
+    }
+
+    // index 0 is the oldest entry
+    get(index) {
+        return this.items[(this.start + index) % this.capacity];
+    }
+
+    toArray() {
+        return Array.from({ length: this.size }, (_, index) => this.get(index));
+    }
+
+    clear() {
+        this.items = new Array(this.capacity);
+        this.start = 0;
+        this.size = 0;
+    }
+}
+
+// Event log: entries go into a ring buffer, the DOM is updated at most
+// once per animation frame and only the rows in view exist, so memory and
+// per-event cost stay constant however long the session runs
+const EVENT_LOG_CAPACITY = 1000;
+const EVENT_LOG_ROW_HEIGHT = 20;   // px, matches .event-log-row in index.html
+const EVENT_LOG_MAX_HEIGHT = 200;  // px, matches #event-log in index.html
+const EVENT_LOG_OVERSCAN = 3;
+
+const eventLogEntries = new RingBuffer(EVENT_LOG_CAPACITY);
+let eventLogRenderPending = false;
+let eventLogSizer = null;
+
 function updateEventLog(message) {
+    const timestamp = new Date().toLocaleTimeString();
+    eventLogEntries.push(`[${timestamp}] ${message}`);
+    scheduleEventLogRender();
+}
+
+function scheduleEventLogRender() {
+    if (!eventLogRenderPending) {
+        eventLogRenderPending = true;
+        requestAnimationFrame(() => {
+            eventLogRenderPending = false;
+            renderEventLog();
+        });
+    }
+}
+
+// Position a small pool of rows over the visible slice of the buffer
+function renderEventLog() {
     const eventLog = document.getElementById('event-log');
-    if (eventLog) {
-        const timestamp = new Date().toLocaleTimeString();
-        eventLog.innerHTML += `<div>[${timestamp}] ${message}</div>`;
+    if (!eventLog) {
+        return;
+    }
+    if (!eventLogSizer || eventLogSizer.parentNode !== eventLog) {
+        eventLog.innerHTML = '';
+        eventLogSizer = document.createElement('div');
+        eventLogSizer.className = 'event-log-sizer';
+        eventLog.appendChild(eventLogSizer);
+    }
+    const atBottom = eventLog.scrollTop + eventLog.clientHeight >= eventLog.scrollHeight - EVENT_LOG_ROW_HEIGHT;
+    eventLogSizer.style.height = `${eventLogEntries.size * EVENT_LOG_ROW_HEIGHT}px`;
+    if (atBottom) {
         eventLog.scrollTop = eventLog.scrollHeight;
     }
+
+    const viewport = eventLog.clientHeight || EVENT_LOG_MAX_HEIGHT;
+    const first = Math.max(0, Math.floor(eventLog.scrollTop / EVENT_LOG_ROW_HEIGHT) - EVENT_LOG_OVERSCAN);
+    const last = Math.min(eventLogEntries.size,
+        first + Math.ceil(viewport / EVENT_LOG_ROW_HEIGHT) + 2 * EVENT_LOG_OVERSCAN);
+
+    const rows = eventLogSizer.children;
+    while (rows.length < last - first) {
+        const row = document.createElement('div');
+        row.className = 'event-log-row';
+        eventLogSizer.appendChild(row);
+    }
+    while (rows.length > last - first) {
+        eventLogSizer.lastChild.remove();
+    }
+    for (let slot = 0; slot < rows.length; slot++) {
+        const row = rows[slot];
+        const top = `${(first + slot) * EVENT_LOG_ROW_HEIGHT}px`;
+        const text = eventLogEntries.get(first + slot);
+        if (row.style.top !== top) {
+            row.style.top = top;
+        }
+        if (row.textContent !== text) {
+            row.textContent = text;
+        }
+    }
+}
+
+// The whole buffer (not just the rendered rows), oldest first
+function exportEventLog() {
+    return eventLogEntries.toArray().join('\n');
+}
+
+function downloadEventLog() {
+    const blob = new Blob([exportEventLog() + '\n'], { type: 'text/plain' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = 'event-log.txt';
+    link.click();
+    URL.revokeObjectURL(link.href);
+}
+
+function clearEventLog() {
+    eventLogEntries.clear();
+    scheduleEventLogRender();
 }
 
 function updateAsyncResults(resultDiv, results) {
@@ -0,0 +1,108 @@
+// @ts-check
+/**
+ * Streaming Playwright reporter - writes one JSON line per finished test.
+ *
+ * Writes the same format as the pytest plugin in testkit/stream.py, so both
+ * streams can be tailed live and merged into JUnit/HTML with
+ *   python -m testkit.stream --junit out.xml --html out.html test-results/*.jsonl
+ *
+ * Every line is written to the file as soon as the test ends, so
+ * `tail -f` shows it; fsync runs at most every fsyncInterval. Retries
+ * (playwright.config.js `retries`) get one line per attempt with
+ * `attempt` counting from 1; the merge tool keeps only the last attempt.
+ * The file is truncated at the start of every run, so merging it never
+ * counts an earlier run's results.
+ *
+ * Options (playwright.config.js):
+ *   outputFile     - stream path (default: test-results/results.jsonl)
+ *   fsyncInterval  - milliseconds between fsyncs (default: 1000)
+ */
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+// eslint-disable-next-line no-control-regex
+const ANSI = /\u001b\[[0-9;]*m/g;
+
+function joinOutput(chunks) {
+  return chunks.map(chunk => chunk.toString()).join('');
+}
+
+function outcomeOf(test, result) {
+  if (result.status === 'skipped') return 'skipped';
+  if (result.status === test.expectedStatus) return 'passed';
+  return result.status === 'failed' || result.status === 'timedOut' ? 'failed' : 'error';
+}
+
+class JsonlReporter {
+  constructor(options = {}) {
+    this.outputFile = options.outputFile || path.join('test-results', 'results.jsonl');
+    this.fsyncInterval = options.fsyncInterval ?? 1000;
+    this.lastSync = Date.now();
+    this.fd = null;
+    this.rootDir = process.cwd();
+  }
+
+  onBegin(config) {
+    this.rootDir = config.rootDir;
+    fs.mkdirSync(path.dirname(path.resolve(this.outputFile)), { recursive: true });
+    this.fd = fs.openSync(this.outputFile, 'w');
+    this.write({
+      event: 'session_start', suite: 'playwright', time: Date.now() / 1000,
+      host: os.hostname(), pid: process.pid,
+    });
+  }
+
+  onTestEnd(test, result) {
+    const project = test.parent.project();
+    const file = path.relative(this.rootDir, test.location.file).split(path.sep).join('/');
+    // titlePath() is ['', project, file, ...describes, title]
+    const titles = test.titlePath().slice(3);
+    const message = result.errors
+      .map(error => (error.stack || error.message || '').replace(ANSI, ''))
+      .join('\n\n');
+    const outcome = outcomeOf(test, result);
+    const firstError = result.errors.length ? (result.errors[0].message || '') : '';
+    this.write({
+      event: 'test',
+      suite: project ? project.name : 'playwright',
+      nodeid: [project ? project.name : '', file, ...titles].filter(Boolean).join(' > '),
+      classname: file,
+      name: titles.join(' › '),
+      outcome,
+      duration: result.duration / 1000,
+      start: result.startTime.getTime() / 1000,
+      attempt: result.retry + 1,
+      summary: outcome === 'skipped' ? '' : firstError.replace(ANSI, '').split('\n')[0],
+      message,
+      stdout: joinOutput(result.stdout),
+      stderr: joinOutput(result.stderr),
+      log: '',
+    });
+  }
+
+  onEnd(result) {
+    this.write({
+      event: 'session_finish', suite: 'playwright', time: Date.now() / 1000,
+      status: result.status,
+    });
+    this.sync();
+    fs.closeSync(this.fd);
+  }
+
+  write(entry) {
+    fs.writeSync(this.fd, JSON.stringify(entry) + '\n');
+    if (Date.now() - this.lastSync >= this.fsyncInterval) this.sync();
+  }
+
+  sync() {
+    fs.fsyncSync(this.fd);
+    this.lastSync = Date.now();
+  }
+
+  printsToStdio() {
+    return false;
+  }
+}
+
+module.exports = JsonlReporter;
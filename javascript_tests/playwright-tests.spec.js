@@ -18,4 +18,45 @@ test.describe('JavaScript Testing Playground', () => {
     await expect(result).toHaveClass(/success/);
     await expect(result).toContainText('Math Operations Test Passed');
   });
+
+  test('should stream test runner results with timings', async ({ page }) => {
+    await page.click('button:has-text("Run All Tests")');
+
+    const results = page.locator('#test-results');
+    await expect(results.locator('h4')).toContainText('Test Results');
+    const total = await page.evaluate(() => window.testFramework.tests.length);
+    await expect(results.locator('div')).toHaveCount(total);
+    await expect(results.locator('div').first()).toContainText(' ms)');
+  });
+
+  test('should patch only the changed todo row', async ({ page }) => {
+    await page.evaluate(() => { localStorage.clear(); todoList = []; renderTodos(); });
+    for (const text of ['first', 'second', 'third']) {
+      await page.fill('#todo-input', text);
+      await page.press('#todo-input', 'Enter');
+    }
+    const items = page.locator('#todo-list .todo-item');
+    await expect(items).toHaveCount(3);
+
+    // Tag a row; keyed patching must keep the same element when its todo changes
+    await items.nth(1).evaluate(row => { row.dataset.marker = 'kept'; });
+    await items.nth(1).locator('button:has-text("Complete")').click();
+    await expect(items.nth(1)).toHaveClass(/completed/);
+    await items.nth(0).locator('button:has-text("Delete")').click();
+    await expect(items).toHaveCount(2);
+    await expect(items.nth(0)).toHaveAttribute('data-marker', 'kept');
+  });
+
+  test('should keep the event log bounded and render only visible rows', async ({ page }) => {
+    await page.evaluate(() => {
+      for (let i = 0; i < 5000; i++) updateEventLog('event ' + i);
+    });
+    const rows = page.locator('#event-log .event-log-row');
+    await expect(rows.last()).toContainText('event 4999');
+    expect(await rows.count()).toBeLessThan(30);
+
+    const exported = await page.evaluate(() => exportEventLog().split('\n'));
+    expect(exported).toHaveLength(1000);
+    expect(exported[0]).toContain('event 4000');
+  });
 });
@@ -8,11 +8,25 @@ class TestFramework {
         this.tests = [];
         this.results = [];
         this.currentTest = null;
+        // Defaults for runAll(); override per run or with configure()
+        this.options = {
+            parallel: false,      // run async tests concurrently
+            concurrency: 4,       // max tests in flight in parallel mode
+            testTimeout: 5000,    // ms per test (0 = no limit)
+            suiteTimeout: 60000,  // ms for the whole run (0 = no limit)
+        };
     }
 
-    // Add a test to the test suite
-    test(name, testFunction) {
-        this.tests.push({ name, testFunction });
+    // Change the default run options
+    configure(options) {
+        Object.assign(this.options, options);
+    }
+
+    // Add a test to the test suite. Options: { timeout, serial }.
+    // Tests marked serial (e.g. ones that share page state) never overlap
+    // with other tests in parallel mode.
+    test(name, testFunction, options = {}) {
+        this.tests.push({ name, testFunction, timeout: options.timeout, serial: !!options.serial });
     }
 
     // Assertion methods
@@ -93,33 +107,94 @@ class TestFramework {
         }
     }
 
-    // Run all tests
-    async runAll() {
+    // Run one test, failing it with TIMEOUT after `timeout` ms.
+    // A synchronous test that never returns cannot be interrupted.
+    async runTest(test, timeout) {
+        const start = performance.now();
+        let timer = null;
+        try {
+            const run = Promise.resolve().then(() => test.testFunction());
+            if (timeout > 0) {
+                const expired = new Promise((_, reject) => {
+                    timer = setTimeout(() => reject(new TimeoutError(timeout)), timeout);
+                });
+                await Promise.race([run, expired]);
+            } else {
+                await run;
+            }
+            return { name: test.name, status: 'PASSED', error: null, duration: performance.now() - start };
+        } catch (error) {
+            const status = error instanceof TimeoutError ? 'TIMEOUT' : 'FAILED';
+            return { name: test.name, status, error: error.message, duration: performance.now() - start };
+        } finally {
+            clearTimeout(timer);
+        }
+    }
+
+    // Run all tests. Options default to this.options; onResult(result) is
+    // called as soon as each test finishes, in completion order.
+    async runAll(options = {}) {
+        const { parallel, concurrency, testTimeout, suiteTimeout } = { ...this.options, ...options };
+        const onResult = options.onResult || (() => {});
+        const deadline = suiteTimeout > 0 ? performance.now() + suiteTimeout : Infinity;
+        const counts = { PASSED: 0, FAILED: 0, TIMEOUT: 0, SKIPPED: 0 };
+        const started = performance.now();
         this.results = [];
-        let passed = 0;
-        let failed = 0;
 
         console.log('🧪 Running JavaScript Tests...');
         console.log('='.repeat(50));
 
-        for (const test of this.tests) {
+        const record = (result) => {
+            this.results.push(result);
+            counts[result.status]++;
+            const icon = { PASSED: '✅', FAILED: '❌', TIMEOUT: '⏱️', SKIPPED: '⏭️' }[result.status];
+            const detail = result.error ? `: ${result.error}` : '';
+            console.log(`${icon} ${result.name} (${result.duration.toFixed(1)} ms)${detail}`);
+            onResult(result);
+        };
+
+        const runNext = async (test) => {
+            const remaining = deadline - performance.now();
+            if (remaining <= 0) {
+                record({ name: test.name, status: 'SKIPPED', error: 'Suite timeout exceeded', duration: 0 });
+                return;
+            }
             this.currentTest = test;
-            try {
-                await test.testFunction();
-                this.results.push({ name: test.name, status: 'PASSED', error: null });
-                passed++;
-                console.log(`✅ ${test.name}`);
-            } catch (error) {
-                this.results.push({ name: test.name, status: 'FAILED', error: error.message });
-                failed++;
-                console.log(`❌ ${test.name}: ${error.message}`);
+            const perTest = test.timeout ?? testTimeout;
+            const limit = perTest > 0 ? Math.min(perTest, remaining) : remaining;
+            record(await this.runTest(test, Number.isFinite(limit) ? limit : 0));
+        };
+
+        if (parallel) {
+            // A fixed number of workers pull from a shared queue, so at most
+            // `concurrency` tests are in flight at once
+            const queue = this.tests.filter(test => !test.serial);
+            const workers = Array.from({ length: Math.max(1, Math.min(concurrency, queue.length)) }, async () => {
+                while (queue.length) {
+                    await runNext(queue.shift());
+                }
+            });
+            await Promise.all(workers);
+        }
+        for (const test of this.tests) {
+            if (!parallel || test.serial) {
+                await runNext(test);
             }
         }
 
+        const duration = performance.now() - started;
         console.log('='.repeat(50));
-        console.log(`Tests completed: ${passed} passed, ${failed} failed`);
-        
-        return { passed, failed, total: this.tests.length };
+        console.log(`Tests completed in ${duration.toFixed(1)} ms: ${counts.PASSED} passed, ` +
+            `${counts.FAILED} failed, ${counts.TIMEOUT} timed out, ${counts.SKIPPED} skipped`);
+
+        return {
+            passed: counts.PASSED,
+            failed: counts.FAILED + counts.TIMEOUT,
+            timedOut: counts.TIMEOUT,
+            skipped: counts.SKIPPED,
+            total: this.tests.length,
+            duration,
+        };
     }
 
     // Get formatted results for display
@@ -134,12 +209,19 @@ class TestFramework {
     }
 }
 
+class TimeoutError extends Error {
+    constructor(timeout) {
+        super(`Test timed out after ${Math.round(timeout)} ms`);
+        this.name = 'TimeoutError';
+    }
+}
+
 // Create global test framework instance
 window.testFramework = new TestFramework();
 
 // Global test function
-window.test = (name, testFunction) => {
-    testFramework.test(name, testFunction);
+window.test = (name, testFunction, options) => {
+    testFramework.test(name, testFunction, options);
 };
 
 // Global assertion functions
@@ -156,26 +238,45 @@ window.assertContains = (array, item, message) => testFramework.assertContains(a
 window.assertNotContains = (array, item, message) => testFramework.assertNotContains(array, item, message);
 
 // Utility functions for testing
-window.runAllTests = async () => {
+// Results are appended to #test-results as each test finishes
+window.runAllTests = async (options = {}) => {
     const resultsContainer = document.getElementById('test-results');
     resultsContainer.classList.remove('hidden');
-    resultsContainer.innerHTML = '<h4>Running tests...</h4>';
-    
-    const results = await testFramework.runAll();
-    
-    let html = `<h4>Test Results (${results.passed}/${results.total} passed)</h4>`;
-    
-    testFramework.getResults().forEach(result => {
-        const statusClass = result.status === 'PASSED' ? 'success' : 'error';
-        html += `<div class="${statusClass}">`;
-        html += `<strong>${result.status}:</strong> ${result.name}`;
-        if (result.error) {
-            html += `<br><small>Error: ${result.error}</small>`;
-        }
-        html += '</div>';
+    resultsContainer.innerHTML = '';
+    const heading = document.createElement('h4');
+    resultsContainer.appendChild(heading);
+    const total = testFramework.tests.length;
+    let done = 0;
+    let passed = 0;
+    heading.textContent = `Running tests... (0/${total})`;
+
+    const results = await testFramework.runAll({
+        parallel: true,
+        ...options,
+        onResult: result => {
+            done++;
+            if (result.status === 'PASSED') passed++;
+            const row = document.createElement('div');
+            row.className = result.status === 'PASSED' ? 'success' : 'error';
+            const status = document.createElement('strong');
+            status.textContent = `${result.status}:`;
+            row.append(status, ` ${result.name} `);
+            const timing = document.createElement('small');
+            timing.textContent = `(${result.duration.toFixed(1)} ms)`;
+            row.appendChild(timing);
+            if (result.error) {
+                const error = document.createElement('small');
+                error.textContent = `Error: ${result.error}`;
+                row.append(document.createElement('br'), error);
+            }
+            resultsContainer.appendChild(row);
+            heading.textContent = `Running tests... (${done}/${total}, ${passed} passed)`;
+        },
     });
-    
-    resultsContainer.innerHTML = html;
+
+    heading.textContent = `Test Results (${results.passed}/${results.total} passed` +
+        `, ${results.duration.toFixed(1)} ms)`;
+    return results;
 };
 
 window.clearTestResults = () => {
@@ -93,6 +93,11 @@ test('Promise should resolve correctly', async () => {
     assertEqual(result, "success");
 });
 
+test('Timers should resolve within the test timeout', async () => {
+    const value = await new Promise(resolve => setTimeout(() => resolve('done'), 100));
+    assertEqual(value, 'done');
+}, { timeout: 1000 });
+
 // JSON Tests
 test('JSON operations should work', () => {
     const obj = { name: "John", age: 30 };
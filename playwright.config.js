@@ -18,7 +18,9 @@ module.exports = defineConfig({
   reporter: [
     ['html'],
     ['json', { outputFile: 'test-results/results.json' }],
-    ['junit', { outputFile: 'test-results/results.xml' }]
+    ['junit', { outputFile: 'test-results/results.xml' }],
+    /* One JSON line per test as soon as it finishes - tail it live, merge with `python -m testkit.stream` */
+    ['./javascript_tests/jsonl-reporter.js', { outputFile: 'test-results/results.jsonl' }]
   ],
   /* Shared settings for all the projects below. See https://playwright.dev/docs/api/class-testoptions. */
   use: {
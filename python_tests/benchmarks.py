@@ -0,0 +1,58 @@
+# Benchmarks - Compare the fast helpers with the simple versions
+#
+# Run with:  python python_tests/benchmarks.py
+
+import timeit
+
+from html_parsing import DEFAULT_PARSER, clear_parse_cache, parse_html
+from my_functions import *
+
+def _best_of(stmt, number, repeat=5):
+    """Return the fastest time (in seconds) for running stmt number times"""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat))
+
+def _report(name, slow, fast):
+    """Print one benchmark line with the speedup of fast over slow"""
+    print(f"{name:<28} before {slow * 1000:9.2f} ms   after {fast * 1000:9.2f} ms   x{slow / fast:6.1f}")
+
+def bench_batch_numeric(size=1_000_000):
+    """Compare the scalar helpers in a Python loop with their batch versions"""
+    a = list(range(size))
+    b = list(range(size, 0, -1))
+    if np is not None:
+        a, b = np.asarray(a), np.asarray(b)
+    print(f"Batch numeric helpers ({size:,} items, NumPy {'on' if np is not None else 'off'})")
+    _report("add_numbers",
+            _best_of(lambda: [add_numbers(x, y) for x, y in zip(a, b)], 1),
+            _best_of(lambda: add_numbers_batch(a, b), 1))
+    _report("multiply_numbers",
+            _best_of(lambda: [multiply_numbers(x, y) for x, y in zip(a, b)], 1),
+            _best_of(lambda: multiply_numbers_batch(a, b), 1))
+    _report("is_even",
+            _best_of(lambda: [is_even(x) for x in a], 1),
+            _best_of(lambda: is_even_batch(a), 1))
+
+def _large_page(rows=5000):
+    """A big HTML page: a long table plus a handful of links"""
+    body = "".join(
+        f"<tr><td class='id'>{i}</td><td><span>row {i}</span></td><td><em>{i * i}</em></td></tr>"
+        for i in range(rows)
+    )
+    links = "".join(f"<a href='/page/{i}'>page {i}</a>" for i in range(20))
+    return f"<html><head><title>Big</title></head><body><nav>{links}</nav><table>{body}</table></body></html>"
+
+def bench_html_parsing(rows=5000):
+    """Compare full, strained and cached parses of a large page"""
+    page = _large_page(rows)
+    print(f"HTML parsing ({len(page) / 1e6:.1f} MB page, default parser {DEFAULT_PARSER})")
+    full = _best_of(lambda: parse_html(page, cache=False), 1, repeat=3)
+    strained = _best_of(lambda: parse_html(page, only="a", cache=False), 1, repeat=3)
+    _report("links only vs full tree", full, strained)
+    clear_parse_cache()
+    parse_html(page)
+    _report("cached vs full tree", full, _best_of(lambda: parse_html(page), 1, repeat=3))
+
+if __name__ == "__main__":
+    bench_batch_numeric()
+    print()
+    bench_html_parsing()
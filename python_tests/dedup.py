@@ -0,0 +1,150 @@
+# Dedup - Order-preserving duplicate removal for unbounded streams
+#
+# remove_duplicates() in my_functions.py builds a whole list; iter_unique()
+# yields first occurrences one by one, handles unhashable items (dicts,
+# lists, sets) and can trade exactness for a fixed memory ceiling.
+
+import hashlib
+import math
+
+_BLOOM_SALT = b"dedup-bloom"
+
+
+def canonical_key(value):
+    """Return a hashable stand-in for value that is equal for equal values
+
+    Hashable values are returned unchanged. Lists, tuples, dicts and sets
+    (nested in any combination) are converted to tagged tuples and
+    frozensets, so {"a": 1, "b": 2} and {"b": 2, "a": 1} get the same key
+    while [1, 2] and (1, 2) do not.
+
+    Args:
+        value: Any value built from hashables, lists, tuples, dicts and sets
+
+    Returns:
+        A hashable key
+
+    Examples:
+        canonical_key({"b": [1], "a": 2}) == canonical_key({"a": 2, "b": [1]})
+    """
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+    if isinstance(value, dict):
+        return (dict, frozenset((canonical_key(k), canonical_key(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return (set, frozenset(canonical_key(item) for item in value))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(canonical_key(item) for item in value))
+    raise TypeError(f"cannot build a dedup key for {type(value).__name__!r}")
+
+
+def _stable_repr(key):
+    """Text form of a canonical key that is the same in every process
+
+    hash() is salted per process for str/bytes and collides by design
+    (hash(-1) == hash(-2)), so the Bloom filter hashes this instead.
+    Frozenset members are sorted and integral numbers are written as ints,
+    so values that compare equal (1, 1.0, True) get the same text.
+    """
+    if isinstance(key, tuple):
+        return "(" + ",".join(_stable_repr(item) for item in key) + ")"
+    if isinstance(key, frozenset):
+        return "{" + ",".join(sorted(_stable_repr(item) for item in key)) + "}"
+    if isinstance(key, type):
+        return f"<{key.__module__}.{key.__qualname__}>"
+    if isinstance(key, complex) and not key.imag:
+        key = key.real
+    if isinstance(key, float) and key.is_integer():
+        key = int(key)
+    if isinstance(key, int):
+        return str(int(key))
+    if isinstance(key, (str, bytes, float, complex)) or key is None:
+        return repr(key)
+    return f"{type(key).__qualname__}:{key!r}"
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set: no false negatives, rare false positives
+
+    The bit array is sized for capacity items at error_rate false positives
+    and never grows; max_bytes caps it further (raising the error rate).
+    """
+
+    def __init__(self, capacity, error_rate=0.001, max_bytes=None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        if max_bytes is not None:
+            bits = min(bits, max_bytes * 8)
+        self.size = max(bits, 8)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @property
+    def nbytes(self):
+        """Memory used by the bit array, in bytes"""
+        return len(self.bits)
+
+    def _positions(self, key):
+        """Bit positions for key, using double hashing of one blake2b digest"""
+        data = _stable_repr(key).encode("utf-8", "surrogatepass")
+        digest = hashlib.blake2b(data, digest_size=16, key=_BLOOM_SALT).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        """Add key; return True if it was (probably) already present"""
+        present = True
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            mask = 1 << bit
+            if not self.bits[byte] & mask:
+                present = False
+                self.bits[byte] |= mask
+        return present
+
+    def __contains__(self, key):
+        return all(self.bits[p // 8] & (1 << p % 8) for p in self._positions(key))
+
+
+def iter_unique(items, key=None, approximate=False, capacity=1_000_000,
+                error_rate=0.001, max_bytes=None):
+    """Yield the first occurrence of every distinct item, preserving order
+
+    Args:
+        items (iterable): Items to deduplicate (read lazily, may be endless)
+        key (callable, optional): Computes the value that decides whether
+            two items are duplicates (e.g. lambda record: record["id"])
+        approximate (bool): Track seen keys in a BloomFilter instead of a set.
+            Memory is fixed, but a few unique items may be dropped as
+            false positives (about error_rate once capacity items are seen).
+        capacity (int): Expected number of distinct items (approximate mode)
+        error_rate (float): Target false-positive rate (approximate mode)
+        max_bytes (int, optional): Hard memory ceiling for the filter
+
+    Yields:
+        Items that were not seen before
+
+    Examples:
+        list(iter_unique([1, 2, 2, 3])) should return [1, 2, 3]
+        list(iter_unique([{"a": 1}, {"a": 1}])) should return [{"a": 1}]
+    """
+    if approximate:
+        seen = BloomFilter(capacity, error_rate, max_bytes)
+        for item in items:
+            if not seen.add(canonical_key(item if key is None else key(item))):
+                yield item
+        return
+
+    seen = set()
+    for item in items:
+        marker = canonical_key(item if key is None else key(item))
+        if marker not in seen:
+            seen.add(marker)
+            yield item
@@ -0,0 +1,132 @@
+# Email Validation - The grammar behind validate_email() plus a bulk pipeline
+#
+# validate_email() in my_functions.py checks one address; validate_emails()
+# streams through huge lists of addresses in chunks, optionally spread over
+# a pool of worker processes.
+
+import re
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import count, islice
+
+# Local part: RFC 5322 "dot-atom" (no quoted strings, no leading/trailing or double dots)
+_LOCAL_PART = re.compile(r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*")
+# Domain: two or more LDH labels, ending in an alphabetic (or punycode) top-level domain
+_DOMAIN = re.compile(
+    r"(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+"
+    r"(?:[A-Za-z]{2,63}|xn--[A-Za-z0-9-]{1,59})"
+)
+
+MAX_ADDRESS_LENGTH = 254
+MAX_LOCAL_LENGTH = 64
+MAX_DOMAIN_LENGTH = 253
+DOMAIN_CACHE_SIZE = 65536
+
+ChunkStats = namedtuple("ChunkStats", ["index", "size", "valid", "seconds", "per_second"])
+
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def _is_valid_domain(domain):
+    """Check a domain name; verdicts are cached since most lists repeat domains"""
+    return len(domain) <= MAX_DOMAIN_LENGTH and _DOMAIN.fullmatch(domain) is not None
+
+
+def is_valid_email(email):
+    """Check an email address against a practical subset of RFC 5322
+
+    Args:
+        email (str): Email address to validate
+
+    Returns:
+        bool: True if valid format, False otherwise
+
+    Examples:
+        is_valid_email("first.last+tag@mail.example.com") should return True
+        is_valid_email("first..last@example.com") should return False
+    """
+    if not isinstance(email, str) or len(email) > MAX_ADDRESS_LENGTH:
+        return False
+    local, at, domain = email.rpartition("@")
+    if not at or len(local) > MAX_LOCAL_LENGTH or _LOCAL_PART.fullmatch(local) is None:
+        return False
+    return _is_valid_domain(domain.lower())
+
+
+def _validate_chunk(index, emails):
+    """Validate one chunk; runs in a worker process when a pool is used"""
+    started = time.perf_counter()
+    verdicts = [is_valid_email(email) for email in emails]
+    seconds = time.perf_counter() - started
+    stats = ChunkStats(
+        index=index,
+        size=len(emails),
+        valid=sum(verdicts),
+        seconds=seconds,
+        per_second=len(emails) / seconds if seconds else float("inf"),
+    )
+    return verdicts, stats
+
+
+def _chunks(iterable, chunk_size):
+    """Yield (index, list) chunks of at most chunk_size items"""
+    iterator = iter(iterable)
+    for index in count():
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield index, chunk
+
+
+def _validate_in_process(chunks):
+    """Yield (chunk, verdicts, stats) for every chunk, one after another"""
+    for index, chunk in chunks:
+        yield (chunk, *_validate_chunk(index, chunk))
+
+
+def _validate_in_pool(chunks, workers):
+    """Yield (chunk, verdicts, stats) in order, validating chunks in a process pool"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for index, chunk in chunks:
+            pending.append((chunk, pool.submit(_validate_chunk, index, chunk)))
+            if len(pending) >= workers * 2:
+                chunk_done, future = pending.popleft()
+                yield (chunk_done, *future.result())
+        while pending:
+            chunk_done, future = pending.popleft()
+            yield (chunk_done, *future.result())
+
+
+def validate_emails(emails, workers=1, chunk_size=10_000, on_chunk=None):
+    """Validate a stream of email addresses in chunks
+
+    Results come back in input order. With workers > 1 chunks are
+    validated in a process pool, with at most two chunks per worker in
+    flight so memory stays bounded for arbitrarily long inputs. Every
+    process keeps its own cache of per-domain verdicts.
+
+    Args:
+        emails (iterable): Email addresses (any iterable, read lazily)
+        workers (int): Number of worker processes (1 = validate in-process)
+        chunk_size (int): Number of addresses per chunk
+        on_chunk (callable, optional): Called with a ChunkStats for every
+            finished chunk, e.g. to report throughput
+
+    Yields:
+        tuple: (email, is_valid) for every address
+
+    Examples:
+        list(validate_emails(["a@b.co", "nope"])) should return
+        [("a@b.co", True), ("nope", False)]
+    """
+    chunks = _chunks(emails, chunk_size)
+    if workers <= 1:
+        results = _validate_in_process(chunks)
+    else:
+        results = _validate_in_pool(chunks, workers)
+    for chunk, verdicts, stats in results:
+        if on_chunk is not None:
+            on_chunk(stats)
+        yield from zip(chunk, verdicts)
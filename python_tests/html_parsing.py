@@ -0,0 +1,72 @@
+# HTML Parsing - BeautifulSoup with the fastest backend, partial parsing and a cache
+#
+# Building a full tree is the expensive part of BeautifulSoup. parse_html()
+# uses lxml when it is installed, can build only the elements a test needs
+# (SoupStrainer) and reuses earlier results for identical content.
+
+import hashlib
+from collections import OrderedDict
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401 - only checking that the backend is available
+    DEFAULT_PARSER = "lxml"
+except ImportError:  # lxml is optional - fall back to the built-in parser
+    DEFAULT_PARSER = "html.parser"
+
+CACHE_SIZE = 128
+_CACHE = OrderedDict()
+
+
+def _strainer(only):
+    """Turn a tag name, list of tag names or SoupStrainer into a SoupStrainer"""
+    if only is None or isinstance(only, SoupStrainer):
+        return only
+    if isinstance(only, str):
+        return SoupStrainer(only)
+    return SoupStrainer(list(only))
+
+
+def parse_html(markup, only=None, parser=None, cache=True):
+    """Parse HTML into a BeautifulSoup tree, optionally only part of it
+
+    Results are cached by a hash of the content (plus parser and strainer),
+    so parsing the same page again is free. Cached trees are shared: treat
+    them as read-only, or pass cache=False if you need to modify the tree.
+
+    Args:
+        markup (str | bytes): HTML document
+        only (str | list | SoupStrainer, optional): Build only matching
+            elements (and their children), e.g. "a" or ["h1", "p"]
+        parser (str, optional): BeautifulSoup backend; defaults to lxml when
+            installed, otherwise html.parser
+        cache (bool): Look up and store the result in the parse cache
+
+    Returns:
+        BeautifulSoup: Parsed (possibly partial) document
+
+    Examples:
+        parse_html("<h1>Hi</h1><p>x</p>", only="h1").text should return "Hi"
+    """
+    parser = parser or DEFAULT_PARSER
+    strainer = _strainer(only)
+    if not cache:
+        return BeautifulSoup(markup, parser, parse_only=strainer)
+
+    data = markup.encode("utf-8") if isinstance(markup, str) else markup
+    key = (hashlib.sha1(data).hexdigest(), parser, str(strainer))
+    soup = _CACHE.get(key)
+    if soup is not None:
+        _CACHE.move_to_end(key)
+        return soup
+    soup = BeautifulSoup(markup, parser, parse_only=strainer)
+    _CACHE[key] = soup
+    if len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return soup
+
+
+def clear_parse_cache():
+    """Forget every cached parse result"""
+    _CACHE.clear()
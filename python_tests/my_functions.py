@@ -1,5 +1,18 @@
 # My Functions - Implement these functions and then test them!
 
+import math
+import operator
+from collections import OrderedDict
+from itertools import compress, repeat
+
+from dedup import iter_unique
+from email_validation import is_valid_email
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional - batch helpers fall back to pure Python
+    np = None
+
 def add_numbers(a, b):
     """Add two numbers together
     
@@ -47,6 +60,148 @@ def is_even(number):
     """
     return number % 2 == 0
 
+def _is_sequence(value):
+    """Return True for list-like inputs that batch helpers should iterate over"""
+    return hasattr(value, "__len__") and not isinstance(value, (str, bytes))
+
+def _broadcast(a, b):
+    """Line up two scalars/1-D sequences using NumPy-style broadcasting rules
+    
+    Returns a pair of iterables of equal length that can be fed to map().
+    """
+    a_seq, b_seq = _is_sequence(a), _is_sequence(b)
+    if not a_seq and not b_seq:
+        return [a], [b]
+    if not a_seq:
+        return repeat(a, len(b)), b
+    if not b_seq:
+        return a, repeat(b, len(a))
+    if len(a) == len(b):
+        return a, b
+    if len(a) == 1:
+        return repeat(a[0], len(b)), b
+    if len(b) == 1:
+        return a, repeat(b[0], len(a))
+    raise ValueError(
+        f"operands could not be broadcast together with lengths {len(a)} and {len(b)}"
+    )
+
+def _store(values, out):
+    """Write values into the out buffer (if given) and return the result"""
+    if out is None:
+        return values
+    if len(out) != len(values):
+        raise ValueError(f"out has length {len(out)}, expected {len(values)}")
+    for i, value in enumerate(values):
+        out[i] = value
+    return out
+
+def _exact_operands(a, b, op):
+    """Convert a and b to arrays that op can combine without integer overflow
+    
+    NumPy integer arithmetic wraps around silently. When the result could
+    leave the range of the integer dtype NumPy would pick, both operands
+    become object arrays of Python ints, which never overflow.
+    """
+    a, b = np.asarray(a), np.asarray(b)
+    if a.dtype.kind not in "iu" or b.dtype.kind not in "iu" or not a.size or not b.size:
+        return a, b
+    dtype = np.result_type(a, b)
+    if dtype.kind in "iu":
+        limits = np.iinfo(dtype)
+        extremes = [op(x, y) for x in (int(a.min()), int(a.max()))
+                    for y in (int(b.min()), int(b.max()))]
+        if limits.min <= min(extremes) and max(extremes) <= limits.max:
+            return a, b
+    # Either the result may overflow or int64 + uint64 would become float64
+    return a.astype(object), b.astype(object)
+
+def _batch(op, ufunc_name, a, b, out):
+    """Apply op element-wise, with the NumPy ufunc of that name if available
+    
+    Two scalars give a plain Python number on both paths. Exact results
+    (object arrays) are computed first and then copied into a typed
+    ndarray out, which raises OverflowError if a value does not fit.
+    """
+    if not _is_sequence(a) and not _is_sequence(b) and out is None:
+        return op(a, b)
+    if np is not None:
+        a, b = _exact_operands(a, b, op)
+        ufunc = getattr(np, ufunc_name)
+        if not isinstance(out, np.ndarray):
+            result = ufunc(a, b)
+            return result if out is None else _store(result.tolist(), out)
+        if a.dtype == object and out.dtype != object:
+            out[...] = ufunc(a, b)
+            return out
+        return ufunc(a, b, out=out)
+    return _store(list(map(op, *_broadcast(a, b))), out)
+
+def add_numbers_batch(a, b, out=None):
+    """Add two sequences (or a sequence and a scalar) element by element
+    
+    Uses vectorized NumPy arithmetic when NumPy is installed and a
+    pure Python loop otherwise. Integers that would overflow NumPy's
+    int64 are added as exact Python ints instead of wrapping around.
+    
+    Args:
+        a (list | numpy.ndarray | int): First operand(s)
+        b (list | numpy.ndarray | int): Second operand(s)
+        out (list | numpy.ndarray, optional): Buffer to write results into;
+            an integer ndarray raises OverflowError for sums outside its
+            dtype, an object ndarray or a list keeps them exact
+        
+    Returns:
+        numpy.ndarray | list | int: Element-wise sums (``out`` if it was
+        given); two scalars give a scalar
+        
+    Examples:
+        add_numbers_batch([1, 2, 3], [10, 20, 30]) should return [11, 22, 33]
+        add_numbers_batch([1, 2, 3], 1) should return [2, 3, 4]
+    """
+    return _batch(operator.add, "add", a, b, out)
+
+def multiply_numbers_batch(a, b, out=None):
+    """Multiply two sequences (or a sequence and a scalar) element by element
+    
+    Products that would overflow NumPy's int64 are exact Python ints.
+    
+    Args:
+        a (list | numpy.ndarray | int): First operand(s)
+        b (list | numpy.ndarray | int): Second operand(s)
+        out (list | numpy.ndarray, optional): Buffer to write results into;
+            an integer ndarray raises OverflowError for products outside
+            its dtype, an object ndarray or a list keeps them exact
+        
+    Returns:
+        numpy.ndarray | list | int: Element-wise products (``out`` if it
+        was given); two scalars give a scalar
+        
+    Examples:
+        multiply_numbers_batch([1, 2, 3], [4, 5, 6]) should return [4, 10, 18]
+        multiply_numbers_batch([1, 2, 3], 0) should return [0, 0, 0]
+    """
+    return _batch(operator.mul, "multiply", a, b, out)
+
+def is_even_batch(numbers, out=None):
+    """Check every number in a sequence for evenness
+    
+    Args:
+        numbers (list | numpy.ndarray): Numbers to check
+        out (list | numpy.ndarray, optional): Boolean buffer to write results into
+        
+    Returns:
+        numpy.ndarray | list: True where the number is even (``out`` if it was given)
+        
+    Examples:
+        is_even_batch([1, 2, 3, 4]) should return [False, True, False, True]
+    """
+    if np is not None:
+        array_out = out if isinstance(out, np.ndarray) else None
+        result = np.equal(np.remainder(np.asarray(numbers), 2), 0, out=array_out)
+        return result if out is array_out else _store(result.tolist(), out)
+    return _store([x % 2 == 0 for x in numbers], out)
+
 def reverse_string(text):
     """Reverse a string
     
@@ -77,9 +232,50 @@ def count_vowels(text):
     """
     return sum(1 for i in text.lower() if i in "aeiou")
 
+# Recently computed factorials, most recently used last. Big factorials are
+# megabytes each, so the cache is kept small and skips cheap small values.
+_FACTORIAL_CACHE = OrderedDict()
+_FACTORIAL_CACHE_SIZE = 16
+_FACTORIAL_CACHE_MIN_N = 1000
+
+def _range_product(lo, hi):
+    """Multiply lo * (lo + 1) * ... * (hi - 1) by binary splitting
+    
+    Splitting the range in halves keeps both operands of every big
+    multiplication about the same size, which is what lets Python's
+    Karatsuba multiplication beat a running product.
+    """
+    if hi - lo <= 16:
+        result = 1
+        for i in range(lo, hi):
+            result *= i
+        return result
+    mid = (lo + hi) // 2
+    return _range_product(lo, mid) * _range_product(mid, hi)
+
+def _nearest_cached_factorial(n):
+    """Return the cached (m, m!) with the largest m below n, or None
+    
+    Only smaller factorials help: going down would need a big-int long
+    division, which is quadratic in CPython and slower than math.factorial.
+    """
+    best = None
+    for m in _FACTORIAL_CACHE:
+        if m < n and (best is None or m > best):
+            best = m
+    if best is None:
+        return None
+    _FACTORIAL_CACHE.move_to_end(best)
+    return best, _FACTORIAL_CACHE[best]
+
 def factorial(n):
     """Calculate factorial of n (n!)
     
+    Small values are computed directly. For big n the result is built from
+    the nearest smaller cached factorial when one is close enough
+    (n! = m! * (m+1)...n), otherwise with math.factorial. Results for
+    n >= 1000 are kept in a small LRU cache.
+    
     Args:
         n (int): Number to calculate factorial for
         
@@ -90,9 +286,107 @@ def factorial(n):
         factorial(5) should return 120 (5! = 5*4*3*2*1)
         factorial(3) should return 6 (3! = 3*2*1)
     """
-    result = 1
+    if n < _FACTORIAL_CACHE_MIN_N:
+        return _range_product(2, n + 1)
+    if n in _FACTORIAL_CACHE:
+        _FACTORIAL_CACHE.move_to_end(n)
+        return _FACTORIAL_CACHE[n]
+
+    nearest = _nearest_cached_factorial(n)
+    if nearest is not None and n - nearest[0] <= n // 4:
+        m, m_factorial = nearest
+        result = m_factorial * _range_product(m + 1, n + 1)
+    else:
+        result = math.factorial(n)
+
+    _FACTORIAL_CACHE[n] = result
+    if len(_FACTORIAL_CACHE) > _FACTORIAL_CACHE_SIZE:
+        _FACTORIAL_CACHE.popitem(last=False)
+    return result
+
+def clear_factorial_cache():
+    """Forget every cached factorial (e.g. before timing cold computations)"""
+    _FACTORIAL_CACHE.clear()
+
+def factorial_mod(n, m):
+    """Calculate n! modulo m without building n! itself
+    
+    Args:
+        n (int): Number to calculate factorial for (n >= 0)
+        m (int): Modulus (m >= 1)
+        
+    Returns:
+        int: n! % m
+        
+    Examples:
+        factorial_mod(5, 7) should return 1 (120 % 7)
+        factorial_mod(10, 5) should return 0 (5 divides 10!)
+    """
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if m < 1:
+        raise ValueError("m must be a positive integer")
+    # For n >= m the product n! contains m as a factor.
+    if n >= m:
+        return 0
+    result = 1 % m
     for i in range(2, n + 1):
-        result *= i
+        result = result * i % m
+    return result
+
+def _primes_up_to(n):
+    """Return all primes <= n (sieve of Eratosthenes)"""
+    if n < 2:
+        return []
+    sieve = bytearray([1]) * (n + 1)
+    sieve[0] = sieve[1] = 0
+    for p in range(2, math.isqrt(n) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, n + 1, p)))
+    return list(compress(range(n + 1), sieve))
+
+def _prime_exponent_in_binomial(n, k, p):
+    """Exponent of prime p in C(n, k), using Legendre's formula"""
+    exponent = 0
+    power = p
+    while power <= n:
+        exponent += n // power - k // power - (n - k) // power
+        power *= p
+    return exponent
+
+def binomial(n, k, mod=None):
+    """Calculate the binomial coefficient C(n, k), optionally modulo mod
+    
+    With a modulus the coefficient is assembled from its prime factorization
+    (p ** exponent for every prime p <= n), so neither C(n, k) nor any
+    factorial is ever built. Works for any modulus, prime or not.
+    
+    Args:
+        n (int): Size of the set (n >= 0)
+        k (int): Number of items chosen (k >= 0)
+        mod (int, optional): Modulus for the result
+        
+    Returns:
+        int: C(n, k), or C(n, k) % mod
+        
+    Examples:
+        binomial(5, 2) should return 10
+        binomial(10, 3, mod=7) should return 1 (120 % 7)
+    """
+    if n < 0 or k < 0:
+        raise ValueError("n and k must be non-negative integers")
+    if mod is None:
+        return math.comb(n, k)
+    if mod < 1:
+        raise ValueError("mod must be a positive integer")
+    if k > n:
+        return 0
+    k = min(k, n - k)
+    result = 1 % mod
+    for p in _primes_up_to(n):
+        exponent = _prime_exponent_in_binomial(n, k, p)
+        if exponent:
+            result = result * pow(p, exponent, mod) % mod
     return result
 
 def is_palindrome(text):
@@ -126,11 +420,16 @@ def find_max(numbers):
     """
     return max(numbers)
 
-def remove_duplicates(items):
+def remove_duplicates(items, key=None):
     """Remove duplicate items from a list
     
+    Unhashable items such as dicts and lists are compared by value. Use
+    dedup.iter_unique() to deduplicate a stream without building a list.
+    
     Args:
         items (list): List with possible duplicates
+        key (callable, optional): Computes the value that decides whether
+            two items are duplicates
         
     Returns:
         list: List with duplicates removed
@@ -138,11 +437,17 @@ def remove_duplicates(items):
     Examples:
         remove_duplicates([1, 2, 2, 3, 3, 3]) should return [1, 2, 3]
         remove_duplicates(['a', 'b', 'a', 'c']) should return ['a', 'b', 'c']
+        remove_duplicates([{'id': 1}, {'id': 1}]) should return [{'id': 1}]
     """
-    return list(dict.fromkeys(items))
+    if key is None and isinstance(items, (list, tuple)):
+        try:
+            return list(dict.fromkeys(items))
+        except TypeError:
+            pass  # unhashable items - fall back to canonical keys
+    return list(iter_unique(items, key=key))
 
 def validate_email(email):
-    """Check if email format is valid (contains @ and .)
+    """Check if email format is valid (local-part@domain.tld)
     
     Args:
         email (str): Email address to validate
@@ -153,7 +458,7 @@ def validate_email(email):
     Examples:
         validate_email("user@example.com") should return True
         validate_email("invalid-email") should return False
+    
+    Use email_validation.validate_emails() to check many addresses at once.
     """
-    if "@" not in email:
-        return False
-    return "." in email.split("@")[-1]
+    return is_valid_email(email)
@@ -0,0 +1,152 @@
+# Selection - One-pass top-k, argmax and per-group maximum helpers
+#
+# find_max() in my_functions.py answers "what is the largest value"; these
+# answer the follow-up questions (the k largest, where the largest is, the
+# largest per group) without extra passes over the data.
+
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional - arrays are then treated as sequences
+    np = None
+
+
+def _is_array(values):
+    """Return True for NumPy arrays (only when NumPy is installed)"""
+    return np is not None and isinstance(values, np.ndarray)
+
+
+def _can_split(values, workers):
+    """Return True if values should be reduced in chunks across worker processes"""
+    return workers > 1 and hasattr(values, "__len__") and hasattr(values, "__getitem__")
+
+
+def _in_chunks(func, values, workers, *args):
+    """Run func(chunk, offset, *args) on workers slices of values in a process pool
+
+    Worth it only when key functions are expensive: every chunk is pickled
+    to its worker. func and key functions must be picklable (module level).
+    """
+    step = -(-len(values) // workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(func, values[start:start + step], start, *args)
+            for start in range(0, len(values), step)
+        ]
+        return [future.result() for future in futures]
+
+
+def _top_k_chunk(values, offset, k, key):
+    return heapq.nlargest(k, values, key=key)
+
+
+def top_k(iterable, k, key=None, workers=1):
+    """Find the k largest items, largest first
+
+    Iterators are consumed once while keeping only a k-item heap. NumPy
+    arrays use argpartition, which is O(n) instead of a full sort.
+
+    Args:
+        iterable (iterable | numpy.ndarray): Items to select from
+        k (int): Number of items to return
+        key (callable, optional): Computes the value items are compared by
+        workers (int): Split sequences over this many processes and merge
+            the per-chunk results
+
+    Returns:
+        list | numpy.ndarray: Up to k largest items in descending order
+
+    Examples:
+        top_k([5, 1, 9, 3, 7], 3) should return [9, 7, 5]
+        top_k(["bb", "a", "ccc"], 1, key=len) should return ["ccc"]
+    """
+    if k <= 0:
+        return []
+    if key is None and _is_array(iterable):
+        flat = iterable.ravel()
+        if k >= flat.size:
+            return np.sort(flat)[::-1]
+        largest = flat[np.argpartition(flat, flat.size - k)[flat.size - k:]]
+        return np.sort(largest)[::-1]
+    if _can_split(iterable, workers):
+        chunks = _in_chunks(_top_k_chunk, iterable, workers, k, key)
+        return heapq.nlargest(k, (item for chunk in chunks for item in chunk), key=key)
+    return heapq.nlargest(k, iterable, key=key)
+
+
+def _argmax_chunk(values, offset, key):
+    best_index = best_value = None
+    for index, item in enumerate(values, offset):
+        value = item if key is None else key(item)
+        if best_index is None or value > best_value:
+            best_index, best_value = index, value
+    return best_index, best_value
+
+
+def argmax(iterable, key=None, workers=1):
+    """Find the position of the largest item (the first one on ties)
+
+    Args:
+        iterable (iterable | numpy.ndarray): Items to search
+        key (callable, optional): Computes the value items are compared by
+        workers (int): Split sequences over this many processes
+
+    Returns:
+        int: Index of the largest item
+
+    Raises:
+        ValueError: If iterable is empty (like max())
+
+    Examples:
+        argmax([1, 5, 3, 9, 2]) should return 3
+        argmax(["bb", "a", "ccc"], key=len) should return 2
+    """
+    if key is None and _is_array(iterable):
+        if iterable.size == 0:
+            raise ValueError("argmax() arg is an empty sequence")
+        return int(np.argmax(iterable))
+    if _can_split(iterable, workers):
+        chunks = [chunk for chunk in _in_chunks(_argmax_chunk, iterable, workers, key)
+                  if chunk[0] is not None]
+        best = _argmax_chunk([value for _, value in chunks], 0, None)
+        best_index = None if best[0] is None else chunks[best[0]][0]
+    else:
+        best_index, _ = _argmax_chunk(iterable, 0, key)
+    if best_index is None:
+        raise ValueError("argmax() arg is an empty sequence")
+    return best_index
+
+
+def _max_by_chunk(values, offset, group, key):
+    best = {}  # group -> (compared value, item)
+    for item in values:
+        group_value = group(item)
+        value = item if key is None else key(item)
+        if group_value not in best or value > best[group_value][0]:
+            best[group_value] = (value, item)
+    return {group_value: item for group_value, (_, item) in best.items()}
+
+
+def max_by(iterable, group, key=None, workers=1):
+    """Find the largest item in every group
+
+    Args:
+        iterable (iterable): Items to group
+        group (callable): Returns the group an item belongs to
+        key (callable, optional): Computes the value items are compared by
+        workers (int): Split sequences over this many processes
+
+    Returns:
+        dict: Group -> largest item of that group (first one on ties),
+        in order of first appearance
+
+    Examples:
+        max_by([1, 8, 3, 6], group=lambda n: n % 2) should return {1: 3, 0: 8}
+    """
+    if _can_split(iterable, workers):
+        chunks = _in_chunks(_max_by_chunk, iterable, workers, group, key)
+        return _max_by_chunk([item for chunk in chunks for item in chunk.values()],
+                             0, group, key)
+    return _max_by_chunk(iterable, 0, group, key)
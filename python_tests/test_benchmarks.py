@@ -0,0 +1,96 @@
+# Benchmarks for my_functions.py - run with: pytest python_tests -m benchmark --benchmark
+#
+# Save a new baseline with --benchmark-save after an intended change.
+
+import random
+import string
+
+import pytest
+from my_functions import (clear_factorial_cache, count_vowels, factorial, is_palindrome,
+                          remove_duplicates)
+from testkit.benchmark import compare_to_baseline, fit_complexity, percentile
+
+SIZES = [10 ** i for i in range(1, 8)]
+
+def _text(n):
+    random.seed(n)
+    return "".join(random.choices(string.ascii_letters + " ,.", k=n))
+
+def _palindrome(n):
+    half = _text(n // 2)
+    return half + half[::-1]
+
+def _cold_factorial(n):
+    clear_factorial_cache()
+    return factorial(n)
+
+def _items(n):
+    random.seed(n)
+    return [random.randrange(n // 2 + 1) for _ in range(n)]
+
+@pytest.mark.benchmark
+def test_benchmark_count_vowels(benchmark):
+    benchmark.scaling("count_vowels", count_vowels, _text, SIZES)
+
+@pytest.mark.benchmark
+def test_benchmark_is_palindrome(benchmark):
+    benchmark.scaling("is_palindrome", is_palindrome, _palindrome, SIZES)
+
+@pytest.mark.benchmark
+def test_benchmark_remove_duplicates(benchmark):
+    benchmark.scaling("remove_duplicates", remove_duplicates, _items, SIZES)
+
+@pytest.mark.benchmark
+def test_benchmark_factorial(benchmark):
+    # Results grow with n log n digits, so sizes stop well below 10**7.
+    benchmark.scaling("factorial", _cold_factorial, lambda n: n, [10, 100, 1000, 10_000, 100_000])
+
+def test_fit_complexity():
+    """Test the complexity fit picks the right growth function"""
+    sizes = [10, 100, 1000, 10_000]
+    assert fit_complexity(sizes, [2e-6 * n for n in sizes]) == "O(n)"
+    assert fit_complexity(sizes, [1e-9 * n * n for n in sizes]) == "O(n^2)"
+    assert fit_complexity(sizes, [3e-7 for _ in sizes]) == "O(1)"
+    assert fit_complexity(sizes[:2], [1, 2]) is None
+
+def test_percentile():
+    """Test interpolated percentiles"""
+    assert percentile([1, 2, 3, 4, 5], 0.5) == 3
+    assert percentile([1, 2, 3, 4, 5], 0.1) == pytest.approx(1.4)
+
+def _timings(**fastest):
+    return {size[1:]: {"min": t, "median": t * 1.05, "p90": t * 1.1} for size, t in fastest.items()}
+
+def test_compare_to_baseline():
+    """Test regressions and complexity changes are reported"""
+    baseline = {"sizes": _timings(n10=1e-7, n100=1e-4, n1000=1e-3, n10000=1e-2)}
+    same = {"sizes": _timings(n10=9e-7, n100=1.1e-4, n1000=1.1e-3, n10000=1.2e-2)}
+    slower = {"sizes": _timings(n100=1e-4, n1000=1e-2, n10000=1.0)}
+    assert compare_to_baseline(same, baseline, 0.25) == []
+    assert compare_to_baseline(same, None, 0.25) == []
+    problems = compare_to_baseline(slower, baseline, 0.25)
+    assert len(problems) == 3
+    assert "O(n) to O(n^2)" in problems[0]
+
+def test_compare_to_baseline_noise():
+    """Test spread is reported, widens the allowance only on request, and only
+    shared sizes are compared"""
+    baseline = {"sizes": _timings(n100=1e-4, n1000=1e-3, n10000=1e-2)}
+    noisy = {"sizes": {"1000": {"min": 1.4e-3, "median": 2e-3, "p90": 2.5e-3}}}
+    problems = compare_to_baseline(noisy, baseline, 0.25)
+    assert problems == ["n=1000: fastest 1.400 ms vs baseline 1.000 ms (+40%, allowed +25%; "
+                        "rounds spread +79% now, +10% baseline)"]
+    assert compare_to_baseline(noisy, baseline, 0.25, noise_allowance=True) == []
+    baseline["sizes"].update(_timings(n100000=1.0, n1000000=100.0))  # sizes this run skipped
+    partial = {"sizes": _timings(n100=1e-4, n1000=1e-3, n10000=1e-2)}
+    assert compare_to_baseline(partial, baseline, 0.25) == []
+
+def test_complexity_fit_skips_overhead_sizes():
+    """Test sizes too fast to time do not decide the complexity class"""
+    # Constant call overhead flattens the small sizes of an O(n) function
+    baseline = {"sizes": _timings(n10=2e-6, n100=2e-6, n1000=2e-5, n10000=2e-4,
+                                  n100000=2e-3, n1000000=2e-2)}
+    assert compare_to_baseline(baseline, baseline, 0.25) == []
+    slower = {"sizes": _timings(n10=2e-6, n100=2e-6, n1000=2e-5, n10000=2e-4,
+                                n100000=2e-2, n1000000=2.0)}
+    assert "complexity changed from O(n) to O(n^2)" in compare_to_baseline(slower, baseline, 0.25)
@@ -0,0 +1,48 @@
+# Test Dedup - streaming and approximate duplicate removal
+
+from itertools import count, islice
+
+import pytest
+from dedup import *
+
+def test_canonical_key():
+    """Test equal values get equal keys regardless of dict/set order"""
+    assert canonical_key({"b": [1], "a": 2}) == canonical_key({"a": 2, "b": [1]})
+    assert canonical_key({1, 2}) == canonical_key({2, 1})
+    assert canonical_key([1, 2]) != canonical_key((1, 2))
+    assert canonical_key("x") == "x"
+    with pytest.raises(TypeError):
+        canonical_key([bytearray(b"x")])
+
+def test_iter_unique_stream():
+    """Test deduplicating an endless stream lazily"""
+    stream = (i % 5 for i in count())
+    assert list(islice(iter_unique(stream), 5)) == [0, 1, 2, 3, 4]
+
+def test_iter_unique_key():
+    """Test deduplicating records by a key function"""
+    records = [{"id": 1, "v": "a"}, {"id": 2, "v": "b"}, {"id": 1, "v": "c"}]
+    assert list(iter_unique(records, key=lambda r: r["id"])) == records[:2]
+
+def test_bloom_filter():
+    """Test the Bloom filter has no false negatives and a bounded size"""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    assert bloom.add("x") is False
+    assert bloom.add("x") is True
+    assert "x" in bloom
+    assert BloomFilter(capacity=10**9, max_bytes=1024).nbytes == 1024
+
+def test_iter_unique_approximate():
+    """Test approximate mode drops all duplicates and few unique items"""
+    items = [i % 2000 for i in range(10_000)]
+    unique = list(iter_unique(items, approximate=True, capacity=2000, error_rate=0.01))
+    assert len(unique) == len(set(unique))
+    assert len(unique) >= 2000 * 0.95
+    assert list(iter_unique([{"a": 1}, {"a": 1}], approximate=True, capacity=10)) == [{"a": 1}]
+
+def test_iter_unique_approximate_hash_collisions():
+    """Test values whose Python hashes collide are not taken for duplicates"""
+    colliding = [-1, -2, 2**61 - 1, 0]  # hash(-1) == hash(-2), hash(2**61 - 1) == hash(0)
+    assert list(iter_unique(colliding, approximate=True, capacity=10)) == colliding
+    assert list(iter_unique([1, 1.0, True, "1", b"1"], approximate=True, capacity=10)) == [1, "1", b"1"]
+    assert list(iter_unique([{1, 2}, {2, 1}, [1, 2]], approximate=True, capacity=10)) == [{1, 2}, [1, 2]]
@@ -0,0 +1,52 @@
+# Test Email Validation - the stricter grammar and the bulk pipeline
+
+import pytest
+from email_validation import *
+
+VALID = [
+    "user@example.com",
+    "first.last+tag@mail.example.co.uk",
+    "o'brien@example.ie",
+    "x@xn--80ak6aa92e.com",
+    "USER@EXAMPLE.ORG",
+]
+INVALID = [
+    "",
+    "invalid-email",
+    "user@domain",
+    "@example.com",
+    "user@",
+    "first..last@example.com",
+    ".user@example.com",
+    "user@-example.com",
+    "user@example..com",
+    "user@example.c",
+    "user name@example.com",
+    "a" * 65 + "@example.com",
+    None,
+]
+
+def test_is_valid_email():
+    """Test the stricter grammar"""
+    for email in VALID:
+        assert is_valid_email(email) is True, email
+    for email in INVALID:
+        assert is_valid_email(email) is False, email
+
+def test_validate_emails_streams_in_order():
+    """Test bulk validation keeps input order and reports every chunk"""
+    emails = (VALID + INVALID) * 5
+    stats = []
+    results = list(validate_emails(iter(emails), chunk_size=7, on_chunk=stats.append))
+    assert [email for email, _ in results] == emails
+    assert [ok for _, ok in results] == [is_valid_email(email) for email in emails]
+    assert [s.index for s in stats] == list(range(len(stats)))
+    assert sum(s.size for s in stats) == len(emails)
+    assert sum(s.valid for s in stats) == len(VALID) * 5
+
+def test_validate_emails_process_pool():
+    """Test bulk validation across worker processes"""
+    emails = [f"user{i}@example{i % 3}.com" for i in range(50)] + ["bad"]
+    results = list(validate_emails(emails, workers=2, chunk_size=8))
+    assert [email for email, _ in results] == emails
+    assert [ok for _, ok in results] == [True] * 50 + [False]
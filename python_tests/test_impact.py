@@ -0,0 +1,108 @@
+# Test Impact - line diffing, function spans and change-aware selection
+
+import os
+import subprocess
+import sys
+import textwrap
+
+from testkit.impact import (affected_tests, changed_lines, function_spans, line_hashes, load_map,
+                            stale_reason, write_map)
+
+HELPERS = textwrap.dedent('''\
+    LIMIT = 10
+
+    def double(x):
+        return 2 * x
+
+    def square(x):
+        return x * x
+''')
+
+def test_changed_lines():
+    """Test edits, deletions and insertions map to recorded line numbers"""
+    old = line_hashes("a\nb\nc\nd\n")
+    assert changed_lines(old, "a\nb\nc\nd\n") == set()
+    assert changed_lines(old, "a\nB\nc\nd\n") == {2}
+    assert changed_lines(old, "a\nc\nd\n") == {2}
+    assert changed_lines(old, "a\nb\nnew\nc\nd\n") == {2, 3}
+
+def test_function_spans():
+    """Test function spans include decorators and nested functions"""
+    source = "import x\n\n@x.deco\ndef f():\n    def g():\n        pass\n    return g\n"
+    assert function_spans(source) == [(3, 7), (5, 6)]
+
+def _impact_map(root):
+    (root / "helpers.py").write_text(HELPERS)
+    return {
+        "files": {"helpers.py": {
+            "sha1": "recorded",
+            "lines": line_hashes(HELPERS),
+            "functions": function_spans(HELPERS),
+        }},
+        "tests": {
+            "test_helpers.py::test_double": {"helpers.py": [4]},
+            "test_helpers.py::test_square": {"helpers.py": [7]},
+        },
+    }
+
+def test_affected_tests_by_function(tmp_path):
+    """Test a change inside one function only selects the tests using it"""
+    impact_map = _impact_map(tmp_path)
+    (tmp_path / "helpers.py").write_text(HELPERS.replace("x * x", "x ** 2"))
+    assert affected_tests(impact_map, tmp_path) == ({"test_helpers.py::test_square"}, ["helpers.py"])
+
+def test_affected_tests_module_level(tmp_path):
+    """Test a module-level change selects every test covering the file"""
+    impact_map = _impact_map(tmp_path)
+    (tmp_path / "helpers.py").write_text(HELPERS.replace("LIMIT = 10", "LIMIT = 20"))
+    affected, _ = affected_tests(impact_map, tmp_path)
+    assert affected == {"test_helpers.py::test_double", "test_helpers.py::test_square"}
+
+def test_stale_map(tmp_path):
+    """Test missing maps and changed conftest files force a full run"""
+    assert stale_reason(None, tmp_path) == "no impact map recorded yet"
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "conftest.py").write_text("import pytest\n")
+    path = tmp_path / ".impact_map.json"
+    write_map(path, tmp_path, {}, {}, set())
+    assert stale_reason(load_map(path), tmp_path) is None
+    (tmp_path / "sub" / "conftest.py").write_text("import pytest\nFLAG = 1\n")
+    assert stale_reason(load_map(path), tmp_path) == f"{os.path.join('sub', 'conftest.py')} changed"
+    (tmp_path / "conftest.py").write_text("")
+    write_map(path, tmp_path, {}, {}, set())
+    (tmp_path / "conftest.py").unlink()
+    assert stale_reason(load_map(path), tmp_path) == "conftest.py changed"
+
+def _pytest(root, *args):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *args],
+                            cwd=root, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return result.stdout
+
+def test_impact_end_to_end(tmp_path):
+    """Test recording a map, then running only the affected tests"""
+    (tmp_path / "pytest.ini").write_text("[pytest]\n")
+    (tmp_path / "conftest.py").write_text('pytest_plugins = ["testkit.impact"]\n')
+    (tmp_path / "helpers.py").write_text(HELPERS)
+    (tmp_path / "test_helpers.py").write_text(textwrap.dedent('''\
+        from helpers import double, square
+
+        def test_double():
+            assert double(2) == 4
+
+        def test_square():
+            assert square(3) == 9
+    '''))
+    assert "2 passed" in _pytest(tmp_path, "--impact-record")
+    assert "2 deselected" in _pytest(tmp_path, "--impact")
+
+    (tmp_path / "helpers.py").write_text(HELPERS.replace("x * x", "x ** 2"))
+    output = _pytest(tmp_path, "--impact", "-rA")
+    assert "1 passed, 1 deselected" in output
+    assert "test_square" in output
+
+    (tmp_path / "conftest.py").write_text('pytest_plugins = ["testkit.impact"]\n# changed\n')
+    output = _pytest(tmp_path, "--impact")
+    assert "conftest.py changed - running all tests" in output
+    assert "2 passed" in output
@@ -1,5 +1,7 @@
 # Test My Functions - Write tests for your functions!
 
+import math
+
 import pytest
 from my_functions import *
 
@@ -15,6 +17,70 @@ def test_multiply_numbers():
     assert multiply_numbers(0, 5) == 0
     assert multiply_numbers(-2, 3) == -6
 
+def test_add_numbers_batch():
+    """Test element-wise addition with broadcasting"""
+    assert list(add_numbers_batch([1, 2, 3], [10, 20, 30])) == [11, 22, 33]
+    assert list(add_numbers_batch([1, 2, 3], 1)) == [2, 3, 4]
+    assert list(add_numbers_batch([5], [1, 2])) == [6, 7]
+    with pytest.raises(ValueError):
+        add_numbers_batch([1, 2, 3], [1, 2])
+
+def test_multiply_numbers_batch():
+    """Test element-wise multiplication into an out buffer"""
+    out = [0, 0, 0] if np is None else np.zeros(3, dtype=int)
+    result = multiply_numbers_batch([1, 2, 3], [4, 5, 6], out=out)
+    assert result is out
+    assert list(out) == [4, 10, 18]
+    assert list(multiply_numbers_batch([-1, 2], 0)) == [0, 0]
+
+def test_batch_does_not_overflow():
+    """Test batch results stay exact beyond the int64 range"""
+    assert list(multiply_numbers_batch([10**10], [10**10])) == [10**20]
+    assert list(add_numbers_batch([2**63 - 1], [1])) == [2**63]
+    assert list(add_numbers_batch([2**63 - 1, -5], [-1, 2**63])) == [2**63 - 2, 2**63 - 5]
+    assert list(multiply_numbers_batch([3, 4], [2**70, 1])) == [3 * 2**70, 4]
+
+def test_batch_out_buffers():
+    """Test list and typed ndarray out buffers on the NumPy path"""
+    if np is None:
+        pytest.skip("NumPy is not installed")
+    out = [None, None, None]
+    assert is_even_batch([1, 2, 4], out=out) is out
+    assert out == [False, True, True]
+    out = [0]
+    assert add_numbers_batch([2**62], [2**62], out=out) is out
+    assert out == [2**63]
+    out = np.zeros(1, dtype=object)
+    add_numbers_batch([2**62], [2**62], out=out)
+    assert out[0] == 2**63
+    out = np.zeros(2, dtype=np.int64)
+    assert add_numbers_batch([2**62, 1], np.array([1, 2], dtype=np.uint64), out=out) is out
+    assert list(out) == [2**62 + 1, 3]
+    with pytest.raises(OverflowError):
+        add_numbers_batch([2**62], [2**62], out=np.zeros(1, dtype=np.int64))
+
+def test_batch_pure_python_fallback(monkeypatch):
+    """Test the batch helpers without NumPy match the NumPy path"""
+    import my_functions
+    for numpy in (np, None):
+        monkeypatch.setattr(my_functions, "np", numpy)
+        assert add_numbers_batch(2, 3) == 5
+        assert multiply_numbers_batch(10**10, 10**10) == 10**20
+        assert type(add_numbers_batch(2, 3)) is int
+        assert list(add_numbers_batch([1, 2, 3], 1)) == [2, 3, 4]
+        assert list(multiply_numbers_batch([5], [1, 2])) == [5, 10]
+        assert list(is_even_batch([1, 2])) == [False, True]
+        out = [0, 0]
+        assert multiply_numbers_batch([2**63, 1], 2, out=out) is out
+        assert out == [2**64, 2]
+        with pytest.raises(ValueError):
+            add_numbers_batch([1, 2, 3], [1, 2])
+
+def test_is_even_batch():
+    """Test batch even number checking"""
+    assert list(is_even_batch([1, 2, 3, 4, 0, -2])) == [False, True, False, True, True, True]
+    assert list(is_even_batch([])) == []
+
 # TODO: Write tests for the remaining functions!
 # You need to write tests for 8 more functions
 
@@ -72,6 +138,51 @@ def test_factorial():
     assert factorial(3) == 6
     assert factorial(5) == 120
 
+def test_factorial_large():
+    """Test big factorials, including ones built from cached neighbours"""
+    assert factorial(2000) == math.factorial(2000)
+    assert factorial(2100) == math.factorial(2100)  # grows the cached 2000!
+    assert factorial(1900) == math.factorial(1900)  # computed afresh
+    assert factorial(2100) == math.factorial(2100)  # exact cache hit
+
+def test_factorial_never_divides_cached(monkeypatch):
+    """Test a smaller n does not divide down from a cached bigger factorial"""
+    import my_functions
+    clear_factorial_cache()
+    factorial(20_000)
+    products = []
+    real_range_product = my_functions._range_product
+    def spy(lo, hi):
+        products.append((lo, hi))
+        return real_range_product(lo, hi)
+    monkeypatch.setattr(my_functions, "_range_product", spy)
+    assert factorial(16_000) == math.factorial(16_000)
+    assert products == []  # the old slow path built (16001 ... 20000) to divide by
+    assert factorial(17_000) == math.factorial(17_000)  # multiplies up from 16000!
+    assert products[0] == (16_001, 17_001)
+
+def test_factorial_mod():
+    """Test factorial modulo m"""
+    assert factorial_mod(5, 7) == 1
+    assert factorial_mod(0, 7) == 1
+    assert factorial_mod(10, 5) == 0
+    assert factorial_mod(20, 1_000_003) == factorial(20) % 1_000_003
+    assert factorial_mod(3, 1) == 0
+    with pytest.raises(ValueError):
+        factorial_mod(-1, 7)
+
+def test_binomial():
+    """Test binomial coefficients with and without a modulus"""
+    assert binomial(5, 2) == 10
+    assert binomial(5, 0) == 1
+    assert binomial(3, 5) == 0
+    assert binomial(10, 3, mod=7) == 120 % 7
+    assert binomial(1000, 400, mod=10**9 + 7) == math.comb(1000, 400) % (10**9 + 7)
+    assert binomial(100, 50, mod=12) == math.comb(100, 50) % 12
+    assert binomial(3, 5, mod=7) == 0
+    with pytest.raises(ValueError):
+        binomial(-1, 2)
+
 def test_is_palindrome():
     """Test palindrome checking"""
     # TODO: Write tests for is_palindrome()
@@ -117,6 +228,13 @@ def test_remove_duplicates():
     assert remove_duplicates([5]) == [5]
     assert remove_duplicates(["a","b","a"]) == ["a","b"]
 
+def test_remove_duplicates_unhashable():
+    """Test removing duplicate dicts and lists, and using a key"""
+    records = [{"id": 1, "tags": ["a"]}, {"tags": ["a"], "id": 1}, {"id": 2, "tags": []}]
+    assert remove_duplicates(records) == [records[0], records[2]]
+    assert remove_duplicates([[1, 2], [1, 2], (1, 2)]) == [[1, 2], (1, 2)]
+    assert remove_duplicates(["a", "B", "b", "A"], key=str.lower) == ["a", "B"]
+
 def test_validate_email():
     """Test email validation"""
     # TODO: Write tests for validate_email()
@@ -0,0 +1,55 @@
+# Test Profiling - the Profiler behind --profile / @pytest.mark.profile
+
+import time
+
+from testkit.profiling import Profiler
+
+def busy_work():
+    """Burn some CPU and allocate some memory"""
+    data = [list(range(100)) for _ in range(2000)]
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    return data
+
+def test_profiler_collects_cpu_memory_and_stacks():
+    """Test all three kinds of profile data are collected"""
+    with Profiler(top=5, interval=0.001) as profiler:
+        busy_work()
+    assert "busy_work" in profiler.hot_functions()
+    assert profiler.peak_bytes > 100 * 2000 * 8
+    assert profiler.allocations
+    stacks = profiler.collapsed_stacks()
+    assert stacks
+    assert any("busy_work" in line for line in stacks)
+    stack, count = stacks[0].rsplit(" ", 1)
+    assert int(count) > 0
+    summary = profiler.summary()
+    assert "peak traced memory" in summary
+    assert "allocation sites" in summary
+
+def test_profile_marker(pytester):
+    """Test a marked test gets a profile section and a collapsed stack file"""
+    pytester.makeconftest('pytest_plugins = ["testkit.profiling"]')
+    pytester.makepyfile(test_sample='''
+        import pytest
+
+        @pytest.mark.profile
+        def test_marked():
+            sum(range(100000))
+
+        def test_plain():
+            pass
+    ''')
+    profile_dir = pytester.path / "profiles"
+    result = pytester.inline_run(f"--profile-dir={profile_dir}")
+    result.assertoutcome(passed=2)
+    calls = {report.nodeid.split("::")[-1]: report
+             for report in result.getreports("pytest_runtest_logreport") if report.when == "call"}
+    section = dict(calls["test_marked"].sections)["profile"]
+    assert "peak traced memory" in section
+    assert "profile" not in dict(calls["test_plain"].sections)
+    stack_file = profile_dir / "test_sample.py_test_marked.collapsed"
+    assert f"collapsed stacks: {stack_file}" in section
+    assert stack_file.read_text(encoding="utf-8").strip()
+    assert [path.name for path in profile_dir.iterdir()] == [stack_file.name]
@@ -0,0 +1,172 @@
+# Test Replay - record once from a local origin, then replay without it
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from testkit.fetch import fetch_all
+from testkit.replay import CassetteStore, ReplayServer, make_retry, make_session
+
+class _Origin(BaseHTTPRequestHandler):
+    """Stand-in for a real website that counts how often it is hit"""
+    hits = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.path == "/flaky" and type(self).hits == 1:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/old":
+            self.send_response(302)
+            self.send_header("Location", "/page")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = f"<html><title>Origin</title>{self.path}</html>".encode()
+        if self.path == "/links":
+            body = (b'<a href="https://example.com/a">a</a><form action="//example.org/s">'
+                    b'<a href="/root">r</a><script>x = "http://cdn.example.net:8080/x.js"</script>')
+        self.send_response(200)
+        self.send_header("Set-Cookie", "session=secret")
+        self.send_header("Content-Security-Policy", "default-src 'self'")
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+@pytest.fixture
+def origin():
+    """Local HTTP origin server, stopped at the end of the test"""
+    _Origin.hits = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Origin)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def http_session(tmp_path):
+    """Recording session with a throwaway store (keeps cassettes/ clean)"""
+    with make_session(CassetteStore(tmp_path), "once") as session:
+        yield session
+
+def test_cassette_key():
+    """Test requests are keyed by method, URL and body"""
+    key = CassetteStore.key
+    assert key("get", "http://a/") == key("GET", "http://a/")
+    assert key("GET", "http://a/") != key("POST", "http://a/")
+    assert key("POST", "http://a/", b"x") != key("POST", "http://a/", b"y")
+
+def test_record_then_replay(origin, tmp_path):
+    """Test the first request is recorded and later ones never hit the origin"""
+    store = CassetteStore(tmp_path)
+    with make_session(store, "once") as session:
+        assert "/page" in session.get(origin + "/page").text
+        assert session.get(origin + "/page").headers["Content-Type"].startswith("text/html")
+        session.post(origin + "/page", data=b"a")
+        session.post(origin + "/page", data=b"b")
+    assert _Origin.hits == 3
+    with make_session(store, "none") as session:
+        response = session.get(origin + "/page")
+        assert response.status_code == 200
+        assert response.text.endswith("/page</html>")
+        assert "Set-Cookie" not in response.headers
+        assert "Content-Security-Policy" not in response.headers
+        with pytest.raises(requests.ConnectionError):
+            session.get(origin + "/never-recorded")
+    assert _Origin.hits == 3
+
+def test_refresh_mode(origin, tmp_path):
+    """Test refresh mode always re-records"""
+    store = CassetteStore(tmp_path)
+    with make_session(store, "refresh") as session:
+        session.get(origin + "/page")
+        session.get(origin + "/page")
+    assert _Origin.hits == 2
+
+def test_replay_server(origin, tmp_path):
+    """Test the localhost mirror serves, rewrites redirects and resolves root links"""
+    with make_session(CassetteStore(tmp_path), "once") as session:
+        server = ReplayServer(session).start()
+        try:
+            page = server.mirror_url(origin + "/page?q=1")
+            assert page.startswith(server.base_url + "/http/127.0.0.1:")
+            mirrored = requests.get(page)
+            assert mirrored.text.endswith("/page?q=1</html>")
+            assert "Set-Cookie" not in mirrored.headers
+            assert "Content-Security-Policy" not in mirrored.headers
+            redirect = requests.get(server.mirror_url(origin + "/old"), allow_redirects=False)
+            assert redirect.headers["Location"] == server.mirror_url(origin + "/page")
+            linked = requests.get(server.base_url + "/style.css", headers={"Referer": page})
+            assert linked.text.endswith("/style.css</html>")
+            proxied = requests.get(origin + "/via-proxy", proxies={"http": server.base_url})
+            assert proxied.text.endswith("/via-proxy</html>")
+        finally:
+            server.stop()
+
+def test_transient_errors_not_recorded(origin, tmp_path):
+    """Test a 503 is passed through but not replayed later"""
+    with make_session(CassetteStore(tmp_path), "once") as session:
+        assert session.get(origin + "/flaky").status_code == 503
+        assert session.get(origin + "/flaky").status_code == 200
+        replayed = session.get(origin + "/flaky")
+    assert _Origin.hits == 2
+    assert replayed.status_code == 200
+    assert b"".join(replayed.iter_content(4)) == replayed.content
+    assert list(replayed.iter_lines()) == [replayed.content]
+    assert replayed.raw.read() == replayed.content
+
+def test_replay_server_rewrites_absolute_links(origin, tmp_path):
+    """Test absolute and protocol-relative links on a mirrored page stay on the mirror"""
+    with make_session(CassetteStore(tmp_path), "once") as session:
+        server = ReplayServer(session).start()
+        try:
+            html = requests.get(server.mirror_url(origin + "/links")).text
+        finally:
+            server.stop()
+    assert f'href="{server.base_url}/https/example.com/a"' in html
+    assert f'action="{server.base_url}/http/example.org/s"' in html  # page scheme
+    assert f'"{server.base_url}/http/cdn.example.net:8080/x.js"' in html
+    assert 'href="/root"' in html
+
+def test_fetch_all_concurrently(origin, tmp_path):
+    """Test concurrent fetching keeps order and reports errors and latency"""
+    urls = [f"{origin}/page{i}" for i in range(10)] + ["http://127.0.0.1:1/closed"]
+    with make_session(CassetteStore(tmp_path), "once", pool_maxsize=4,
+                      max_retries=make_retry(total=0)) as session:
+        results = fetch_all(session, urls, max_concurrency=4, timeout=5)
+    assert [r.url for r in results] == urls
+    assert all(r.response.status_code == 200 for r in results[:-1])
+    assert results[-1].response is None
+    assert isinstance(results[-1].error, requests.ConnectionError)
+    assert all(r.seconds >= 0 for r in results)
+
+def test_fetch_many_records_latency(request, origin, fetch_many):
+    """Test the fixture adds one latency property per URL to the report"""
+    results = fetch_many([origin + "/a", origin + "/b"])
+    assert [r.response.status_code for r in results] == [200, 200]
+    latencies = [name for name, _ in request.node.user_properties if name.startswith("latency_ms")]
+    assert latencies == [f"latency_ms {origin}/a", f"latency_ms {origin}/b"]
+
+def test_fetch_many_latency_report_section(pytester, origin):
+    """Test the latencies reach the report as a section and a pytest-html extra"""
+    pytester.makeconftest('pytest_plugins = ["testkit.replay", "testkit.fetch"]')
+    pytester.makepyfile(f'''
+        def test_fetch(fetch_many):
+            fetch_many(["{origin}/a", "http://127.0.0.1:1/closed"])
+    ''')
+    reports = pytester.inline_run("--http-retries=0").getreports("pytest_runtest_logreport")
+    call = next(report for report in reports if report.when == "call")
+    section = dict(call.sections)["latency"]
+    assert f"200  {origin}/a" in section
+    assert "ConnectionError  http://127.0.0.1:1/closed" in section
+    if hasattr(call, "extras"):
+        assert [extra["name"] for extra in call.extras] == ["Latency"]
@@ -0,0 +1,48 @@
+# Test Scheduler - grouping, LPT packing and the duration store
+
+import pytest
+from testkit.scheduler import group_tests, load_durations, lpt_schedule, main, merge_durations
+
+def test_group_tests_keeps_browser_tests_together_per_module():
+    """Test tests using a serial fixture are grouped by module"""
+    tests = [
+        {"nodeid": "a.py::test_1", "fixtures": ["driver", "request"]},
+        {"nodeid": "a.py::test_2", "fixtures": ["driver"]},
+        {"nodeid": "b.py::test_3", "fixtures": ["driver"]},
+        {"nodeid": "c.py::test_4", "fixtures": []},
+        {"nodeid": "c.py::test_5", "fixtures": ["tmp_path"]},
+    ]
+    groups = sorted(group_tests(tests))
+    assert groups == [["a.py::test_1", "a.py::test_2"], ["b.py::test_3"],
+                      ["c.py::test_4"], ["c.py::test_5"]]
+
+def test_lpt_schedule_balances_load():
+    """Test longest-first packing balances predicted work"""
+    groups = [["slow"], ["a"], ["b"], ["c"], ["d"], ["new"]]
+    durations = {"slow": 8.0, "a": 4.0, "b": 4.0, "c": 2.0, "d": 2.0}
+    plan = lpt_schedule(groups, durations, workers=2)
+    loads = sorted(load for load, _ in plan)
+    # "new" has no history and is estimated at the median (4.0)
+    assert loads == [12.0, 12.0]
+    assert sorted(nodeid for _, ids in plan for nodeid in ids) == sorted(sum(groups, []))
+    assert lpt_schedule([["x"]], {}, workers=3)[0] == (1.0, ["x"])
+
+def test_merge_durations_smooths(tmp_path):
+    """Test stored durations are blended with new measurements"""
+    store = tmp_path / "durations.json"
+    assert load_durations(store) == {}
+    merge_durations(store, {"t": 2.0})
+    merge_durations(store, {"t": 4.0, "u": 1.0})
+    assert load_durations(store) == {"t": 3.0, "u": 1.0}
+
+def test_scheduler_runs_workers(request, monkeypatch, tmp_path, capsys):
+    """Test an end-to-end run over two worker processes"""
+    monkeypatch.chdir(request.config.rootpath)
+    store = tmp_path / "durations.json"
+    code = main(["-n", "2", "--durations-path", str(store), "python_tests/test_dedup.py"])
+    assert code == 0
+    report = capsys.readouterr().out
+    assert "predicted" in report and "wall time" in report
+    recorded = load_durations(store)
+    assert recorded
+    assert all(nodeid.startswith("python_tests/test_dedup.py::") for nodeid in recorded)
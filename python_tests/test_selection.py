@@ -0,0 +1,44 @@
+# Test Selection - top_k, argmax and max_by
+
+import pytest
+from my_functions import find_max
+from selection import *
+
+NUMBERS = [5, 1, 9, 3, 7, 9, -2]
+
+def test_top_k():
+    """Test selecting the k largest items"""
+    assert top_k(NUMBERS, 3) == [9, 9, 7]
+    assert top_k(iter(NUMBERS), 1) == [find_max(NUMBERS)]
+    assert top_k(["bb", "a", "ccc"], 2, key=len) == ["ccc", "bb"]
+    assert top_k(NUMBERS, 0) == []
+    assert top_k([], 3) == []
+
+def test_argmax():
+    """Test finding the position of the largest item"""
+    assert argmax(NUMBERS) == 2
+    assert argmax(iter(["bb", "a", "ccc"]), key=len) == 2
+    with pytest.raises(ValueError):
+        argmax([])
+
+def test_max_by():
+    """Test finding the largest item per group"""
+    assert max_by([1, 8, 3, 6], group=lambda n: n % 2) == {1: 3, 0: 8}
+    words = ["apple", "avocado", "banana", "blueberry", "cherry"]
+    assert max_by(words, group=lambda w: w[0], key=len) == {
+        "a": "avocado", "b": "blueberry", "c": "cherry"}
+
+def test_numpy_arrays():
+    """Test the argpartition/argmax fast paths for arrays"""
+    np = pytest.importorskip("numpy")
+    values = np.array(NUMBERS)
+    assert list(top_k(values, 3)) == [9, 9, 7]
+    assert list(top_k(values, 10)) == sorted(NUMBERS, reverse=True)
+    assert argmax(values) == 2
+
+def test_parallel_reduction():
+    """Test chunked reduction across processes matches the single pass"""
+    values = [(i * 7919) % 1000 for i in range(2000)]
+    assert top_k(values, 5, workers=3) == top_k(values, 5)
+    assert argmax(values, workers=3) == argmax(values)
+    assert max_by(values, group=abs, workers=3) == max_by(values, group=abs)
@@ -0,0 +1,130 @@
+# Test Stream - JSONL result stream and the JUnit/HTML merge tool
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import xml.etree.ElementTree as ET
+
+from testkit.stream import StreamWriter, iter_results, main, summarize
+
+def _entry(nodeid, outcome, suite="pytest", **extra):
+    module, _, name = nodeid.partition("::")
+    return {"event": "test", "suite": suite, "nodeid": nodeid, "classname": module,
+            "name": name, "outcome": outcome, "duration": 0.5, "start": 1700000000.0,
+            "summary": "", "message": "", "stdout": "", "stderr": "", "log": "", **extra}
+
+def _write_stream(path, entries):
+    writer = StreamWriter(str(path), fsync_interval=0)
+    writer.write({"event": "session_start", "suite": "pytest"})
+    for entry in entries:
+        writer.write(entry)
+    writer.close()
+
+def test_iter_results_skips_partial_lines(tmp_path):
+    """Test only complete test lines are read from a stream"""
+    stream = tmp_path / "results.jsonl"
+    _write_stream(stream, [_entry("a.py::test_1", "passed")])
+    with open(stream, "a", encoding="utf-8") as f:
+        f.write('{"event": "test", "nodeid": "a.py::te')
+    assert [entry["nodeid"] for entry in iter_results([stream])] == ["a.py::test_1"]
+
+def test_stream_lines_visible_before_fsync(tmp_path):
+    """Test a written line can be read at once, long before the next fsync"""
+    stream = tmp_path / "results.jsonl"
+    writer = StreamWriter(str(stream), fsync_interval=3600)
+    writer.write(_entry("a.py::test_1", "passed"))
+    assert [entry["nodeid"] for entry in iter_results([stream])] == ["a.py::test_1"]
+    writer.close()
+
+def test_retried_tests_count_once(tmp_path):
+    """Test only the last attempt of a retried test is reported"""
+    stream = tmp_path / "results.jsonl"
+    _write_stream(stream, [
+        _entry("spec > flaky", "failed", suite="chromium", attempt=1),
+        _entry("spec > flaky", "passed", suite="chromium", attempt=2),
+        _entry("spec > flaky", "passed", suite="firefox", attempt=1),
+    ])
+    assert [(e["suite"], e["outcome"]) for e in iter_results([stream])] == [
+        ("chromium", "passed"), ("firefox", "passed")]
+    assert summarize([stream])["chromium"]["tests"] == 1
+    report = tmp_path / "out.html"
+    main([str(stream), "--html", str(report)])
+    assert "(attempt 2)" in report.read_text(encoding="utf-8")
+
+def test_summarize_per_suite(tmp_path):
+    """Test totals are counted per suite across several streams"""
+    first, second = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    _write_stream(first, [_entry("a.py::test_1", "passed"), _entry("a.py::test_2", "failed")])
+    _write_stream(second, [_entry("spec > works", "skipped", suite="chromium")])
+    suites = summarize([first, second])
+    assert suites["pytest"]["tests"] == 2 and suites["pytest"]["failed"] == 1
+    assert suites["chromium"]["skipped"] == 1
+    assert suites["pytest"]["time"] == 1.0
+
+def test_merge_to_junit_and_html(tmp_path):
+    """Test the merge tool writes valid JUnit XML and an HTML page"""
+    stream = tmp_path / "results.jsonl"
+    _write_stream(stream, [
+        _entry("a.py::test_ok", "passed", stdout="hello\x1b[0m <world>"),
+        _entry("a.py::test_bad", "failed", summary="assert 1 == 2", message="E  assert 1 == 2"),
+    ])
+    junit, report = tmp_path / "out.xml", tmp_path / "out.html"
+    assert main([str(stream), "--junit", str(junit), "--html", str(report)]) == 0
+
+    root = ET.parse(junit).getroot()
+    assert root.get("tests") == "2" and root.get("failures") == "1"
+    cases = {case.get("name"): case for case in root.iter("testcase")}
+    assert cases["test_bad"].find("failure").get("message") == "assert 1 == 2"
+    assert cases["test_ok"].find("system-out").text == "hello[0m <world>"
+    assert "a.py::test_bad" in report.read_text(encoding="utf-8")
+
+def _sample_run(request, root, stream):
+    """Run a three-test sample project with --stream-report stream"""
+    (root / "pytest.ini").write_text("[pytest]\n")
+    (root / "conftest.py").write_text('pytest_plugins = ["testkit.stream"]\n')
+    (root / "test_sample.py").write_text(textwrap.dedent('''\
+        import pytest
+
+        def test_pass():
+            print("out")
+
+        def test_fail():
+            assert 1 == 2
+
+        @pytest.mark.skip(reason="not today")
+        def test_skip():
+            pass
+    '''))
+    env = {**os.environ, "PYTHONPATH": str(request.config.rootpath)}
+    subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+                    "--stream-report", str(stream)], cwd=root, env=env, stdout=subprocess.PIPE)
+
+def test_stream_report_plugin(request, tmp_path):
+    """Test a pytest run streams one line per test with outcome and output"""
+    stream = tmp_path / "results.jsonl"
+    _sample_run(request, tmp_path, stream)
+
+    lines = [json.loads(line) for line in stream.read_text(encoding="utf-8").splitlines()]
+    assert lines[0]["event"] == "session_start" and lines[-1]["event"] == "session_finish"
+    tests = {entry["name"]: entry for entry in lines if entry["event"] == "test"}
+    assert {name: entry["outcome"] for name, entry in tests.items()} == {
+        "test_pass": "passed", "test_fail": "failed", "test_skip": "skipped"}
+    assert tests["test_pass"]["stdout"] == "out\n"
+    assert tests["test_fail"]["summary"] == "assert 1 == 2"
+    assert tests["test_skip"]["message"] == "Skipped: not today"
+    assert tests["test_pass"]["classname"] == "test_sample"
+    assert tests["test_pass"]["attempt"] == 1
+
+def test_stream_report_replaced_each_run(request, tmp_path):
+    """Test a second run into the same stream replaces the first, so merges count it once"""
+    stream = tmp_path / "results.jsonl"
+    _sample_run(request, tmp_path, stream)
+    _sample_run(request, tmp_path, stream)
+    events = [json.loads(line)["event"] for line in stream.read_text(encoding="utf-8").splitlines()]
+    assert events.count("session_start") == 1 and len(events) == 5
+    junit = tmp_path / "merged.xml"
+    assert main([str(stream), "--junit", str(junit)]) == 0
+    root = ET.parse(junit).getroot()
+    assert root.get("tests") == "3" and root.get("failures") == "1"
@@ -0,0 +1,55 @@
+# Test Text Streams - the chunked versions must agree with my_functions.py
+
+import pytest
+from my_functions import count_vowels, is_palindrome, reverse_string
+from text_streams import *
+
+SAMPLES = [
+    "",
+    "a",
+    "hello world",
+    "A man, a plan, a canal, Panama",
+    "Was it a car or a cat I saw?",
+    "Ésope reste ici et se repose",
+    "naïve ünïcödé text ☃ with snow ☃",
+    "☃ab☃ba☃",
+]
+
+@pytest.fixture
+def write_text(tmp_path):
+    """Write text to a temporary UTF-8 file and return its path"""
+    def _write(text):
+        path = tmp_path / "sample.txt"
+        path.write_text(text, encoding="utf-8")
+        return path
+    return _write
+
+def test_count_vowels_iter():
+    """Test vowel counting over str and bytes chunks"""
+    assert count_vowels_iter(["hel", "lo"]) == 2
+    assert count_vowels_iter([b"AEI", b"OU"]) == 5
+    assert count_vowels_iter([]) == 0
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 20])
+def test_count_vowels_file(write_text, chunk_size):
+    """Test vowel counting on files matches count_vowels"""
+    for text in SAMPLES:
+        path = write_text(text)
+        assert count_vowels_file(path, chunk_size) == count_vowels(text)
+        assert count_vowels_mmap(text.encode("utf-8"), chunk_size) == count_vowels(text)
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 1 << 20])
+def test_is_palindrome_file(write_text, chunk_size):
+    """Test the two-pointer palindrome check matches is_palindrome"""
+    for text in SAMPLES + ["racecar", "abca", "ab" * 50 + "x" + "ba" * 50]:
+        path = write_text(text)
+        assert is_palindrome_file(path, chunk_size) == is_palindrome(text), text
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 20])
+def test_reverse_file(write_text, tmp_path, chunk_size):
+    """Test chunked file reversal matches reverse_string"""
+    for text in SAMPLES:
+        src = write_text(text)
+        dst = tmp_path / "reversed.txt"
+        reverse_file(src, dst, chunk_size)
+        assert dst.read_text(encoding="utf-8") == reverse_string(text)
@@ -1,11 +1,12 @@
 import pytest
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
+from html_parsing import clear_parse_cache, parse_html
 
-def test_httpbin_get_request():
-    """Test basic GET request to httpbin"""
-    response = requests.get("https://httpbin.org/get")
+
+def test_httpbin_get_request(http_session):
+    """Test basic GET request to httpbin (replayed from cassettes/ after the first run)"""
+    response = http_session.get("https://httpbin.org/get")
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/json"
 
@@ -21,8 +22,31 @@ def test_html_parsing():
     </html>
     """
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = parse_html(html_content)
     
     # Test finding elements
     assert soup.h1.text == "Test Page"
     assert soup.find('p', class_='intro').text == "This is a test paragraph."
+
+
+def test_partial_html_parsing():
+    """Test building only the requested elements"""
+    html_content = "<html><body><h1>Title</h1><p>One</p><a href='/x'>Link</a><p>Two</p></body></html>"
+
+    paragraphs = parse_html(html_content, only="p")
+    assert [p.text for p in paragraphs.find_all("p")] == ["One", "Two"]
+    assert paragraphs.h1 is None
+
+    links = parse_html(html_content, only=SoupStrainer("a", href=True))
+    assert links.a["href"] == "/x"
+    assert parse_html(html_content, only=["h1", "a"]).get_text() == "TitleLink"
+
+
+def test_html_parse_cache():
+    """Test identical content is parsed once per parser/strainer"""
+    clear_parse_cache()
+    html_content = "<p>cached</p>"
+    assert parse_html(html_content) is parse_html(html_content.encode("utf-8"))
+    assert parse_html(html_content, only="p") is not parse_html(html_content)
+    assert parse_html(html_content, cache=False) is not parse_html(html_content)
+    assert parse_html(html_content, parser="html.parser").p.text == "cached"
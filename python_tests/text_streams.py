@@ -0,0 +1,189 @@
+# Text Streams - Chunked versions of count_vowels, is_palindrome and reverse_string
+#
+# These work on files (and iterators of chunks) of any size while only ever
+# holding a few chunks in memory. Files are read as UTF-8.
+
+import mmap
+import os
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+
+_VOWELS = "aeiouAEIOU"
+_VOWEL_BYTES = _VOWELS.encode("ascii")
+_DELETE_VOWELS = str.maketrans("", "", _VOWELS)
+
+# bytes.translate tables for the ASCII fast path of the palindrome check
+_ASCII_LOWER = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+_ASCII_NOT_ALNUM = bytes(b for b in range(128) if not chr(b).isalnum())
+
+
+def _is_continuation_byte(byte):
+    """Return True if byte is the middle of a multi-byte UTF-8 character"""
+    return byte & 0xC0 == 0x80
+
+
+def count_vowels_iter(chunks):
+    """Count vowels (a, e, i, o, u - case insensitive) across chunks of text
+
+    Args:
+        chunks (iterable): Chunks of str or UTF-8 bytes
+
+    Returns:
+        int: Number of vowels in all chunks together
+
+    Examples:
+        count_vowels_iter(["hel", "lo"]) should return 2
+        count_vowels_iter([b"AEI", b"OU"]) should return 5
+    """
+    total = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            total += len(chunk) - len(chunk.translate(_DELETE_VOWELS))
+        else:
+            # Vowels are ASCII, so they can never appear inside a
+            # multi-byte UTF-8 sequence and can be counted on raw bytes.
+            total += len(chunk) - len(chunk.translate(None, _VOWEL_BYTES))
+    return total
+
+
+def iter_file_chunks(path, chunk_size=CHUNK_SIZE):
+    """Yield a file's contents as bytes chunks of at most chunk_size"""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def count_vowels_file(path, chunk_size=CHUNK_SIZE):
+    """Count vowels in a file without loading it into memory
+
+    Args:
+        path (str): Path to a UTF-8 text file
+        chunk_size (int): Number of bytes read at a time
+
+    Returns:
+        int: Number of vowels in the file
+    """
+    return count_vowels_iter(iter_file_chunks(path, chunk_size))
+
+
+def count_vowels_mmap(buffer, chunk_size=CHUNK_SIZE):
+    """Count vowels in a memory-mapped (or any bytes-like) buffer
+
+    Args:
+        buffer (mmap.mmap | bytes): UTF-8 encoded text
+        chunk_size (int): Number of bytes examined at a time
+
+    Returns:
+        int: Number of vowels in the buffer
+    """
+    return count_vowels_iter(
+        buffer[start:start + chunk_size] for start in range(0, len(buffer), chunk_size)
+    )
+
+
+def _clean(raw):
+    """Keep only alphanumeric characters of a UTF-8 chunk, lowercased"""
+    if raw.isascii():
+        return raw.translate(_ASCII_LOWER, _ASCII_NOT_ALNUM).decode("ascii")
+    text = raw.decode("utf-8", errors="replace")
+    return "".join(c.lower() for c in text if c.isalnum())
+
+
+def is_palindrome_mmap(buffer, chunk_size=CHUNK_SIZE):
+    """Check if a UTF-8 buffer reads the same forwards and backwards
+
+    Uses two pointers that walk in from both ends one chunk at a time,
+    ignoring case and non-alphanumeric characters like is_palindrome().
+    Only the chunks currently being compared are kept in memory.
+
+    Args:
+        buffer (mmap.mmap | bytes): UTF-8 encoded text
+        chunk_size (int): Number of bytes read from each end at a time
+
+    Returns:
+        bool: True if palindrome, False otherwise
+    """
+    lo, hi = 0, len(buffer)
+    front = back = ""  # cleaned text not yet matched; back is stored reversed
+    while lo < hi:
+        if len(front) <= len(back):
+            end = min(lo + chunk_size, hi)
+            while end < hi and _is_continuation_byte(buffer[end]):
+                end += 1
+            front += _clean(buffer[lo:end])
+            lo = end
+        else:
+            start = max(hi - chunk_size, lo)
+            while start > lo and _is_continuation_byte(buffer[start]):
+                start -= 1
+            back += _clean(buffer[start:hi])[::-1]
+            hi = start
+        matched = min(len(front), len(back))
+        if front[:matched] != back[:matched]:
+            return False
+        front, back = front[matched:], back[matched:]
+    # Whatever is left unmatched is the middle of the text.
+    middle = front + back[::-1]
+    return middle == middle[::-1]
+
+
+def is_palindrome_file(path, chunk_size=CHUNK_SIZE):
+    """Check if a UTF-8 text file is a palindrome using a memory map
+
+    Args:
+        path (str): Path to a UTF-8 text file
+        chunk_size (int): Number of bytes read from each end at a time
+
+    Returns:
+        bool: True if palindrome, False otherwise
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return True  # mmap cannot map empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return is_palindrome_mmap(buffer, chunk_size)
+
+
+def iter_reversed_chunks(path, chunk_size=CHUNK_SIZE):
+    """Yield the text of a UTF-8 file reversed, one str chunk at a time
+
+    Chunks are read from the end of the file backwards and never split a
+    multi-byte character, so joining the chunks equals reverse_string(text).
+
+    Args:
+        path (str): Path to a UTF-8 text file
+        chunk_size (int): Number of bytes read at a time
+
+    Yields:
+        str: Reversed text, starting from the end of the file
+    """
+    # A UTF-8 character is at most 4 bytes, so every chunk holds a character start.
+    chunk_size = max(chunk_size, 4)
+    with open(path, "rb") as f:
+        hi = os.fstat(f.fileno()).st_size
+        while hi > 0:
+            start = max(hi - chunk_size, 0)
+            f.seek(start)
+            raw = f.read(hi - start)
+            # Bytes before the first character start belong to the next chunk.
+            skip = 0
+            while start > 0 and _is_continuation_byte(raw[skip]):
+                skip += 1
+            yield raw[skip:].decode("utf-8")[::-1]
+            hi = start + skip
+
+
+def reverse_file(src, dst, chunk_size=CHUNK_SIZE):
+    """Write the reversed text of src into dst without loading either in memory
+
+    Args:
+        src (str): Path to the UTF-8 text file to reverse
+        dst (str): Path to write the reversed text to
+        chunk_size (int): Number of bytes read at a time
+    """
+    with open(dst, "w", encoding="utf-8", newline="") as out:
+        for chunk in iter_reversed_chunks(src, chunk_size):
+            out.write(chunk)
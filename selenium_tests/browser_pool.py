@@ -0,0 +1,136 @@
+# Browser Pool - Reuse warm WebDriver sessions instead of starting Chrome per test
+#
+# Starting Chrome takes seconds; resetting an existing session takes
+# milliseconds. The pool hands out drivers, resets them when they come
+# back and replaces them after max_uses tests or when a reset fails
+# (which usually means the browser crashed).
+
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+
+def reset_driver(driver):
+    """Bring a driver back to a blank state for the next test
+
+    Closes extra windows/tabs, clears cookies and web storage and
+    navigates to about:blank.
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    # Storage belongs to the page's origin, so clear it before leaving the page.
+    driver.execute_script(
+        "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+    )
+    try:
+        # Chrome can drop cookies for every domain at once...
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    except (AttributeError, WebDriverException):
+        # ...other browsers only for the current one.
+        driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass  # already dead, possibly with its chromedriver gone too
+
+
+class BrowserPool:
+    """Thread-safe pool of up to size WebDriver sessions
+
+    Args:
+        factory (callable): Creates a new driver
+        size (int): Maximum number of drivers alive at the same time
+        max_uses (int): Replace a driver after it has served this many tests
+        reset (callable): Cleans a returned driver; if it raises, the driver
+            is thrown away and a fresh one is started on the next acquire
+    """
+
+    def __init__(self, factory, size=1, max_uses=50, reset=reset_driver):
+        self._factory = factory
+        self._reset = reset
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = queue.LifoQueue()  # most recently used (warmest) first
+        self._uses = {}
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.recycled = 0
+
+    def acquire(self, timeout=None):
+        """Take a driver from the pool, starting one if none is idle"""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"no browser became free within {timeout} seconds")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            driver = self._factory()
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._uses[id(driver)] = 0
+            self.created += 1
+        return driver
+
+    def release(self, driver, broken=False):
+        """Return a driver to the pool (or retire it if it is worn out or broken)"""
+        try:
+            with self._lock:
+                self._uses[id(driver)] += 1
+                worn_out = self._uses[id(driver)] >= self.max_uses
+            if not broken and not worn_out:
+                try:
+                    self._reset(driver)
+                except Exception:
+                    # A dead chromedriver raises urllib3 connection errors,
+                    # a session without windows IndexError - not just
+                    # WebDriverException.
+                    broken = True
+            if broken or worn_out:
+                self._retire(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """Context manager that acquires a driver and always releases it
+
+        If the block raises, the driver is retired rather than reused.
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.release(driver, broken=True)
+            raise
+        self.release(driver)
+
+    def _retire(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self.recycled += 1
+        _quit(driver)
+
+    def close(self):
+        """Quit every idle driver"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._uses.pop(id(driver), None)
+            _quit(driver)
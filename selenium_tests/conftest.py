@@ -0,0 +1,219 @@
+# Shared Selenium fixtures - every test borrows a warm browser from a pool
+#
+# The pool is session scoped, which under pytest-xdist means one pool per
+# worker process, so parallel workers never share a browser.
+
+import time
+import warnings
+
+import pytest
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from browser_pool import BrowserPool
+from driver_resolver import DEFAULT_CACHE_DIR, ChromeVersionUnknown, resolve_chromedriver
+from fast_load import (DEFAULT_BLOCKED_TYPES, DEFAULT_BLOCKED_URLS, block_resources,
+                       fast_load_options, record_navigations)
+from tab_checks import check_pages
+
+try:
+    from pytest_html import extras as html_extras
+except ImportError:  # pytest-html is optional - the terminal section still works
+    html_extras = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("selenium")
+    group.addoption("--browser-pool-size", type=int, default=1,
+                    help="number of Chrome sessions each worker may keep open (default: 1)")
+    group.addoption("--browser-max-uses", type=int, default=50,
+                    help="restart a Chrome session after this many tests (default: 50)")
+    group.addoption("--chromedriver-cache", default=str(DEFAULT_CACHE_DIR),
+                    help="chromedriver cache directory (default: $CHROMEDRIVER_CACHE or "
+                         "~/.cache/testing-playground/chromedriver)")
+    group.addoption("--chromedriver-version", default=None,
+                    help="use exactly this cached chromedriver version")
+    group.addoption("--chromedriver-offline", action="store_true",
+                    help="never download chromedriver; fail if the cache has no match")
+    group.addoption("--fast-load", action="store_true",
+                    help="eager page loads, blocked heavy resources, no implicit waits")
+    group.addoption("--block-resources", default=",".join(DEFAULT_BLOCKED_TYPES),
+                    help="resource types blocked in fast-load mode "
+                         f"(default: {','.join(DEFAULT_BLOCKED_TYPES)}; '' blocks none)")
+    group.addoption("--block-url", action="append", default=None, metavar="PATTERN",
+                    help="URL pattern blocked in fast-load mode, e.g. '*ads.example.com*' "
+                         "(repeatable; default: common analytics and ad hosts)")
+
+
+def chrome_options():
+    """Chrome options shared by every test browser"""
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")  # Run in headless mode for CI/CD
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    return options
+
+
+@pytest.fixture(scope="session")
+def chromedriver_path(request):
+    """chromedriver for this session, resolved once rather than once per browser"""
+    config = request.config
+    started = time.perf_counter()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ChromeVersionUnknown)
+        driver_path, driver_version = resolve_chromedriver(
+            config.getoption("--chromedriver-cache"),
+            pinned=config.getoption("--chromedriver-version"),
+            offline=config.getoption("--chromedriver-offline"),
+        )
+    config._chromedriver = (driver_version, driver_path, time.perf_counter() - started,
+                            [str(warning.message) for warning in caught])
+    return driver_path
+
+
+def _chrome_factory(config, driver_path, page_load_strategy=None):
+    """Function that starts a test browser configured by the command line"""
+    fast = config.getoption("--fast-load")
+    blocked_types = [t for t in config.getoption("--block-resources").split(",") if t]
+    blocked_urls = config.getoption("--block-url") or DEFAULT_BLOCKED_URLS
+
+    def start_chrome():
+        options = chrome_options()
+        if fast:
+            fast_load_options(options, block_images="image" in blocked_types)
+        if page_load_strategy:
+            options.page_load_strategy = page_load_strategy
+        driver = webdriver.Chrome(service=Service(str(driver_path)), options=options)
+        if fast:
+            # Tests wait explicitly (fast_load.wait_for_selector) instead
+            # of letting every find_element poll for up to 10 s.
+            driver.implicitly_wait(0)
+            block_resources(driver, blocked_types, blocked_urls)
+        else:
+            driver.implicitly_wait(10)
+        return driver
+
+    return start_chrome
+
+
+@pytest.fixture(scope="session")
+def browser_pool(request, chromedriver_path):
+    """Pool of warm Chrome sessions for this test session (or xdist worker)"""
+    pool = BrowserPool(
+        _chrome_factory(request.config, chromedriver_path),
+        size=request.config.getoption("--browser-pool-size"),
+        max_uses=request.config.getoption("--browser-max-uses"),
+    )
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def tab_check_pool(request, chromedriver_path):
+    """Pool of Chrome sessions for check_pages(), with pageLoadStrategy "none"
+
+    With any other strategy chromedriver waits for a tab's pending
+    navigation before running the next command, so the tabs would load
+    one after another instead of side by side.
+    """
+    pool = BrowserPool(
+        _chrome_factory(request.config, chromedriver_path, page_load_strategy="none"),
+        size=1,
+        max_uses=request.config.getoption("--browser-max-uses"),
+    )
+    yield pool
+    pool.close()
+
+
+def _page_timings(item):
+    """Report lines for the page loads timed during a test"""
+    recorder = getattr(item, "_navigation_recorder", None)
+    lines = []
+    for url, timing in recorder.navigations if recorder else ():
+        details = ", ".join(f"{key} {value:.1f}" for key, value in timing.items() if key != "get_ms")
+        lines.append(f"{timing['get_ms']:10.1f} ms  get {url}" + (f"  ({details})" if details else ""))
+    return lines + getattr(item, "_tab_check_timings", [])
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    if call.when != "call":
+        return
+    report = outcome.get_result()
+    if report.failed:
+        item._test_failed = True
+    lines = _page_timings(item)
+    if lines:
+        summary = "\n".join(lines)
+        report.sections.append(("page timings", summary))
+        if html_extras is not None:
+            report.extras = getattr(report, "extras", []) + [
+                html_extras.text(summary, name="Page timings")]
+
+
+@pytest.fixture
+def driver(request, browser_pool):
+    """Chrome driver borrowed from the pool and reset after the test
+
+    The browser of a failed test is retired instead of handed to the next
+    test, in case the failure left the session wedged.
+
+    In fast-load mode every driver.get() is timed. The timings are added
+    to the report as a "page timings" section (terminal and pytest-html
+    log), a pytest-html text extra and ("nav_ms <url>", {...}) user
+    properties for JUnit XML.
+    """
+    driver = browser_pool.acquire()
+    try:
+        if not request.config.getoption("--fast-load"):
+            yield driver
+            return
+        wrapped, recorder = record_navigations(driver)
+        request.node._navigation_recorder = recorder
+        try:
+            yield wrapped
+        finally:
+            for url, timing in recorder.navigations:
+                request.node.user_properties.append(
+                    (f"nav_ms {url}", {key: round(value, 1) for key, value in timing.items()})
+                )
+    finally:
+        browser_pool.release(driver, broken=getattr(request.node, "_test_failed", False))
+
+
+@pytest.fixture
+def tab_checks(request, tab_check_pool):
+    """check_pages() on a browser from tab_check_pool that records load times in the report
+
+    Each page adds a line to the test's "page timings" report section and
+    a ("load_ms <url>", milliseconds) user property.
+    """
+    driver = tab_check_pool.acquire()
+    lines = request.node._tab_check_timings = []
+
+    def _tab_checks(checks, concurrency=4, timeout=30, wait_for="complete"):
+        results = check_pages(driver, checks, concurrency, timeout, wait_for)
+        for result in results:
+            milliseconds = round(result.seconds * 1000, 1)
+            request.node.user_properties.append((f"load_ms {result.url}", milliseconds))
+            status = "ok" if result.ok else type(result.error).__name__
+            lines.append(f"{milliseconds:10.1f} ms  tab {result.url}  {status}")
+        return results
+
+    try:
+        yield _tab_checks
+    finally:
+        tab_check_pool.release(driver, broken=getattr(request.node, "_test_failed", False))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    resolved = getattr(config, "_chromedriver", None)
+    if resolved is not None:
+        version, path, seconds, problems = resolved
+        terminalreporter.write_line(
+            f"chromedriver {version} ({path}) resolved in {seconds * 1000:.1f} ms"
+        )
+        for problem in problems:
+            terminalreporter.write_line(f"warning: {problem}", yellow=True)
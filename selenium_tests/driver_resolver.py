@@ -0,0 +1,316 @@
+# Driver Resolver - Pinned, cached chromedriver that works offline
+#
+# ChromeDriverManager().install() looks up versions (network) and reads
+# its own metadata on every call. This resolver keeps chromedriver
+# binaries in a local cache directory with a small metadata.json and
+# picks the one matching the installed Chrome:
+#   - a cache hit costs a JSON read and a stat(), no network, no subprocess
+#     (Chrome's version is remembered until the Chrome binary changes),
+#   - a cache miss downloads through webdriver_manager once and stores
+#     the binary, unless offline=True,
+#   - a pinned version is checked against Chrome's major version, so a
+#     mismatch fails with a clear message instead of "session not created".
+#     When Chrome's version cannot be detected nothing can be checked;
+#     resolve_chromedriver() then warns (ChromeVersionUnknown).
+#
+# Pre-populate a cache for offline machines (CHROMEDRIVER_CACHE selects it):
+#   python selenium_tests/driver_resolver.py add /path/to/chromedriver
+#   python selenium_tests/driver_resolver.py download
+#   python selenium_tests/driver_resolver.py pin 120.0.6099.109
+#   python selenium_tests/driver_resolver.py show
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import warnings
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    "CHROMEDRIVER_CACHE", Path.home() / ".cache" / "testing-playground" / "chromedriver"
+))
+DRIVER_NAME = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+CHROME_CANDIDATES = (
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
+_VERSION = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+
+
+class DriverResolutionError(RuntimeError):
+    """No usable chromedriver could be found (or downloaded)"""
+
+
+class ChromeVersionUnknown(UserWarning):
+    """Chrome's version could not be detected, so the driver was not checked against it"""
+
+
+def parse_version(text):
+    """First dotted four-part version in text, e.g. "120.0.6099.109", or None"""
+    match = _VERSION.search(text or "")
+    return match.group(0) if match else None
+
+
+def _version_key(version):
+    return tuple(int(part) for part in version.split("."))
+
+
+def _major(version):
+    return version.split(".", 1)[0]
+
+
+def _run_version(binary):
+    try:
+        result = subprocess.run([binary, "--version"], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return parse_version(result.stdout)
+
+
+def _windows_chrome_version():
+    try:
+        import winreg
+    except ImportError:
+        return None
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as key:
+            return parse_version(winreg.QueryValueEx(key, "version")[0])
+    except OSError:
+        return None
+
+
+def find_chrome(binary=None):
+    """Path of the Chrome binary ($CHROME_BIN, then well-known names), or None"""
+    for candidate in (binary, os.environ.get("CHROME_BIN"), *CHROME_CANDIDATES):
+        if not candidate:
+            continue
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    return None
+
+
+class DriverCache:
+    """Directory of chromedriver binaries plus metadata.json
+
+    metadata.json holds the pinned version, one entry per cached driver
+    (path, size) and the last detected Chrome version with the mtime of
+    the Chrome binary it came from.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = Path(directory)
+        self.metadata_path = self.directory / "metadata.json"
+        self.metadata = self._load()
+
+    def _load(self):
+        try:
+            with open(self.metadata_path, encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (FileNotFoundError, ValueError):
+            metadata = {}
+        metadata.setdefault("drivers", {})
+        metadata.setdefault("pinned", None)
+        metadata.setdefault("chrome", None)
+        return metadata
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.metadata_path.with_name(f"metadata.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.metadata, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.metadata_path)
+
+    def add(self, binary, version=None):
+        """Copy a chromedriver binary into the cache
+
+        Args:
+            binary (str): Path of a chromedriver executable
+            version (str, optional): Its version; asked from the binary if omitted
+
+        Returns:
+            Path: The cached copy
+        """
+        version = version or _run_version(binary)
+        if version is None:
+            raise DriverResolutionError(f"could not read a version from {binary} --version")
+        target = self.directory / version / DRIVER_NAME
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if Path(binary).resolve() != target.resolve():
+            shutil.copy2(binary, target)
+        target.chmod(target.stat().st_mode | 0o111)
+        self.metadata["drivers"][version] = {
+            "path": str(target.relative_to(self.directory)),
+            "size": target.stat().st_size,
+        }
+        self.save()
+        return target
+
+    def pin(self, version):
+        if version is not None and version not in self.metadata["drivers"]:
+            raise DriverResolutionError(f"chromedriver {version} is not in {self.directory}")
+        self.metadata["pinned"] = version
+        self.save()
+
+    def path(self, version):
+        """Cached binary for version if it is still intact, else None"""
+        entry = self.metadata["drivers"].get(version)
+        if entry is None:
+            return None
+        path = self.directory / entry["path"]
+        try:
+            if path.stat().st_size == entry["size"]:
+                return path
+        except FileNotFoundError:
+            pass
+        return None
+
+    def versions(self, major=None):
+        """Cached versions (newest first), optionally only one major version"""
+        versions = [v for v in self.metadata["drivers"] if major is None or _major(v) == major]
+        return sorted(versions, key=_version_key, reverse=True)
+
+    def chrome_version(self, binary=None):
+        """Installed Chrome version; only runs Chrome when its binary changed"""
+        if os.name == "nt" and binary is None:
+            # chrome.exe --version prints nothing on Windows
+            return _windows_chrome_version()
+        path = find_chrome(binary)
+        if path is None:
+            return None
+        mtime = os.stat(path).st_mtime_ns
+        known = self.metadata["chrome"]
+        if known and known["binary"] == path and known["mtime_ns"] == mtime:
+            return known["version"]
+        version = _run_version(path)
+        if version:
+            self.metadata["chrome"] = {"binary": path, "mtime_ns": mtime, "version": version}
+            self.save()
+        return version
+
+
+def _download(chrome_version):
+    """Fetch a matching chromedriver with webdriver_manager (needs network)"""
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return ChromeDriverManager().install()
+
+
+def resolve_chromedriver(cache_dir=DEFAULT_CACHE_DIR, pinned=None, offline=False,
+                         chrome_binary=None, download=_download):
+    """Path of a chromedriver that matches the installed Chrome
+
+    Call once per test session; the result does not change while Chrome
+    stays installed.
+
+    Args:
+        cache_dir (str | Path): Driver cache directory
+        pinned (str, optional): Exact driver version to use (overrides the
+            version pinned in the cache metadata)
+        offline (bool): Never download; fail if the cache has no match
+        chrome_binary (str, optional): Chrome executable to check against
+        download (callable): Called with the Chrome version on a cache miss,
+            returns the path of a downloaded chromedriver
+
+    Returns:
+        tuple: (Path of chromedriver, its version)
+
+    Raises:
+        DriverResolutionError: No matching driver is cached and none could be
+            downloaded, or the pinned driver does not match Chrome
+
+    Warns:
+        ChromeVersionUnknown: Chrome was not found, so the returned driver
+            may not match it
+    """
+    cache = DriverCache(cache_dir)
+    chrome = cache.chrome_version(chrome_binary)
+    path, version = _resolve(cache, chrome, pinned, offline, download)
+    if chrome is None:
+        warnings.warn(ChromeVersionUnknown(
+            f"Chrome's version could not be detected (set CHROME_BIN?); using "
+            f"chromedriver {version} without checking that it matches"), stacklevel=2)
+    return path, version
+
+
+def _resolve(cache, chrome, pinned, offline, download):
+    """resolve_chromedriver() for a known (or None) Chrome version"""
+    major = _major(chrome) if chrome else None
+    pinned = pinned or cache.metadata["pinned"]
+    if pinned:
+        if major and _major(pinned) != major:
+            raise DriverResolutionError(
+                f"chromedriver {pinned} is pinned but Chrome {chrome} is installed; "
+                f"pin a {major}.x driver")
+        path = cache.path(pinned)
+        if path is not None:
+            return path, pinned
+        if offline:
+            raise DriverResolutionError(f"pinned chromedriver {pinned} is not in {cache.directory}")
+    else:
+        for version in cache.versions(major):
+            path = cache.path(version)
+            if path is not None:
+                return path, version
+        if offline:
+            wanted = f"for Chrome {chrome}" if chrome else "at all"
+            raise DriverResolutionError(
+                f"no chromedriver {wanted} in {cache.directory}; populate it with "
+                f"'python selenium_tests/driver_resolver.py add PATH' or 'download'")
+
+    try:
+        downloaded = download(chrome)
+    except DriverResolutionError:
+        raise
+    except Exception as exc:
+        wanted = f"Chrome {chrome}" if chrome else "Chrome (not found, version unknown)"
+        raise DriverResolutionError(
+            f"could not download chromedriver for {wanted}: {type(exc).__name__}: {exc}") from exc
+    version = _run_version(downloaded)
+    if pinned and version != pinned:
+        raise DriverResolutionError(f"downloaded chromedriver {version}, expected pinned {pinned}")
+    return cache.add(downloaded, version), version
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the local chromedriver cache.")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR))
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("show", help="list cached drivers, the pin and the detected Chrome")
+    add = commands.add_parser("add", help="copy an existing chromedriver into the cache")
+    add.add_argument("binary")
+    commands.add_parser("download", help="download the driver matching the installed Chrome")
+    pin = commands.add_parser("pin", help="always use this cached version ('none' to unpin)")
+    pin.add_argument("version")
+    args = parser.parse_args(argv)
+
+    if args.command == "add":
+        print(DriverCache(args.cache_dir).add(args.binary))
+        return 0
+    if args.command == "download":
+        path, version = resolve_chromedriver(args.cache_dir)
+        print(f"{version} {path}")
+        return 0
+    if args.command == "pin":
+        version = None if args.version == "none" else args.version
+        DriverCache(args.cache_dir).pin(version)
+        print(f"pinned {version}" if version else "unpinned")
+        return 0
+    cache = DriverCache(args.cache_dir)
+    print(f"cache:  {cache.directory}")
+    print(f"chrome: {cache.chrome_version() or 'not found'}")
+    print(f"pinned: {cache.metadata['pinned'] or '-'}")
+    for version in cache.versions():
+        print(f"  {version}  {'ok' if cache.path(version) else 'missing'}")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except DriverResolutionError as exc:
+        sys.exit(f"error: {exc}")
@@ -0,0 +1,267 @@
+# Fast Load - Lighter, event-driven page loads for Selenium tests
+#
+# Most tests only need the DOM, not every image, font and tracker on the
+# page. Fast-load mode (pytest --fast-load):
+#   - uses the "eager" page-load strategy: driver.get() returns after
+#     DOMContentLoaded instead of waiting for every subresource,
+#   - blocks resource types and URL patterns through Chrome DevTools
+#     (Network.setBlockedURLs) and Chrome's image setting,
+#   - turns implicit waits off; wait_for_selector() and
+#     wait_for_network_idle() instead resolve inside the page on
+#     MutationObserver / PerformanceObserver events rather than polling,
+#   - records Navigation Timing for every driver.get() of a test.
+#
+# The block list only applies to the tab it was sent to: call
+# block_current_tab(driver) after opening a new tab.
+
+import time
+
+from selenium.common.exceptions import (JavascriptException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.support.abstract_event_listener import AbstractEventListener
+from selenium.webdriver.support.event_firing_webdriver import EventFiringWebDriver
+
+# Network.setBlockedURLs matches whole URLs, so types map to extensions,
+# each with and without a query string (logo.png, logo.png?v=3)
+RESOURCE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "mp3", "wav", "m3u8"),
+    "stylesheet": ("css",),
+}
+RESOURCE_PATTERNS = {
+    resource_type: tuple(pattern for extension in extensions
+                         for pattern in (f"*.{extension}", f"*.{extension}?*"))
+    for resource_type, extensions in RESOURCE_EXTENSIONS.items()
+}
+DEFAULT_BLOCKED_TYPES = ("image", "font", "media")
+# Analytics and ad hosts that never matter to a test
+DEFAULT_BLOCKED_URLS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*hotjar.com*",
+)
+
+_WAIT_FOR_SELECTOR = """
+const [selector, visible, timeoutMs, done] = arguments;
+const match = () => {
+    const element = document.querySelector(selector);
+    if (!element) return null;
+    if (visible && !(element.offsetWidth || element.offsetHeight || element.getClientRects().length)) {
+        return null;
+    }
+    return element;
+};
+const found = match();
+if (found) { done(found); return; }
+const observer = new MutationObserver(() => {
+    const element = match();
+    if (element) { observer.disconnect(); clearTimeout(timer); done(element); }
+});
+const timer = setTimeout(() => { observer.disconnect(); done(null); }, timeoutMs);
+observer.observe(document, {childList: true, subtree: true, attributes: visible});
+"""
+
+_WAIT_FOR_NETWORK_IDLE = """
+const [idleMs, timeoutMs, done] = arguments;
+let idleTimer = null;
+const finish = (idle) => {
+    observer.disconnect();
+    clearTimeout(idleTimer);
+    clearTimeout(deadline);
+    done(idle);
+};
+const restart = () => {
+    clearTimeout(idleTimer);
+    idleTimer = setTimeout(() => finish(true), idleMs);
+};
+const observer = new PerformanceObserver(restart);
+observer.observe({type: "resource"});
+const deadline = setTimeout(() => finish(false), timeoutMs);
+if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", restart, {once: true});
+} else {
+    restart();
+}
+"""
+
+_NAVIGATION_TIMING = """
+const nav = performance.getEntriesByType("navigation")[0];
+if (!nav) return null;
+return {
+    ttfb_ms: nav.responseStart - nav.requestStart,
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+    load_ms: nav.loadEventEnd,
+    transfer_bytes: nav.transferSize,
+    resources: performance.getEntriesByType("resource").length,
+};
+"""
+
+
+def fast_load_options(options, block_images=True):
+    """Switch ChromeOptions to the eager page-load strategy
+
+    Args:
+        options (ChromeOptions): Options to modify (returned for chaining)
+        block_images (bool): Also stop Chrome from loading any image
+
+    Returns:
+        ChromeOptions: The same options object
+    """
+    options.page_load_strategy = "eager"
+    if block_images:
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+    return options
+
+
+def blocked_url_patterns(types=DEFAULT_BLOCKED_TYPES, urls=DEFAULT_BLOCKED_URLS):
+    """URL patterns that block the given resource types plus extra URL patterns
+
+    Examples:
+        blocked_url_patterns(["font"], []) should return
+        ["*.woff", "*.woff?*", "*.woff2", "*.woff2?*", ..., "*.eot", "*.eot?*"]
+    """
+    patterns = []
+    for resource_type in types:
+        if resource_type not in RESOURCE_PATTERNS:
+            raise ValueError(f"unknown resource type {resource_type!r}, "
+                             f"expected one of {sorted(RESOURCE_PATTERNS)}")
+        patterns.extend(RESOURCE_PATTERNS[resource_type])
+    patterns.extend(urls)
+    return patterns
+
+
+def block_resources(driver, types=DEFAULT_BLOCKED_TYPES, urls=DEFAULT_BLOCKED_URLS):
+    """Make Chrome fail requests for the given resource types and URL patterns
+
+    The block list stays active for the tab across navigations.
+
+    Returns:
+        list: The URL patterns that are now blocked
+    """
+    patterns = blocked_url_patterns(types, urls)
+    _send_block_list(driver, patterns)
+    # Remembered on the driver so block_current_tab() can repeat it
+    getattr(driver, "wrapped_driver", driver)._blocked_url_patterns = patterns
+    return patterns
+
+
+def _send_block_list(driver, patterns):
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+def block_current_tab(driver):
+    """Apply the driver's block_resources() list to the current tab, if it has one
+
+    Network.setBlockedURLs is per tab, so tabs opened later load
+    everything until this is called in them.
+    """
+    patterns = getattr(getattr(driver, "wrapped_driver", driver), "_blocked_url_patterns", None)
+    if patterns:
+        _send_block_list(driver, patterns)
+
+
+def _run_async(driver, script, timeout, *args):
+    """execute_async_script with a script timeout just above our own deadline
+
+    The driver's own script timeout is restored afterwards, so pooled
+    drivers are not left with ours.
+    """
+    previous = driver.timeouts.script
+    driver.set_script_timeout(timeout + 5)
+    try:
+        return driver.execute_async_script(script, *args)
+    finally:
+        driver.set_script_timeout(previous)
+
+
+def wait_for_selector(driver, css_selector, timeout=10, visible=False):
+    """Wait until an element matching css_selector is in the DOM
+
+    The check runs in the page and is re-evaluated on every DOM mutation,
+    so it resolves as soon as the element appears instead of on the next
+    poll. If the page navigates away meanwhile (a submitted form, a
+    clicked link), the wait starts again in the new document.
+
+    Args:
+        driver (WebDriver): Browser to wait in
+        css_selector (str): Element to wait for
+        timeout (float): Seconds before giving up
+        visible (bool): Also require the element to have a layout box
+
+    Returns:
+        WebElement: The first matching element
+
+    Raises:
+        TimeoutException: If no element matched in time
+    """
+    deadline = time.monotonic() + timeout
+    remaining = timeout
+    while True:
+        try:
+            element = _run_async(driver, _WAIT_FOR_SELECTOR, remaining,
+                                 css_selector, visible, int(remaining * 1000))
+            break
+        except JavascriptException as exc:
+            # chromedriver: "document unloaded while waiting for result"
+            remaining = deadline - time.monotonic()
+            if "unloaded" not in (exc.msg or "") or remaining <= 0:
+                raise
+    if element is None:
+        raise TimeoutException(f"no element matched {css_selector!r} within {timeout} s")
+    return element
+
+
+def wait_for_network_idle(driver, idle_ms=500, timeout=10):
+    """Wait until no resource has finished loading for idle_ms milliseconds
+
+    Raises:
+        TimeoutException: If the page kept loading resources for timeout seconds
+    """
+    if not _run_async(driver, _WAIT_FOR_NETWORK_IDLE, timeout, idle_ms, int(timeout * 1000)):
+        raise TimeoutException(f"network did not go idle within {timeout} s")
+
+
+def navigation_timing(driver):
+    """Navigation Timing of the current page (milliseconds since navigation start)
+
+    Returns:
+        dict: ttfb_ms, dom_content_loaded_ms, load_ms (0 while the page is
+        still loading, common with the eager strategy), transfer_bytes and
+        resources; None for pages without a navigation entry (about:blank)
+    """
+    try:
+        return driver.execute_script(_NAVIGATION_TIMING)
+    except WebDriverException:
+        return None
+
+
+class NavigationRecorder(AbstractEventListener):
+    """Records wall time and Navigation Timing of every driver.get()"""
+
+    def __init__(self):
+        self.navigations = []
+        self._started = None
+
+    def before_navigate_to(self, url, driver):
+        self._started = time.perf_counter()
+
+    def after_navigate_to(self, url, driver):
+        timing = navigation_timing(driver) or {}
+        timing["get_ms"] = (time.perf_counter() - self._started) * 1000
+        self.navigations.append((url, timing))
+
+
+def record_navigations(driver):
+    """Wrap driver so every get() is timed
+
+    Returns:
+        tuple: (wrapped driver, NavigationRecorder)
+    """
+    recorder = NavigationRecorder()
+    return EventFiringWebDriver(driver, recorder), recorder
@@ -0,0 +1,172 @@
+# Tab Checks - Smoke-check many URLs across several tabs of one browser
+#
+# A WebDriver session runs one command at a time, but the browser loads
+# pages in different tabs at the same time. check_pages() opens up to
+# `concurrency` tabs, starts a navigation in each without waiting for it
+# (window.location from a script), then visits the tabs round-robin:
+# whichever page has finished loading gets its checks run and the tab
+# moves on to the next URL. Slow pages no longer hold up fast ones.
+#
+# The browser must use pageLoadStrategy "none" (conftest.py's
+# tab_check_pool does): with "normal" or "eager" chromedriver finishes a
+# tab's pending navigation before running any other command, which turns
+# the round-robin back into one page load after another.
+
+import time
+import warnings
+from collections import deque, namedtuple
+
+from selenium.common.exceptions import (JavascriptException, TimeoutException,
+                                        WebDriverException)
+
+from fast_load import block_current_tab, navigation_timing
+
+PageResult = namedtuple("PageResult", ["url", "ok", "error", "seconds", "timing", "values"])
+
+# Set on the old document before navigating; the new document lacks it
+_NAVIGATE = "window.__tabCheckPending = true; window.location.href = arguments[0];"
+_READY_STATE = "return window.__tabCheckPending ? 'navigating' : document.readyState;"
+_READY = {"interactive": ("interactive", "complete"), "complete": ("complete",)}
+
+
+def _normalize(check):
+    if isinstance(check, str):
+        return check, ()
+    url, callbacks = check
+    return url, tuple(callbacks) if isinstance(callbacks, (list, tuple)) else (callbacks,)
+
+
+def check_pages(driver, checks, concurrency=4, timeout=30, wait_for="complete",
+                poll_interval=0.05):
+    """Load many URLs in parallel tabs and run checks on each page
+
+    Args:
+        driver (WebDriver): Browser to use, started with pageLoadStrategy
+            "none" (a warning is issued otherwise); its current tab is
+            reused and every extra tab is closed again before returning
+        checks (iterable): URLs, or (url, callback) / (url, [callbacks])
+            pairs; each callback is called as callback(driver) with the
+            driver switched to that page, and fails the page by raising
+        concurrency (int): Maximum number of tabs loading at once
+        timeout (float): Seconds a page may take to reach wait_for
+        wait_for (str): "complete" (load event) or "interactive" (DOM ready)
+        poll_interval (float): Pause between sweeps when no tab is ready
+
+    Returns:
+        list: PageResult(url, ok, error, seconds, timing, values) per check,
+        in input order; values holds the callbacks' return values, timing
+        the page's Navigation Timing (see fast_load.navigation_timing)
+
+    Examples:
+        check_pages(driver, [("https://example.com", lambda d: d.title)])
+        should return [PageResult(url=..., ok=True, values=["Example Domain"], ...)]
+    """
+    if wait_for not in _READY:
+        raise ValueError(f"wait_for must be 'interactive' or 'complete', not {wait_for!r}")
+    strategy = (getattr(driver, "capabilities", None) or {}).get("pageLoadStrategy", "none")
+    if strategy != "none":
+        warnings.warn(f"check_pages() needs pageLoadStrategy 'none', not {strategy!r}: "
+                      "chromedriver will load the pages one at a time", stacklevel=2)
+    pending = deque(enumerate(_normalize(check) for check in checks))
+    results = [None] * len(pending)
+    if not pending:
+        return results
+
+    home = driver.current_window_handle
+    tabs = [home]
+    active = {}  # tab handle -> (index, url, callbacks, started)
+
+    def start(tab):
+        """Start the next pending URL that navigates in tab; False if the tab is gone"""
+        while pending:
+            try:
+                driver.switch_to.window(tab)
+            except WebDriverException:
+                return False
+            index, (url, callbacks) = pending.popleft()
+            try:
+                driver.execute_script(_NAVIGATE, url)
+            except WebDriverException as exc:
+                results[index] = PageResult(url, False, exc, 0.0, None, [])
+                continue
+            active[tab] = (index, url, callbacks, time.perf_counter())
+            return True
+        return True
+
+    def finish(tab, error=None, values=(), timing=None):
+        index, url, _, started = active.pop(tab)
+        results[index] = PageResult(url, error is None, error, time.perf_counter() - started,
+                                    timing, list(values))
+
+    try:
+        for _ in range(min(max(concurrency, 1), len(results)) - 1):
+            driver.switch_to.new_window("tab")
+            tabs.append(driver.current_window_handle)
+            block_current_tab(driver)  # fast-load blocking is per tab
+        for tab in tabs:
+            start(tab)
+
+        while active:
+            progressed = False
+            for tab in list(active):
+                index, url, callbacks, started = active[tab]
+                try:
+                    driver.switch_to.window(tab)
+                    state = driver.execute_script(_READY_STATE)
+                except JavascriptException:
+                    state = None  # the old document is being replaced
+                except WebDriverException as exc:
+                    state = exc
+                if isinstance(state, WebDriverException):
+                    finish(tab, state)
+                elif state in _READY[wait_for]:
+                    _run_checks(driver, tab, callbacks, finish)
+                elif time.perf_counter() - started > timeout:
+                    try:
+                        driver.execute_script("window.stop();")
+                    except WebDriverException:
+                        pass  # the page fails with the timeout either way
+                    finish(tab, TimeoutException(f"{url} not {wait_for} after {timeout} s"))
+                else:
+                    continue
+                progressed = True
+                start(tab)
+            if not progressed:
+                time.sleep(poll_interval)
+        # Left over only if every tab was closed under us
+        while pending:
+            index, (url, _) = pending.popleft()
+            results[index] = PageResult(url, False, WebDriverException("no browser tab left"),
+                                        0.0, None, [])
+    finally:
+        for tab in tabs[1:]:
+            try:
+                driver.switch_to.window(tab)
+                driver.close()
+            except WebDriverException:
+                pass
+        try:
+            driver.switch_to.window(home)
+        except WebDriverException:
+            pass
+    return results
+
+
+def _run_checks(driver, tab, callbacks, finish):
+    timing = navigation_timing(driver)
+    try:
+        error_page = driver.current_url.startswith("chrome-error://")
+    except WebDriverException as exc:
+        finish(tab, exc, timing=timing)
+        return
+    if error_page:
+        finish(tab, WebDriverException("navigation failed (browser error page)"), timing=timing)
+        return
+    values = []
+    try:
+        for callback in callbacks:
+            values.append(callback(driver))
+    except Exception as exc:  # a failed check fails this page, not the whole run
+        finish(tab, exc, values, timing)
+    else:
+        finish(tab, None, values, timing)
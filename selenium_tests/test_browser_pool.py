@@ -0,0 +1,145 @@
+import threading
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from browser_pool import BrowserPool, reset_driver
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver.current = handle
+
+
+class FakeDriver:
+    """Just enough of a WebDriver to exercise the pool without a browser"""
+
+    def __init__(self):
+        self.window_handles = ["main", "popup"]
+        self.current = "main"
+        self.switch_to = FakeSwitchTo(self)
+        self.calls = []
+        self.crashed = False
+        self.quit_called = False
+
+    def _record(self, *call):
+        if self.crashed:
+            raise WebDriverException("chrome not reachable")
+        self.calls.append(call)
+
+    def close(self):
+        self._record("close", self.current)
+        self.window_handles.remove(self.current)
+
+    def execute_script(self, script):
+        self._record("script")
+
+    def execute_cdp_cmd(self, cmd, params):
+        self._record("cdp", cmd)
+
+    def get(self, url):
+        self._record("get", url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_reset_driver():
+    """Test reset closes extra windows, clears state and goes blank"""
+    driver = FakeDriver()
+    reset_driver(driver)
+    assert driver.window_handles == ["main"]
+    assert driver.current == "main"
+    assert ("cdp", "Network.clearBrowserCookies") in driver.calls
+    assert driver.calls[-1] == ("get", "about:blank")
+
+
+def test_pool_reuses_warm_driver():
+    """Test a released driver is handed out again instead of a new one"""
+    pool = BrowserPool(FakeDriver, size=1)
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+    assert first is second
+    assert pool.created == 1
+
+
+def test_pool_recycles_after_max_uses():
+    """Test drivers are replaced after max_uses tests"""
+    pool = BrowserPool(FakeDriver, size=1, max_uses=2)
+    drivers = []
+    for _ in range(3):
+        with pool.lease() as driver:
+            drivers.append(driver)
+    assert drivers[0] is drivers[1] is not drivers[2]
+    assert drivers[0].quit_called
+    assert pool.recycled == 1
+
+
+def test_pool_replaces_crashed_driver():
+    """Test a driver that fails its reset is thrown away"""
+    pool = BrowserPool(FakeDriver, size=1)
+    with pool.lease() as crashed:
+        crashed.crashed = True
+    with pool.lease() as fresh:
+        pass
+    assert fresh is not crashed
+    assert crashed.quit_called
+
+
+def test_pool_retires_driver_on_any_reset_error():
+    """Test reset errors other than WebDriverException still retire the driver"""
+    def reset(driver):
+        raise ConnectionError("chromedriver is gone")
+
+    pool = BrowserPool(FakeDriver, size=1, reset=reset)
+    with pool.lease() as dead:
+        dead.quit = lambda: reset(dead)
+    assert pool.recycled == 1
+    assert pool._uses == {}
+    with pool.lease(timeout=0.1) as fresh:
+        pass
+    assert fresh is not dead
+
+
+def test_pool_retires_driver_when_lease_raises():
+    """Test a driver whose test raised is not handed out again"""
+    pool = BrowserPool(FakeDriver, size=1)
+    with pytest.raises(RuntimeError):
+        with pool.lease() as failed:
+            raise RuntimeError("test blew up")
+    with pool.lease() as fresh:
+        pass
+    assert fresh is not failed
+    assert failed.quit_called
+
+
+def test_pool_limits_concurrent_drivers():
+    """Test at most size drivers are out at once across threads"""
+    pool = BrowserPool(FakeDriver, size=2)
+    out, peak, lock = [0], [0], threading.Lock()
+
+    def worker():
+        for _ in range(5):
+            with pool.lease():
+                with lock:
+                    out[0] += 1
+                    peak[0] = max(peak[0], out[0])
+                with lock:
+                    out[0] -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] <= 2
+    assert pool.created <= 2
+    with pytest.raises(TimeoutError):
+        with pool.lease(), pool.lease(), pool.lease(timeout=0.01):
+            pass
+    pool.close()
@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+import driver_resolver
+from driver_resolver import (ChromeVersionUnknown, DriverCache, DriverResolutionError, main,
+                             parse_version, resolve_chromedriver)
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="fake binaries are shell scripts")
+
+
+def fake_binary(path, output):
+    """Executable that prints output for --version and counts its runs"""
+    path.write_text(f'#!/bin/sh\necho run >> "{path}.runs"\necho "{output}"\n')
+    path.chmod(0o755)
+    return str(path)
+
+
+def runs(path):
+    try:
+        with open(f"{path}.runs") as f:
+            return len(f.readlines())
+    except FileNotFoundError:
+        return 0
+
+
+@pytest.fixture
+def chrome(tmp_path):
+    return fake_binary(tmp_path / "chrome", "Google Chrome 120.0.6099.129")
+
+
+def test_parse_version():
+    """Test versions are read from --version output"""
+    assert parse_version("ChromeDriver 120.0.6099.109 (3419140ab66-refs/heads/6099@{#1497})") == \
+        "120.0.6099.109"
+    assert parse_version("nothing here") is None
+
+
+def test_resolve_from_cache_offline(tmp_path, chrome):
+    """Test a pre-populated cache resolves without downloading"""
+    cache = DriverCache(tmp_path / "cache")
+    cache.add(fake_binary(tmp_path / "old", "ChromeDriver 119.0.6045.105"))
+    cache.add(fake_binary(tmp_path / "new", "ChromeDriver 120.0.6099.109"))
+
+    def no_download(version):
+        raise AssertionError("must not download")
+
+    path, version = resolve_chromedriver(tmp_path / "cache", offline=True,
+                                         chrome_binary=chrome, download=no_download)
+    assert version == "120.0.6099.109"
+    assert path == tmp_path / "cache" / "120.0.6099.109" / "chromedriver"
+    # Chrome's version is remembered until its binary changes
+    resolve_chromedriver(tmp_path / "cache", offline=True, chrome_binary=chrome)
+    assert runs(chrome) == 1
+
+
+def test_resolve_downloads_once(tmp_path, chrome):
+    """Test a cache miss downloads and stores the driver for next time"""
+    downloads = []
+
+    def download(chrome_version):
+        downloads.append(chrome_version)
+        return fake_binary(tmp_path / "downloaded", "ChromeDriver 120.0.6099.109")
+
+    first = resolve_chromedriver(tmp_path / "cache", chrome_binary=chrome, download=download)
+    second = resolve_chromedriver(tmp_path / "cache", chrome_binary=chrome, download=download)
+    assert first == second
+    assert downloads == ["120.0.6099.129"]
+
+
+def test_resolve_errors(tmp_path, chrome):
+    """Test an empty offline cache and a mismatched pin fail clearly"""
+    with pytest.raises(DriverResolutionError, match="no chromedriver for Chrome 120"):
+        resolve_chromedriver(tmp_path / "cache", offline=True, chrome_binary=chrome)
+    cache = DriverCache(tmp_path / "cache")
+    cache.add(fake_binary(tmp_path / "old", "ChromeDriver 119.0.6045.105"))
+    cache.pin("119.0.6045.105")
+    with pytest.raises(DriverResolutionError, match="pinned but Chrome 120"):
+        resolve_chromedriver(tmp_path / "cache", offline=True, chrome_binary=chrome)
+
+
+def test_download_failure_is_a_resolution_error(tmp_path, chrome):
+    """Test errors from the downloader are reported as DriverResolutionError"""
+    def broken_download(version):
+        raise AttributeError("'NoneType' object has no attribute 'split'")
+
+    with pytest.raises(DriverResolutionError, match="could not download chromedriver for Chrome 120"):
+        resolve_chromedriver(tmp_path / "cache", chrome_binary=chrome, download=broken_download)
+
+
+def test_unknown_chrome_version_warns(tmp_path, monkeypatch):
+    """Test a driver used without a detected Chrome version is flagged"""
+    monkeypatch.setattr(driver_resolver, "find_chrome", lambda binary=None: None)
+    DriverCache(tmp_path / "cache").add(fake_binary(tmp_path / "d", "ChromeDriver 119.0.6045.105"))
+    with pytest.warns(ChromeVersionUnknown, match="without checking"):
+        path, version = resolve_chromedriver(tmp_path / "cache", offline=True)
+    assert version == "119.0.6045.105"
+
+
+def test_main_only_lists_cache_for_show(tmp_path, capsys):
+    """Test subcommands print their own result, not the whole cache listing"""
+    cache_dir = str(tmp_path / "cache")
+    main(["--cache-dir", cache_dir, "add", fake_binary(tmp_path / "d", "ChromeDriver 119.0.6045.105")])
+    main(["--cache-dir", cache_dir, "pin", "119.0.6045.105"])
+    output = capsys.readouterr().out
+    assert "pinned 119.0.6045.105" in output and "cache:" not in output
+    main(["--cache-dir", cache_dir, "show"])
+    assert "pinned: 119.0.6045.105" in capsys.readouterr().out
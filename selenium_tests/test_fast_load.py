@@ -0,0 +1,153 @@
+from types import SimpleNamespace
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from fast_load import (RESOURCE_PATTERNS, block_current_tab, block_resources,
+                       blocked_url_patterns, fast_load_options, record_navigations,
+                       wait_for_network_idle, wait_for_selector)
+
+
+class FakeDriver:
+    """Records CDP commands and answers scripts with canned results"""
+
+    def __init__(self, async_result=None, timing=None):
+        self.cdp = []
+        self.script_timeout = 30
+        self.script_timeouts = []
+        self.async_result = async_result
+        self.timing = timing
+        self.visited = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+
+    @property
+    def timeouts(self):
+        return SimpleNamespace(script=self.script_timeout)
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+        self.script_timeouts.append(seconds)
+
+    def execute_async_script(self, script, *args):
+        self.async_args = args
+        if isinstance(self.async_result, list):  # one answer per call
+            result = self.async_result.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return self.async_result
+
+    def execute_script(self, script, *args):
+        return dict(self.timing) if self.timing else None
+
+    def get(self, url):
+        self.visited.append(url)
+
+
+class FakeWebDriver(FakeDriver, WebDriver):
+    """FakeDriver that passes EventFiringWebDriver's isinstance check"""
+
+
+def test_fast_load_options():
+    """Test fast-load options use the eager strategy and block images"""
+    options = fast_load_options(webdriver.ChromeOptions())
+    capabilities = options.to_capabilities()
+    assert capabilities["pageLoadStrategy"] == "eager"
+    prefs = capabilities["goog:chromeOptions"]["prefs"]
+    assert prefs["profile.managed_default_content_settings.images"] == 2
+
+
+def test_block_resources():
+    """Test resource types and URL patterns become one CDP block list"""
+    driver = FakeDriver()
+    patterns = block_resources(driver, ["font"], ["*ads.example.com*"])
+    assert patterns == list(RESOURCE_PATTERNS["font"]) + ["*ads.example.com*"]
+    assert driver.cdp == [("Network.enable", {}), ("Network.setBlockedURLs", {"urls": patterns})]
+    assert {"*.woff2", "*.woff2?*"} <= set(patterns)  # fonts.example.com/a.woff2?v=3
+    with pytest.raises(ValueError):
+        blocked_url_patterns(["video"], [])
+
+
+def test_block_current_tab():
+    """Test a new tab gets the block list of its driver, and nothing without one"""
+    driver = FakeDriver()
+    block_current_tab(driver)
+    assert driver.cdp == []
+    patterns = block_resources(driver, ["font"], [])
+    driver.cdp.clear()
+    block_current_tab(driver)
+    assert driver.cdp == [("Network.enable", {}), ("Network.setBlockedURLs", {"urls": patterns})]
+
+
+def test_wait_for_selector():
+    """Test the in-page wait returns the element or raises on timeout"""
+    driver = FakeDriver(async_result="element")
+    assert wait_for_selector(driver, "#ready", timeout=2) == "element"
+    assert driver.async_args == ("#ready", False, 2000)
+    assert driver.script_timeouts[0] > 2
+    assert driver.timeouts.script == 30  # the pooled driver's own timeout is restored
+    with pytest.raises(TimeoutException):
+        wait_for_selector(FakeDriver(async_result=None), "#missing", timeout=0.1)
+
+
+def test_wait_for_selector_across_navigation():
+    """Test a wait interrupted by a page change resumes in the new document"""
+    unloaded = JavascriptException("javascript error: document unloaded while waiting for result")
+    driver = FakeDriver(async_result=[unloaded, "element"])
+    assert wait_for_selector(driver, "#results", timeout=2) == "element"
+    assert 0 < driver.async_args[2] <= 2000
+    with pytest.raises(JavascriptException):
+        wait_for_selector(FakeDriver(async_result=[JavascriptException("boom")]), "#x")
+
+
+def test_wait_for_network_idle():
+    """Test a page that never goes idle raises TimeoutException"""
+    wait_for_network_idle(FakeDriver(async_result=True), idle_ms=100, timeout=1)
+    with pytest.raises(TimeoutException):
+        wait_for_network_idle(FakeDriver(async_result=False), timeout=1)
+
+
+def test_record_navigations():
+    """Test every get() through the wrapped driver is timed"""
+    driver = FakeWebDriver(timing={"ttfb_ms": 12.0, "dom_content_loaded_ms": 80.0})
+    wrapped, recorder = record_navigations(driver)
+    wrapped.get("https://example.com/")
+    assert driver.visited == ["https://example.com/"]
+    [(url, timing)] = recorder.navigations
+    assert url == "https://example.com/"
+    assert timing["dom_content_loaded_ms"] == 80.0
+    assert timing["get_ms"] >= 0
+
+
+def test_navigation_timings_in_report(pytester, pytestconfig):
+    """Test fast-load page timings reach the report as a section and an HTML extra"""
+    pytester.makeconftest((pytestconfig.rootpath / "selenium_tests" / "conftest.py").read_text())
+    pytester.makepyfile('''
+        import pytest
+        from test_fast_load import FakeWebDriver
+
+        class FakePool:
+            def acquire(self):
+                return FakeWebDriver(timing={"ttfb_ms": 12.0})
+
+            def release(self, driver, broken=False):
+                pass
+
+        @pytest.fixture
+        def browser_pool():
+            return FakePool()
+
+        def test_page(driver):
+            driver.get("https://example.com/")
+    ''')
+    reports = pytester.inline_run("--fast-load").getreports("pytest_runtest_logreport")
+    call = next(report for report in reports if report.when == "call")
+    assert call.passed
+    section = dict(call.sections)["page timings"]
+    assert "get https://example.com/  (ttfb_ms 12.0)" in section
+    if hasattr(call, "extras"):
+        assert [extra["name"] for extra in call.extras] == ["Page timings"]
@@ -0,0 +1,184 @@
+import pytest
+from selenium.common.exceptions import (JavascriptException, NoSuchWindowException,
+                                        TimeoutException)
+
+from tab_checks import check_pages
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        if handle not in self.driver.tabs:
+            raise NoSuchWindowException(f"no such window: {handle}")
+        self.driver.current = handle
+
+    def new_window(self, kind):
+        handle = f"tab-{len(self.driver.tabs)}"
+        self.driver.tabs[handle] = {"url": "about:blank", "polls_left": 0}
+        self.driver.current = handle
+
+
+class FakeTabDriver:
+    """Browser whose tabs finish loading a URL after a number of polls
+
+    polls maps URL -> polls until the page is complete (None: never,
+    "raise": navigating there fails, "crash": the tab disappears,
+    "unload": the first poll hits a document being replaced).
+    """
+
+    def __init__(self, polls):
+        self.polls = polls
+        self.tabs = {"main": {"url": "about:blank", "polls_left": 0}}
+        self.current = "main"
+        self.switch_to = FakeSwitchTo(self)
+        self.max_loading = 0
+        self.cdp = []
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    @property
+    def current_url(self):
+        return self.tabs[self.current]["url"]
+
+    @property
+    def title(self):
+        return f"Title of {self.current_url}"
+
+    def close(self):
+        del self.tabs[self.current]
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((self.current, cmd))
+
+    def execute_script(self, script, *args):
+        tab = self.tabs[self.current]
+        if "location.href" in script:
+            if self.polls.get(args[0]) == "raise":
+                raise JavascriptException("navigation blocked")
+            if self.polls.get(args[0]) == "crash":
+                del self.tabs[self.current]
+                raise NoSuchWindowException("tab crashed")
+            tab["url"] = args[0]
+            tab["polls_left"] = self.polls.get(args[0], 0)
+            if tab["polls_left"] == "unload":
+                tab["polls_left"] = "unloading"
+            loading = sum(1 for t in self.tabs.values() if t["polls_left"] != 0)
+            self.max_loading = max(self.max_loading, loading)
+        elif "readyState" in script:
+            if tab["polls_left"] == "unloading":
+                tab["polls_left"] = 0
+                raise JavascriptException("document unloaded while waiting for result")
+            if tab["polls_left"] is None:
+                return "loading"
+            if tab["polls_left"] > 0:
+                tab["polls_left"] -= 1
+                return "navigating"
+            return "complete"
+        elif "getEntriesByType" in script:
+            return {"load_ms": 42.0}
+        elif "window.stop" in script:
+            raise JavascriptException("stop failed")
+        return None
+
+
+def test_check_pages_runs_callbacks_in_tabs():
+    """Test every URL is checked in order and extra tabs are closed"""
+    urls = [f"https://example.com/{i}" for i in range(5)]
+    driver = FakeTabDriver({url: 5 - i for i, url in enumerate(urls)})
+    results = check_pages(driver, [(url, lambda d: d.title) for url in urls],
+                          concurrency=3, poll_interval=0)
+    assert [result.url for result in results] == urls
+    assert all(result.ok for result in results)
+    assert results[2].values == ["Title of https://example.com/2"]
+    assert results[0].timing == {"load_ms": 42.0}
+    assert driver.max_loading == 3
+    assert list(driver.tabs) == ["main"]
+    assert driver.current_window_handle == "main"
+
+
+def test_check_pages_blocks_resources_in_new_tabs():
+    """Test fast-load blocking is repeated in every tab check_pages opens"""
+    driver = FakeTabDriver({})
+    driver._blocked_url_patterns = ["*.png"]
+    check_pages(driver, ["https://a.example.com", "https://b.example.com"], poll_interval=0)
+    assert driver.cdp == [("tab-1", "Network.enable"), ("tab-1", "Network.setBlockedURLs")]
+
+
+def test_check_pages_reports_failures():
+    """Test a failing check and a page that never loads do not stop the run"""
+    def fails(driver):
+        raise AssertionError("missing header")
+
+    driver = FakeTabDriver({"https://slow.example.com": None})
+    results = check_pages(driver, [
+        ("https://slow.example.com", fails),
+        ("https://bad.example.com", [lambda d: d.title, fails]),
+        "https://ok.example.com",
+    ], concurrency=2, timeout=0.05, poll_interval=0)
+    slow, bad, ok = results
+    assert isinstance(slow.error, TimeoutException)
+    assert isinstance(bad.error, AssertionError)
+    assert bad.values == ["Title of https://bad.example.com"]
+    assert ok.ok and ok.values == []
+    assert list(driver.tabs) == ["main"]
+
+
+def test_check_pages_arguments():
+    """Test an empty list needs no tabs and wait_for is validated"""
+    assert check_pages(FakeTabDriver({}), []) == []
+    with pytest.raises(ValueError):
+        check_pages(FakeTabDriver({}), ["https://example.com"], wait_for="load")
+    driver = FakeTabDriver({})
+    driver.capabilities = {"pageLoadStrategy": "normal"}
+    with pytest.warns(UserWarning, match="pageLoadStrategy 'none'"):
+        check_pages(driver, ["https://example.com"], poll_interval=0)
+
+
+def test_check_pages_survives_failing_tabs():
+    """Test navigation errors and a crashed tab fail only their own pages"""
+    driver = FakeTabDriver({"https://blocked.example.com": "raise",
+                            "https://crash.example.com": "crash",
+                            "https://b.example.com": "unload"})
+    urls = ["https://blocked.example.com", "https://a.example.com",
+            "https://crash.example.com", "https://b.example.com", "https://c.example.com"]
+    results = check_pages(driver, urls, concurrency=2, poll_interval=0)
+    assert [result.url for result in results] == urls
+    assert [result.ok for result in results] == [False, True, False, True, True]
+    assert isinstance(results[0].error, JavascriptException)
+    assert isinstance(results[2].error, NoSuchWindowException)
+    assert driver.current_window_handle == "main"
+
+
+def test_tab_checks_timings_in_report(pytester, pytestconfig):
+    """Test the tab_checks fixture adds every page to the report's page timings"""
+    pytester.makeconftest((pytestconfig.rootpath / "selenium_tests" / "conftest.py").read_text())
+    pytester.makepyfile('''
+        import pytest
+        from test_tab_checks import FakeTabDriver
+
+        class FakePool:
+            def acquire(self):
+                return FakeTabDriver({"https://blocked.example.com": "raise"})
+
+            def release(self, driver, broken=False):
+                pass
+
+        @pytest.fixture
+        def tab_check_pool():
+            return FakePool()
+
+        def test_pages(tab_checks):
+            tab_checks(["https://a.example.com", "https://blocked.example.com"])
+    ''')
+    reports = pytester.inline_run().getreports("pytest_runtest_logreport")
+    call = next(report for report in reports if report.when == "call")
+    assert call.passed
+    lines = dict(call.sections)["page timings"].splitlines()
+    assert lines[0].endswith("ms  tab https://a.example.com  ok")
+    assert lines[1].endswith("ms  tab https://blocked.example.com  JavascriptException")
+    if hasattr(call, "extras"):
+        assert [extra["name"] for extra in call.extras] == ["Page timings"]
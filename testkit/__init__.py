@@ -0,0 +1 @@
+# Testkit - Shared pytest plugins and helpers for python_tests and selenium_tests
@@ -0,0 +1,303 @@
+# Benchmark - Scaling micro-benchmarks with stored baselines and regression gates
+#
+# Tests marked @pytest.mark.benchmark only run with --benchmark. Each one
+# times a function over growing input sizes, reports the fastest round,
+# median and spread per size, estimates the complexity class, and fails if
+# the function got slower than the stored baseline by more than the
+# threshold or its complexity class changed. Only sizes measured in both
+# runs are compared, and sizes too fast to time reliably are left out of
+# the complexity fit. Failures show the rounds' spread next to the
+# threshold; on a noisy machine --benchmark-confirm re-times suspect sizes
+# and --benchmark-noise-allowance lets the spread widen the threshold.
+#
+# Baselines are machine-specific, so .benchmarks/ is not committed.
+#
+#   pytest python_tests -m benchmark --benchmark                  # compare
+#   pytest python_tests -m benchmark --benchmark --benchmark-save # new baseline
+
+import json
+import math
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+
+# Candidate growth functions for the complexity fit
+COMPLEXITIES = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log(n),
+    "O(n)": lambda n: float(n),
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n^2)": lambda n: float(n) ** 2,
+}
+
+# Below this many seconds per call timings are mostly noise and are not gated
+MIN_GATED_SECONDS = 50e-6
+DEFAULT_MIN_TIME = 0.05
+DEFAULT_ROUNDS = 15
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "scaling micro-benchmarks")
+    group.addoption("--benchmark", action="store_true",
+                    help="run tests marked 'benchmark' (skipped otherwise)")
+    group.addoption("--benchmark-baseline", default=None,
+                    help="baseline JSON file (default: <rootdir>/.benchmarks/baseline.json)")
+    group.addoption("--benchmark-save", action="store_true",
+                    help="store this run's results as the new baseline")
+    group.addoption("--benchmark-threshold", type=float, default=0.25,
+                    help="fail when the fastest round is this fraction slower than baseline "
+                         "(default: 0.25)")
+    group.addoption("--benchmark-noise-allowance", action="store_true",
+                    help="raise the threshold to the rounds' spread when that is larger")
+    group.addoption("--benchmark-max-size", type=int, default=None,
+                    help="skip input sizes above this (for quick runs)")
+    group.addoption("--benchmark-min-time", type=float, default=DEFAULT_MIN_TIME,
+                    help=f"seconds each timing round should last (default: {DEFAULT_MIN_TIME})")
+    group.addoption("--benchmark-rounds", type=int, default=DEFAULT_ROUNDS,
+                    help=f"timing rounds per input size (default: {DEFAULT_ROUNDS})")
+    group.addoption("--benchmark-confirm", type=int, default=0,
+                    help="re-time a size that looks regressed up to this many times, "
+                         "keeping the fastest, before failing (default: 0)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: scaling micro-benchmark (run with --benchmark)")
+    config._benchmark_results = {}
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def _baseline_path(config):
+    path = config.getoption("--benchmark-baseline")
+    return Path(path) if path else config.rootpath / ".benchmarks" / "baseline.json"
+
+
+def percentile(values, fraction):
+    """Linear-interpolated percentile of values (fraction between 0 and 1)"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def time_call(func, arg, min_time=DEFAULT_MIN_TIME, rounds=DEFAULT_ROUNDS):
+    """Time func(arg): calibrate a loop count, then time several rounds
+
+    The loop count doubles until one round lasts at least min_time, so
+    fast functions are repeated enough to beat timer resolution.
+
+    Returns:
+        dict: Per-call seconds - median, p10, p90, min - plus the loop count
+    """
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func(arg)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed * 10 < min_time else max(2, math.ceil(min_time / elapsed))
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func(arg)
+        samples.append((time.perf_counter() - started) / loops)
+    return {
+        "median": statistics.median(samples),
+        "p10": percentile(samples, 0.10),
+        "p90": percentile(samples, 0.90),
+        "min": min(samples),
+        "loops": loops,
+    }
+
+
+def _fit_fastest(sizes, timings):
+    """fit_complexity() on the fastest rounds, skipping overhead-dominated sizes"""
+    points = [(n, _fastest(timings[str(n)])) for n in sizes]
+    points = [(n, t) for n, t in points if t >= MIN_GATED_SECONDS]
+    return fit_complexity([n for n, _ in points], [t for _, t in points])
+
+
+def fit_complexity(sizes, seconds):
+    """Pick the growth function that best explains seconds as c * f(size)
+
+    For every candidate f, the spread of log(seconds / f(size)) is
+    measured; the candidate with the smallest spread fits best.
+    """
+    points = [(n, t) for n, t in zip(sizes, seconds) if n > 1 and t > 0]
+    if len(points) < 3:
+        return None
+    best_name, best_spread = None, math.inf
+    for name, growth in COMPLEXITIES.items():
+        spread = statistics.pvariance([math.log(t / growth(n)) for n, t in points])
+        if spread < best_spread - 1e-9:
+            best_name, best_spread = name, spread
+    return best_name
+
+
+class Benchmark:
+    """The `benchmark` fixture: times functions and checks them against the baseline"""
+
+    def __init__(self, config):
+        self.config = config
+        self.results = config._benchmark_results
+
+    def _baseline(self):
+        path = _baseline_path(self.config)
+        if not path.exists():
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def scaling(self, name, func, make_input, sizes):
+        """Benchmark func over inputs of growing size and gate regressions
+
+        Args:
+            name (str): Baseline key, e.g. "count_vowels"
+            func (callable): Function under test, called as func(input)
+            make_input (callable): Builds the input for a given size
+            sizes (iterable): Input sizes, e.g. [10, 100, ..., 10**7]
+
+        Returns:
+            dict: Measured timings per size and the fitted complexity
+        """
+        config = self.config
+        max_size = config.getoption("--benchmark-max-size")
+        sizes = [n for n in sizes if max_size is None or n <= max_size]
+
+        def measure(n):
+            return time_call(func, make_input(n), min_time=config.getoption("--benchmark-min-time"),
+                             rounds=config.getoption("--benchmark-rounds"))
+
+        timings = {str(n): measure(n) for n in sizes}
+        result = {"sizes": timings}
+        self.results[name] = result
+
+        if not config.getoption("--benchmark-save"):
+            baseline = self._baseline().get(name)
+            threshold = config.getoption("--benchmark-threshold")
+            noise_allowance = config.getoption("--benchmark-noise-allowance")
+            # A slow size is often a noisy neighbour rather than slow code:
+            # time it again and keep the fastest attempt before failing.
+            for _ in range(config.getoption("--benchmark-confirm")):
+                suspects = regressed_sizes(result, baseline, threshold, noise_allowance)
+                if not suspects:
+                    break
+                for size in suspects:
+                    retry = measure(int(size))
+                    if retry["min"] < timings[size]["min"]:
+                        timings[size] = retry
+        result["complexity"] = _fit_fastest(sizes, timings)
+
+        if not config.getoption("--benchmark-save"):
+            problems = compare_to_baseline(result, baseline, threshold, noise_allowance)
+            if problems:
+                pytest.fail(f"{name} regressed:\n  " + "\n  ".join(problems), pytrace=False)
+        return result
+
+
+def _fastest(timing):
+    return timing.get("min", timing["median"])
+
+
+def _spread(timing):
+    """How much slower than the fastest round a typical slow round was (fraction)"""
+    if "p90" not in timing or not _fastest(timing):
+        return 0.0
+    return timing["p90"] / _fastest(timing) - 1
+
+
+def _shared_sizes(result, baseline):
+    return sorted((size for size in result["sizes"] if size in baseline["sizes"]), key=int)
+
+
+def _allowed(new, old, threshold, noise_allowance=False):
+    if noise_allowance:
+        return max(threshold, _spread(old), _spread(new))
+    return threshold
+
+
+def regressed_sizes(result, baseline, threshold, noise_allowance=False):
+    """Sizes (as stored, e.g. "1000") whose fastest round is too slow vs baseline"""
+    if not baseline:
+        return []
+    regressed = []
+    for size in _shared_sizes(result, baseline):
+        new, old = result["sizes"][size], baseline["sizes"][size]
+        allowed = _allowed(new, old, threshold, noise_allowance)
+        if _fastest(old) >= MIN_GATED_SECONDS and _fastest(new) / _fastest(old) > 1 + allowed:
+            regressed.append(size)
+    return regressed
+
+
+def compare_to_baseline(result, baseline, threshold, noise_allowance=False):
+    """List the ways result is worse than baseline (empty if fine or no baseline)
+
+    Only sizes measured in both runs count, so a --benchmark-max-size run
+    is fitted and compared on the same sizes as the baseline. Each size
+    compares the fastest round, which is the least disturbed by other
+    load, against threshold; with noise_allowance the larger of either
+    run's spread is tolerated instead when that is bigger.
+    """
+    if not baseline:
+        return []
+    shared = _shared_sizes(result, baseline)
+    problems = []
+    sizes = [int(size) for size in shared]
+    old_complexity = _fit_fastest(sizes, baseline["sizes"])
+    new_complexity = _fit_fastest(sizes, result["sizes"])
+    if old_complexity and new_complexity and old_complexity != new_complexity:
+        problems.append(f"complexity changed from {old_complexity} to {new_complexity}")
+    for size in regressed_sizes(result, baseline, threshold, noise_allowance):
+        new, old = result["sizes"][size], baseline["sizes"][size]
+        problems.append(
+            f"n={size}: fastest {_fastest(new) * 1e3:.3f} ms vs baseline "
+            f"{_fastest(old) * 1e3:.3f} ms (+{(_fastest(new) / _fastest(old) - 1) * 100:.0f}%, "
+            f"allowed +{_allowed(new, old, threshold, noise_allowance) * 100:.0f}%; "
+            f"rounds spread +{_spread(new) * 100:.0f}% now, +{_spread(old) * 100:.0f}% baseline)"
+        )
+    return problems
+
+
+@pytest.fixture
+def benchmark(pytestconfig):
+    """Benchmark runner, see Benchmark.scaling()"""
+    return Benchmark(pytestconfig)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = getattr(config, "_benchmark_results", None)
+    if not results:
+        return
+    terminalreporter.section("benchmarks")
+    for name, result in sorted(results.items()):
+        terminalreporter.write_line(f"{name}  ({result['complexity'] or 'complexity unknown'})")
+        for size, timing in result["sizes"].items():
+            terminalreporter.write_line(
+                f"  n={int(size):>10,}  min {timing['min'] * 1e6:12.2f} us"
+                f"  median {timing['median'] * 1e6:12.2f} us"
+                f"  p10 {timing['p10'] * 1e6:12.2f} us  p90 {timing['p90'] * 1e6:12.2f} us"
+            )
+    if config.getoption("--benchmark-save"):
+        path = _baseline_path(config)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        baseline = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        terminalreporter.write_line(f"baseline saved to {path}")
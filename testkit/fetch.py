@@ -0,0 +1,86 @@
+# Fetch - Concurrent GETs over a shared session, with per-request latency
+#
+# requests is synchronous, so concurrency comes from a small thread pool;
+# the session's connection pool lets the threads reuse keep-alive
+# connections instead of doing a TCP + TLS handshake per request.
+#
+# The fetch_many fixture adds the per-request latencies to the test report
+# as a "latency" section (terminal and pytest-html log), a pytest-html
+# text extra and ("latency_ms <url>", ms) user properties for JUnit XML.
+
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+try:
+    from pytest_html import extras as html_extras
+except ImportError:  # pytest-html is optional - the terminal section still works
+    html_extras = None
+
+FetchResult = namedtuple("FetchResult", ["url", "response", "error", "seconds"])
+
+
+def _fetch_one(session, url, timeout):
+    started = time.perf_counter()
+    try:
+        response = session.get(url, timeout=timeout)
+        error = None
+    except requests.RequestException as exc:
+        response, error = None, exc
+    return FetchResult(url, response, error, time.perf_counter() - started)
+
+
+def fetch_all(session, urls, max_concurrency=8, timeout=30):
+    """GET many URLs concurrently
+
+    Args:
+        session (requests.Session): Session to send the requests with
+        urls (iterable): URLs to fetch
+        max_concurrency (int): Maximum number of requests in flight
+        timeout (float): Per-request timeout in seconds
+
+    Returns:
+        list: FetchResult(url, response, error, seconds) per URL, in input
+        order; failed requests have response None and the exception in error
+    """
+    urls = list(urls)
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(urls))) as pool:
+        return list(pool.map(lambda url: _fetch_one(session, url, timeout), urls))
+
+
+@pytest.fixture
+def fetch_many(request, http_session):
+    """fetch_all() bound to http_session that records latencies in the report
+
+    Each request adds a line to the test's "latency" report section and a
+    ("latency_ms <url>", milliseconds) user property.
+    """
+    lines = request.node._fetch_latencies = []
+
+    def _fetch_many(urls, max_concurrency=8, timeout=30):
+        results = fetch_all(http_session, urls, max_concurrency, timeout)
+        for result in results:
+            milliseconds = round(result.seconds * 1000, 1)
+            request.node.user_properties.append((f"latency_ms {result.url}", milliseconds))
+            status = result.response.status_code if result.error is None else type(result.error).__name__
+            lines.append(f"{milliseconds:10.1f} ms  {status}  {result.url}")
+        return results
+    return _fetch_many
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    lines = getattr(item, "_fetch_latencies", None)
+    if not lines or call.when != "call":
+        return
+    summary = "\n".join(lines)
+    report = outcome.get_result()
+    report.sections.append(("latency", summary))
+    if html_extras is not None:
+        report.extras = getattr(report, "extras", []) + [html_extras.text(summary, name="Latency")]
@@ -0,0 +1,269 @@
+# Impact - Run only the tests affected by changed source lines
+#
+#   pytest --impact-record     # full run, records which lines every test covers
+#   pytest --impact            # run only tests whose covered code changed
+#
+# The map (.impact_map.json) stores, per test, the lines it executed
+# (coverage.py dynamic contexts), and per source file a hash of every
+# line plus the spans of its functions. With --impact the current files
+# are diffed against those line hashes; a changed line selects every test
+# that executed any line of the function around it (or of the whole file
+# for module-level changes). Tests missing from the map always run.
+#
+# The whole suite runs instead when the map is missing or stale: recorded
+# with another Python, or conftest.py / pytest.ini / requirements.txt
+# changed since. Combining --impact with --impact-record refreshes the map
+# for the tests that ran.
+
+import ast
+import difflib
+import hashlib
+import json
+import os
+import sys
+import zlib
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+MAP_VERSION = 1
+# Files that can change the behaviour of any test
+GLOBAL_FILES = ("pytest.ini", "requirements.txt")
+EXCLUDED_DIRS = {"venv", ".venv", ".git", "node_modules", "__pycache__"}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("impact", "change-aware test selection")
+    group.addoption("--impact", action="store_true",
+                    help="only run tests affected by source changes since the map was recorded")
+    group.addoption("--impact-record", action="store_true",
+                    help="measure per-test coverage and update the impact map")
+    group.addoption("--impact-map", default=None,
+                    help="impact map file (default: <rootdir>/.impact_map.json)")
+
+
+def _map_path(config):
+    path = config.getoption("--impact-map")
+    return Path(path) if path else config.rootpath / ".impact_map.json"
+
+
+def line_hashes(text):
+    """One CRC32 per line - enough to diff a file against its recorded version"""
+    return [zlib.crc32(line.encode("utf-8")) for line in text.splitlines()]
+
+
+def function_spans(text):
+    """(first line, last line) of every function, decorators included"""
+    spans = []
+    for node in ast.walk(ast.parse(text)):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            first = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            spans.append((first, node.end_lineno))
+    return sorted(spans)
+
+
+def changed_lines(old_hashes, new_text):
+    """Line numbers of the recorded version that were edited, removed or
+    had lines inserted next to them"""
+    old = list(old_hashes)
+    matcher = difflib.SequenceMatcher(None, old, line_hashes(new_text), autojunk=False)
+    changed = set()
+    for tag, i1, i2, _, _ in matcher.get_opcodes():
+        if tag in ("replace", "delete"):
+            changed.update(range(i1 + 1, i2 + 1))
+        elif tag == "insert":
+            changed.update(line for line in (i1, i1 + 1) if 1 <= line <= len(old))
+    return changed
+
+
+def _innermost_span(spans, line):
+    inside = [span for span in spans if span[0] <= line <= span[1]]
+    return min(inside, key=lambda span: span[1] - span[0]) if inside else None
+
+
+def _digest(path):
+    try:
+        return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _global_files(root):
+    files = [name for name in GLOBAL_FILES if (root / name).exists()]
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+        if "conftest.py" in filenames:
+            files.append(os.path.relpath(os.path.join(directory, "conftest.py"), root))
+    return sorted(files)
+
+
+def _environment():
+    return f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+def load_map(path):
+    """Read an impact map; a missing, broken or old-format file gives None"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return data if data.get("version") == MAP_VERSION else None
+
+
+def stale_reason(impact_map, root):
+    """Why the map cannot be trusted for selection, or None if it can"""
+    if impact_map is None:
+        return "no impact map recorded yet"
+    if impact_map["environment"] != _environment():
+        return f"map was recorded with {impact_map['environment']}"
+    recorded = impact_map["global_files"]
+    for name in set(recorded) | set(_global_files(root)):
+        if recorded.get(name) != _digest(root / name):
+            return f"{name} changed"
+    return None
+
+
+def affected_tests(impact_map, root):
+    """Select tests whose covered code changed since the map was recorded
+
+    Args:
+        impact_map (dict): Map written by --impact-record
+        root (Path): Directory the map's file names are relative to
+
+    Returns:
+        tuple: (set of affected node ids, list of changed file names)
+    """
+    affected, changed_files = set(), []
+    tests_by_file = defaultdict(dict)
+    for nodeid, files in impact_map["tests"].items():
+        for name, lines in files.items():
+            tests_by_file[name][nodeid] = lines
+
+    for name, info in impact_map["files"].items():
+        path = root / name
+        if _digest(path) == info["sha1"]:
+            continue
+        changed_files.append(name)
+        covering = tests_by_file.get(name, {})
+        if not path.exists():
+            affected.update(covering)
+            continue
+        spans = [tuple(span) for span in info["functions"]]
+        for line in changed_lines(info["lines"], path.read_text(encoding="utf-8")):
+            span = _innermost_span(spans, line)
+            if span is None:  # module-level change: anything using the file
+                affected.update(covering)
+                break
+            affected.update(nodeid for nodeid, lines in covering.items()
+                            if any(span[0] <= covered <= span[1] for covered in lines))
+    return affected, changed_files
+
+
+class _CoverageRecorder:
+    """Measures coverage with one dynamic context per test"""
+
+    def __init__(self, config):
+        import coverage  # only needed when recording
+
+        self.config = config
+        self.root = config.rootpath
+        self.coverage = coverage.Coverage(
+            data_file=None, config_file=False, source=[str(self.root)],
+            omit=[f"*/{name}/*" for name in EXCLUDED_DIRS],
+        )
+        self.coverage.start()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self.coverage.switch_context(item.nodeid)
+        yield
+        self.coverage.switch_context("")
+
+    def pytest_sessionfinish(self, session):
+        self.coverage.stop()
+        data = self.coverage.get_data()
+        tests = defaultdict(dict)
+        files = {}
+        for filename in data.measured_files():
+            name = Path(os.path.relpath(filename, self.root)).as_posix()
+            if name.startswith(".."):
+                continue
+            for line, contexts in data.contexts_by_lineno(filename).items():
+                for nodeid in contexts:
+                    if nodeid:
+                        tests[nodeid].setdefault(name, []).append(line)
+            text = Path(filename).read_text(encoding="utf-8")
+            files[name] = {
+                "sha1": _digest(filename),
+                "lines": line_hashes(text),
+                "functions": function_spans(text),
+            }
+        ran = {item.nodeid for item in session.items}
+        write_map(_map_path(self.config), self.root, tests, files, ran)
+
+
+def write_map(path, root, tests, files, ran):
+    """Merge freshly recorded tests and files into the map at path
+
+    Tests recorded earlier are kept unless they ran again or covered a file
+    that changed since (their line numbers no longer apply); dropped tests
+    count as new and run on the next --impact run.
+    """
+    old = load_map(path)
+    kept_tests, kept_files = {}, {}
+    if old is not None and stale_reason(old, root) is None:
+        changed = {name for name, info in old["files"].items()
+                   if name in files and files[name]["sha1"] != info["sha1"]}
+        kept_files = {name: info for name, info in old["files"].items() if name not in changed}
+        kept_tests = {nodeid: covered for nodeid, covered in old["tests"].items()
+                      if nodeid not in ran and not changed.intersection(covered)}
+    for covered in tests.values():
+        for lines in covered.values():
+            lines.sort()
+    impact_map = {
+        "version": MAP_VERSION,
+        "environment": _environment(),
+        "global_files": {name: _digest(root / name) for name in _global_files(root)},
+        "files": {**kept_files, **files},
+        "tests": {**kept_tests, **tests},
+    }
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(impact_map, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, path)
+
+
+def pytest_configure(config):
+    if not config.getoption("--impact-record"):
+        return
+    if getattr(config.option, "cov_source", None):
+        raise pytest.UsageError("--impact-record cannot be combined with --cov")
+    config.pluginmanager.register(_CoverageRecorder(config), "impact-recorder")
+
+
+def pytest_collection_modifyitems(config, items):
+    if not config.getoption("--impact"):
+        return
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    impact_map = load_map(_map_path(config))
+    reason = stale_reason(impact_map, config.rootpath)
+    if reason is not None:
+        if reporter is not None:
+            reporter.write_line(f"impact: {reason} - running all tests")
+        return
+
+    affected, changed_files = affected_tests(impact_map, config.rootpath)
+    selected, deselected = [], []
+    for item in items:
+        if item.nodeid in affected or item.nodeid not in impact_map["tests"]:
+            selected.append(item)
+        else:
+            deselected.append(item)
+    if reporter is not None:
+        changes = ", ".join(changed_files) or "no changes"
+        reporter.write_line(f"impact: {len(selected)} of {len(items)} tests affected ({changes})")
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
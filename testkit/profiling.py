@@ -0,0 +1,167 @@
+# Profiling - Per-test CPU and memory profiles, attached to the test report
+#
+# Enable for every test with --profile, or for single tests with
+# @pytest.mark.profile. For each profiled test the plugin records:
+#   - cProfile call stats (the hottest functions by cumulative time)
+#   - tracemalloc peak memory and the top (still live) allocation sites
+#   - sampled call stacks in "collapsed" format (<profile-dir>/<test>.collapsed),
+#     ready for flamegraph.pl or speedscope
+# The summary is added as a "profile" section (terminal and pytest-html
+# log) and as a pytest-html text extra. Tests that are not profiled only
+# pay for one marker lookup.
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+try:
+    from pytest_html import extras as html_extras
+except ImportError:  # pytest-html is optional - the terminal section still works
+    html_extras = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("profiling", "per-test CPU and memory profiling")
+    group.addoption("--profile", action="store_true",
+                    help="profile every test (otherwise only tests marked 'profile')")
+    group.addoption("--profile-top", type=int, default=15,
+                    help="number of hot functions / allocation sites to report (default: 15)")
+    group.addoption("--profile-dir", default=None,
+                    help="where collapsed stacks are written (default: <rootdir>/.profiles)")
+    group.addoption("--profile-interval", type=float, default=0.001,
+                    help="stack sampling interval in seconds (default: 0.001)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "profile: collect CPU and memory profiles for this test")
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's call stack at a fixed interval"""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class Profiler:
+    """Context manager collecting cProfile stats, tracemalloc data and stack samples"""
+
+    def __init__(self, top=15, interval=0.001):
+        self.top = top
+        self.interval = interval
+        self.profile = cProfile.Profile()
+        self.peak_bytes = 0
+        self.allocations = []
+        self._sampler = None
+        self._owns_tracemalloc = False
+
+    def __enter__(self):
+        self._owns_tracemalloc = not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        self._sampler = _StackSampler(threading.get_ident(), self.interval)
+        self._sampler.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        self._sampler.stop()
+        self.peak_bytes = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        self.allocations = snapshot.statistics("lineno")[:self.top]
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+        return False
+
+    def hot_functions(self):
+        """cProfile table of the top functions by cumulative time"""
+        out = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=out)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(self.top)
+        return out.getvalue().strip()
+
+    def collapsed_stacks(self):
+        """Sampled stacks as 'outer;inner;leaf count' lines (flame graph input)"""
+        return [f"{stack} {count}" for stack, count in self._sampler.stacks.most_common()]
+
+    def summary(self):
+        """Human-readable report: peak memory, allocation sites, hot functions"""
+        lines = [f"peak traced memory: {self.peak_bytes / 1024:.1f} KiB",
+                 "allocation sites still holding memory at the end:"]
+        for stat in self.allocations:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size / 1024:10.1f} KiB  {stat.count:7} blocks  "
+                         f"{frame.filename}:{frame.lineno}")
+        lines.append("")
+        lines.append(self.hot_functions())
+        return "\n".join(lines)
+
+
+def _profile_enabled(item):
+    return item.config.getoption("--profile") or item.get_closest_marker("profile") is not None
+
+
+def _stack_file(config, nodeid):
+    directory = Path(config.getoption("--profile-dir") or config.rootpath / ".profiles")
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / (re.sub(r"[^\w.-]+", "_", nodeid).strip("_") + ".collapsed")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    if not _profile_enabled(item):
+        yield
+        return
+    config = item.config
+    profiler = Profiler(config.getoption("--profile-top"), config.getoption("--profile-interval"))
+    with profiler:
+        yield
+    stack_file = _stack_file(config, item.nodeid)
+    stack_file.write_text("\n".join(profiler.collapsed_stacks()) + "\n", encoding="utf-8")
+    item._profile_summary = f"{profiler.summary()}\n\ncollapsed stacks: {stack_file}"
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    summary = getattr(item, "_profile_summary", None)
+    if summary is None or call.when != "call":
+        return
+    report = outcome.get_result()
+    report.sections.append(("profile", summary))
+    if html_extras is not None:
+        report.extras = getattr(report, "extras", []) + [html_extras.text(summary, name="Profile")]
@@ -0,0 +1,370 @@
+# Replay - Record HTTP responses once, then serve them offline
+#
+# Responses are stored in a cassette directory keyed by method, URL and
+# request body. The `requests` side plugs in as a transport adapter; the
+# browser side talks to a small localhost server that mirrors remote
+# sites (http://127.0.0.1:<port>/https/example.com/path) and also accepts
+# plain-HTTP forward-proxy requests. Absolute and protocol-relative links
+# in mirrored HTML, CSS and JavaScript are rewritten to mirror URLs, so
+# following a link or submitting a form stays on the mirror.
+#
+# Server errors and 429s are not recorded (they are usually transient);
+# pass record_filter to make_session()/ReplayAdapter to change that.
+#
+# Cassettes are not committed (cassettes/ is in .gitignore): the first
+# run with network access records them (record mode "once"). Run that
+# first before going offline with --record-mode=none; CI keeps cassettes/
+# in its cache between runs. Set-Cookie and Content-Security-Policy
+# headers are never recorded, so no session cookies end up on disk and
+# the original site's CSP cannot block the mirror.
+#
+# Record modes (--record-mode):
+#   once     replay what is recorded, record what is missing (default)
+#   refresh  always go to the network and overwrite the recordings
+#   none     replay only; a missing recording is an error (fully offline)
+#   off      bypass the cassettes entirely and hit the live sites
+
+import base64
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+RECORD_MODES = ("once", "refresh", "none", "off")
+
+# Headers that describe the original transfer rather than the stored body
+_TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection",
+                     "keep-alive"}
+# Headers that are dropped when recording and mirroring
+_STRIPPED_HEADERS = {"set-cookie", "content-security-policy",
+                     "content-security-policy-report-only"}
+# Transient failures worth retrying (with exponential backoff) when recording
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Request headers worth passing on from the browser to the real site
+_FORWARDED_HEADERS = ("Accept", "Accept-Language", "Content-Type", "User-Agent")
+# Bodies whose absolute links are rewritten to point at the mirror
+_REWRITTEN_TYPES = ("text/html", "text/css", "javascript")
+# https://host, http://host or //host right after a quote, "(" or "="
+_ABSOLUTE_URL = re.compile(
+    rb"""(?<=["'(=])(https?:)?//([A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+(?::\d+)?)"""
+)
+
+
+def is_recordable(response):
+    """Default record filter: skip 5xx and 429 answers, which are usually transient"""
+    return response.status_code < 500 and response.status_code != 429
+
+
+class CassetteStore:
+    """Directory of recorded responses, one JSON file per request"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(method, url, body=b""):
+        """Cache key of a request: hash of method, URL and body"""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        digest = hashlib.sha256(f"{method.upper()} {url}\n".encode("utf-8"))
+        digest.update(body or b"")
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def load(self, method, url, body=b""):
+        """Return the recorded response for a request, or None"""
+        try:
+            with open(self._path(self.key(method, url, body)), encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        response = entry["response"]
+        response["body"] = base64.b64decode(response["body"])
+        return response
+
+    def save(self, method, url, body, status, reason, headers, content):
+        """Record a response (written atomically so parallel workers never see half a file)"""
+        path = self._path(self.key(method, url, body))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "request": {"method": method.upper(), "url": url},
+            "response": {
+                "status": status,
+                "reason": reason,
+                "headers": [[k, v] for k, v in headers
+                            if k.lower() not in _TRANSFER_HEADERS | _STRIPPED_HEADERS],
+                "body": base64.b64encode(content).decode("ascii"),
+            },
+        }
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=1)
+        os.replace(tmp, path)
+
+
+class ReplayAdapter(HTTPAdapter):
+    """requests transport adapter that answers from a CassetteStore
+
+    record_filter(response) decides which live responses are stored
+    (default: is_recordable). Extra keyword arguments go to HTTPAdapter
+    (pool sizes, retries).
+    """
+
+    def __init__(self, store, mode="once", record_filter=is_recordable, **kwargs):
+        if mode not in RECORD_MODES:
+            raise ValueError(f"unknown record mode {mode!r}, expected one of {RECORD_MODES}")
+        super().__init__(**kwargs)
+        self.store = store
+        self.mode = mode
+        self.record_filter = record_filter
+
+    def send(self, request, **kwargs):
+        if self.mode == "off":
+            return super().send(request, **kwargs)
+        body = request.body or b""
+        if self.mode != "refresh":
+            recorded = self.store.load(request.method, request.url, body)
+            if recorded is not None:
+                return self._build_recorded(request, recorded)
+            if self.mode == "none":
+                raise ConnectionError(
+                    f"no recording for {request.method} {request.url} (record mode 'none')",
+                    request=request,
+                )
+        response = super().send(request, **kwargs)
+        if self.record_filter(response):
+            self.store.save(request.method, request.url, body, response.status_code,
+                            response.reason, response.headers.items(), response.content)
+        return response
+
+    def _build_recorded(self, request, recorded):
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded["reason"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = recorded["body"]
+        response._content_consumed = True
+        response.raw = io.BytesIO(recorded["body"])
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+def make_retry(total=3, backoff_factor=0.3):
+    """urllib3 Retry for connection errors and transient 429/5xx answers"""
+    return Retry(
+        total=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+
+
+def make_session(store, mode="once", **adapter_kwargs):
+    """requests.Session whose http(s) traffic goes through a ReplayAdapter
+
+    adapter_kwargs are passed to ReplayAdapter, e.g. record_filter, and to
+    HTTPAdapter, e.g. pool_maxsize (keep-alive connections per host, should
+    be >= the number of concurrent requests) and max_retries.
+    """
+    session = requests.Session()
+    adapter = ReplayAdapter(store, mode, **adapter_kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class _MirrorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # keep test output clean
+
+    def _target_url(self):
+        """Work out which remote URL the browser is asking for"""
+        if self.path.startswith(("http://", "https://")):
+            return self.path  # forward-proxy request
+        scheme, _, rest = self.path.lstrip("/").partition("/")
+        if scheme in ("http", "https") and rest:
+            return f"{scheme}://{rest}"
+        # A root-relative link (/static/app.css) on a mirrored page: resolve
+        # it against the site of the page that referenced it.
+        referer = urlsplit(self.headers.get("Referer", ""))
+        scheme, _, rest = referer.path.lstrip("/").partition("/")
+        host = rest.split("/", 1)[0]
+        if scheme in ("http", "https") and host:
+            return f"{scheme}://{host}{self.path}"
+        return None
+
+    def _handle(self):
+        url = self._target_url()
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        if url is None:
+            return self._reply(404, "Not Found", [], b"not a mirrored URL")
+        headers = {k: self.headers[k] for k in _FORWARDED_HEADERS if k in self.headers}
+        try:
+            response = self.server.session.request(
+                self.command, url, data=body, headers=headers,
+                allow_redirects=False, timeout=30,
+            )
+        except requests.RequestException as exc:
+            return self._reply(504, "Gateway Timeout", [], str(exc).encode("utf-8"))
+        out_headers = []
+        for name, value in response.headers.items():
+            if name.lower() in _TRANSFER_HEADERS | _STRIPPED_HEADERS:
+                continue
+            if name.lower() == "location":
+                value = self.server.mirror_url(requests.compat.urljoin(url, value))
+            out_headers.append((name, value))
+        content = response.content
+        if any(kind in response.headers.get("Content-Type", "") for kind in _REWRITTEN_TYPES):
+            content = self.server.rewrite_links(content, url)
+        self._reply(response.status_code, response.reason, out_headers, content)
+
+    def _reply(self, status, reason, headers, content):
+        self.send_response(status, reason)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _handle
+
+    def do_CONNECT(self):
+        # Tunnelled HTTPS cannot be recorded without intercepting TLS.
+        self._reply(501, "Not Implemented", [],
+                    b"HTTPS tunnels are not recorded; navigate to mirror_url(url) instead")
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Localhost stand-in for remote sites, backed by a replaying session"""
+
+    daemon_threads = True
+
+    def __init__(self, session, host="127.0.0.1", port=0):
+        super().__init__((host, port), _MirrorHandler)
+        self.session = session
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def mirror_url(self, url):
+        """Local URL that serves the given remote URL"""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            return url
+        path = parts.path or "/"
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base_url}/{parts.scheme}/{parts.netloc}{path}{query}"
+
+    def rewrite_links(self, content, page_url):
+        """Point absolute and protocol-relative URLs in a text body at the mirror"""
+        scheme = urlsplit(page_url).scheme.encode("ascii")
+        own_host = self.base_url.split("//", 1)[1].encode("ascii")
+
+        def local(match):
+            host = match.group(2)
+            if host == own_host:
+                return match.group(0)
+            link_scheme = match.group(1)[:-1] if match.group(1) else scheme
+            return self.base_url.encode("ascii") + b"/" + link_scheme + b"/" + host
+
+        return _ABSOLUTE_URL.sub(local, content)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("replay", "offline HTTP record/replay")
+    group.addoption("--record-mode", choices=RECORD_MODES, default="once",
+                    help="once: record missing responses, replay the rest (default); "
+                         "refresh: re-record everything; none: replay only; "
+                         "off: use the live network")
+    group.addoption("--cassette-dir", default=None,
+                    help="where recorded responses are stored (default: <rootdir>/cassettes)")
+    group.addoption("--http-pool-size", type=int, default=20,
+                    help="keep-alive connections per host in http_session (default: 20)")
+    group.addoption("--http-retries", type=int, default=3,
+                    help="retries with backoff for failed live requests (default: 3)")
+
+
+def _adapter_kwargs(config):
+    """HTTPAdapter settings for the shared sessions"""
+    pool_size = config.getoption("--http-pool-size")
+    return {
+        "pool_connections": pool_size,
+        "pool_maxsize": pool_size,
+        "max_retries": make_retry(config.getoption("--http-retries")),
+    }
+
+
+@pytest.fixture(scope="session")
+def record_mode(pytestconfig):
+    """The --record-mode of this run"""
+    return pytestconfig.getoption("--record-mode")
+
+
+@pytest.fixture(scope="session")
+def cassette_store(pytestconfig):
+    """CassetteStore for this run"""
+    directory = pytestconfig.getoption("--cassette-dir") or pytestconfig.rootpath / "cassettes"
+    return CassetteStore(directory)
+
+
+@pytest.fixture(scope="session")
+def http_session(pytestconfig, cassette_store, record_mode):
+    """Shared requests.Session: pooled keep-alive connections, retries with
+    backoff, and record/replay through the cassette store"""
+    with make_session(cassette_store, record_mode, **_adapter_kwargs(pytestconfig)) as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def replay_server(pytestconfig, cassette_store, record_mode):
+    """Running ReplayServer, or None when --record-mode=off"""
+    if record_mode == "off":
+        yield None
+        return
+    with make_session(cassette_store, record_mode, **_adapter_kwargs(pytestconfig)) as session:
+        server = ReplayServer(session).start()
+        yield server
+        server.stop()
+
+
+@pytest.fixture(scope="session")
+def replay_url(replay_server):
+    """Map a remote URL to the URL a browser should load for it"""
+    if replay_server is None:
+        return lambda url: url
+    return replay_server.mirror_url
@@ -0,0 +1,259 @@
+# Scheduler - Split the suite over worker processes by historical duration
+#
+#   python -m testkit.scheduler -n 8 python_tests selenium_tests
+#
+# 1. collects the suite (pytest --collect-only) together with the
+#    fixtures every test uses,
+# 2. groups tests that must share a worker: tests using a "serial"
+#    fixture such as the Selenium `driver` stay together per module, so
+#    each module warms up one browser instead of one per worker,
+# 3. packs the groups onto N workers longest-processing-time first, using
+#    the durations recorded by earlier runs (.test_durations.json),
+# 4. runs one pytest process per worker (each one collects the same
+#    arguments and keeps only its share via --schedule-include), records
+#    the new durations and prints a per-worker load report.
+#
+# The pytest side of this module (loaded from the root conftest) records
+# durations with --store-durations and exports collection data for step 1.
+
+import argparse
+import heapq
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+DEFAULT_SERIAL_FIXTURES = ("driver", "browser_pool")
+# Guess for tests that have never run when no history exists at all
+DEFAULT_DURATION = 1.0
+# Weight of the newest run when updating stored durations
+SMOOTHING = 0.5
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("scheduler", "duration store for the parallel scheduler")
+    group.addoption("--store-durations", action="store_true",
+                    help="record how long every test took into the duration store")
+    group.addoption("--durations-path", default=None,
+                    help="duration store (default: <rootdir>/.test_durations.json)")
+    group.addoption("--collect-schedule", default=None, metavar="PATH",
+                    help="write collected test ids and their fixtures to PATH as JSON")
+    group.addoption("--schedule-include", default=None, metavar="PATH",
+                    help="only run the test ids listed (one per line) in PATH")
+
+
+def _durations_path(config):
+    path = config.getoption("--durations-path")
+    return Path(path) if path else config.rootpath / ".test_durations.json"
+
+
+def load_durations(path):
+    """Read a duration store; a missing or broken file counts as empty"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def merge_durations(path, new):
+    """Blend new durations into the store at path (exponential smoothing)"""
+    stored = load_durations(path)
+    for nodeid, seconds in new.items():
+        old = stored.get(nodeid)
+        stored[nodeid] = seconds if old is None else SMOOTHING * seconds + (1 - SMOOTHING) * old
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(stored, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+class _DurationRecorder:
+    """Sums setup + call + teardown per test and merges them into the store"""
+
+    def __init__(self, path):
+        self.path = path
+        self.durations = defaultdict(float)
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] += report.duration
+
+    def pytest_sessionfinish(self):
+        if self.durations:
+            merge_durations(self.path, dict(self.durations))
+
+
+def pytest_configure(config):
+    if config.getoption("--store-durations"):
+        config.pluginmanager.register(_DurationRecorder(_durations_path(config)),
+                                      "duration-recorder")
+
+
+def pytest_collection_modifyitems(config, items):
+    path = config.getoption("--schedule-include")
+    if path is None:
+        return
+    with open(path, encoding="utf-8") as f:
+        wanted = set(f.read().splitlines())
+    selected = [item for item in items if item.nodeid in wanted]
+    deselected = [item for item in items if item.nodeid not in wanted]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_collection_finish(session):
+    path = session.config.getoption("--collect-schedule")
+    if path is None:
+        return
+    tests = [{"nodeid": item.nodeid, "fixtures": sorted(getattr(item, "fixturenames", ()))}
+             for item in session.items]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tests, f)
+
+
+def group_tests(tests, serial_fixtures=DEFAULT_SERIAL_FIXTURES):
+    """Bundle tests that must run in the same worker
+
+    Args:
+        tests (list): {"nodeid": ..., "fixtures": [...]} dicts
+        serial_fixtures (iterable): Fixtures whose tests stay together per module
+
+    Returns:
+        list: Lists of node ids; every list is scheduled as a unit
+    """
+    serial_fixtures = set(serial_fixtures)
+    groups = defaultdict(list)
+    for test in tests:
+        nodeid = test["nodeid"]
+        shared = sorted(serial_fixtures.intersection(test["fixtures"]))
+        if shared:
+            key = (shared[0], nodeid.split("::", 1)[0])
+        else:
+            key = ("", nodeid)
+        groups[key].append(nodeid)
+    return list(groups.values())
+
+
+def estimate(nodeid, durations):
+    """Expected duration of a test: its history, else the median of all history"""
+    if nodeid in durations:
+        return durations[nodeid]
+    if durations:
+        return statistics.median(durations.values())
+    return DEFAULT_DURATION
+
+
+def lpt_schedule(groups, durations, workers):
+    """Longest-processing-time-first bin packing of groups onto workers
+
+    Returns:
+        list: One (predicted_seconds, [node ids]) tuple per worker
+    """
+    weighted = sorted(
+        ((sum(estimate(nodeid, durations) for nodeid in group), group) for group in groups),
+        key=lambda pair: pair[0],
+        reverse=True,
+    )
+    loads = [(0.0, index) for index in range(workers)]
+    assigned = [[] for _ in range(workers)]
+    for seconds, group in weighted:
+        load, index = heapq.heappop(loads)
+        assigned[index].extend(group)
+        heapq.heappush(loads, (load + seconds, index))
+    predicted = {index: load for load, index in loads}
+    return [(predicted[index], assigned[index]) for index in range(workers)]
+
+
+def _collect(pytest_args, workdir):
+    path = Path(workdir) / "collected.json"
+    cmd = [sys.executable, "-m", "pytest", "--collect-only", "-q",
+           "--collect-schedule", str(path), *pytest_args]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    if not path.exists():
+        sys.stdout.write(result.stdout)
+        raise SystemExit(result.returncode or 1)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m testkit.scheduler",
+        description="Run pytest across worker processes, balanced by recorded test durations.",
+    )
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--serial-fixture", action="append", dest="serial_fixtures",
+                        help="fixture whose tests stay together per module "
+                             f"(default: {', '.join(DEFAULT_SERIAL_FIXTURES)})")
+    parser.add_argument("--durations-path", default=".test_durations.json")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    durations = load_durations(args.durations_path)
+    with tempfile.TemporaryDirectory(prefix="scheduler-") as workdir:
+        tests = _collect(pytest_args, workdir)
+        if not tests:
+            print("no tests collected")
+            return 5
+        groups = group_tests(tests, args.serial_fixtures or DEFAULT_SERIAL_FIXTURES)
+        plan = [(load, ids) for load, ids in lpt_schedule(groups, durations, args.workers) if ids]
+
+        started = time.perf_counter()
+        workers = []
+        for index, (load, nodeids) in enumerate(plan):
+            log_path = Path(workdir) / f"worker{index}.log"
+            store = Path(workdir) / f"durations{index}.json"
+            include = Path(workdir) / f"tests{index}.txt"
+            include.write_text("\n".join(nodeids), encoding="utf-8")
+            cmd = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+                   f"--schedule-include={include}",
+                   "--store-durations", f"--durations-path={store}", *pytest_args]
+            log = open(log_path, "w", encoding="utf-8")
+            process = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT,
+                                       env={**os.environ, "SCHEDULER_WORKER": str(index)})
+            workers.append((index, load, nodeids, process, log, log_path, store, time.perf_counter()))
+
+        finished = []
+        running = workers
+        while running:
+            time.sleep(0.05)
+            still_running = []
+            for worker in running:
+                index, load, nodeids, process, log, log_path, store, worker_start = worker
+                code = process.poll()
+                if code is None:
+                    still_running.append(worker)
+                    continue
+                log.close()
+                finished.append((index, load, len(nodeids), code, time.perf_counter() - worker_start))
+                merge_durations(args.durations_path, load_durations(store))
+                if code not in (0, 5):
+                    print(f"----- worker {index} output -----")
+                    print(log_path.read_text(encoding="utf-8"))
+            running = still_running
+        wall = time.perf_counter() - started
+        finished.sort()
+
+    print(f"{'worker':>6} {'tests':>6} {'predicted':>10} {'actual':>8} {'exit':>5}")
+    codes = []
+    for index, load, count, code, seconds in finished:
+        print(f"{index:>6} {count:>6} {load:>9.1f}s {seconds:>7.1f}s {code:>5}")
+        if code != 5:  # 5 = no tests ran in that worker
+            codes.append(code)
+    total = sum(load for _, load, _, _, _ in finished)
+    print(f"wall time {wall:.1f}s for {total:.1f}s of predicted serial work "
+          f"on {len(finished)} workers")
+    return max(codes, default=0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
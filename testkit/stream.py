@@ -0,0 +1,334 @@
+# Stream - Write every test result to a JSONL file the moment it finishes
+#
+#   pytest --stream-report test-results/pytest.jsonl
+#   tail -f test-results/pytest.jsonl                   # watch a run live
+#   python -m testkit.stream --junit out.xml --html out.html test-results/*.jsonl
+#
+# One JSON object per line: a "session_start" line, one "test" line per
+# finished test (outcome, timing, captured output, failure text) and a
+# "session_finish" line. Every line reaches the OS as soon as it is
+# written (so tail -f sees it); fsync runs at most every
+# --stream-fsync-interval seconds, so a machine crash loses at most that
+# much. javascript_tests/jsonl-reporter.js writes the same format for
+# Playwright. A test that is retried gets one line per attempt ("attempt"
+# counts from 1); the merge tool reports only the last attempt.
+#
+# Each run starts its stream afresh, so a file always holds one session
+# and merging it never counts an earlier run's results. Under
+# pytest-xdist only the controller writes (workers' reports reach it).
+#
+# The merge tool reads the streams a few times (retried tests, totals,
+# then test cases) instead of loading them, so memory only grows with the
+# number of retried tests.
+
+import argparse
+import html
+import json
+import os
+import re
+import socket
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape, quoteattr
+
+OUTCOMES = ("passed", "failed", "error", "skipped")
+# Control characters are not allowed in XML 1.0 (ANSI colour codes, mostly)
+_XML_INVALID = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("stream", "streaming JSONL result reporter")
+    group.addoption("--stream-report", default=None, metavar="PATH",
+                    help="write every test result to PATH as JSON lines "
+                         "(replacing an earlier run's stream)")
+    group.addoption("--stream-fsync-interval", type=float, default=1.0,
+                    help="seconds between flush + fsync of the stream (default: 1.0)")
+
+
+class StreamWriter:
+    """JSONL writer: every line is flushed to the OS, fsync runs at most every interval
+
+    The file is truncated on open; a stream holds a single session.
+    """
+
+    def __init__(self, path, fsync_interval=1.0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "w", encoding="utf-8")
+        self.fsync_interval = fsync_interval
+        self._last_sync = time.monotonic()
+
+    def write(self, entry):
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        if time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+
+def _split_nodeid(nodeid):
+    """JUnit-style (classname, name) for a pytest node id"""
+    path, _, rest = nodeid.partition("::")
+    parts = rest.split("::") if rest else [path]
+    module = path[:-3] if path.endswith(".py") else path
+    classname = ".".join([module.replace("/", ".")] + parts[:-1])
+    return classname, parts[-1]
+
+
+def _message(report):
+    if report.skipped and isinstance(report.longrepr, tuple):
+        return report.longrepr[2]
+    return report.longreprtext
+
+
+def _summary(report):
+    """One-line failure reason, like the JUnit message pytest itself writes"""
+    crash = getattr(report.longrepr, "reprcrash", None)
+    if crash is not None:
+        return crash.message.splitlines()[0] if crash.message else ""
+    lines = _message(report).strip().splitlines()
+    return lines[-1] if lines else ""
+
+
+class _StreamReporter:
+    """Turns the setup/call/teardown reports of each test into one line"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self._phases = {}
+        self._attempts = defaultdict(int)  # reruns (e.g. pytest-rerunfailures) repeat a nodeid
+
+    def pytest_sessionstart(self, session):
+        self.writer.write({"event": "session_start", "suite": "pytest", "time": time.time(),
+                           "host": socket.gethostname(), "pid": os.getpid()})
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            classname, name = _split_nodeid(report.nodeid)
+            self.writer.write({
+                "event": "test", "suite": "pytest", "nodeid": report.nodeid,
+                "classname": classname, "name": name, "outcome": "error",
+                "duration": 0.0, "start": time.time(), "summary": _summary(report),
+                "message": report.longreprtext, "stdout": "", "stderr": "", "log": "",
+            })
+
+    def pytest_runtest_logreport(self, report):
+        self._phases.setdefault(report.nodeid, []).append(report)
+        if report.when == "teardown":
+            self.writer.write(self._entry(report.nodeid, self._phases.pop(report.nodeid)))
+
+    def _entry(self, nodeid, reports):
+        outcome, summary, message = "passed", "", ""
+        for report in reports:
+            if report.failed:
+                outcome = "failed" if report.when == "call" else "error"
+                summary, message = _summary(report), _message(report)
+                break
+            if report.skipped:
+                outcome = "skipped"
+                summary = message = getattr(report, "wasxfail", "") or _message(report)
+        classname, name = _split_nodeid(nodeid)
+        last = reports[-1]
+        self._attempts[nodeid] += 1
+        return {
+            "event": "test", "suite": "pytest", "nodeid": nodeid,
+            "classname": classname, "name": name, "outcome": outcome,
+            "attempt": self._attempts[nodeid],
+            "duration": sum(report.duration for report in reports),
+            "start": getattr(reports[0], "start", time.time()),
+            "summary": summary, "message": message,
+            # each phase's report repeats the output captured in earlier phases
+            "stdout": last.capstdout, "stderr": last.capstderr, "log": last.caplog,
+        }
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.writer.write({"event": "session_finish", "suite": "pytest", "time": time.time(),
+                           "exitstatus": int(exitstatus)})
+        self.writer.close()
+
+
+def pytest_configure(config):
+    path = config.getoption("--stream-report")
+    if path and not hasattr(config, "workerinput"):  # xdist workers report to the controller
+        writer = StreamWriter(path, config.getoption("--stream-fsync-interval"))
+        config.pluginmanager.register(_StreamReporter(writer), "stream-reporter")
+
+
+def _read_tests(paths):
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("event") == "test":
+                    yield entry
+
+
+def final_attempts(paths):
+    """(suite, nodeid) -> last attempt number, for retried tests only"""
+    retried = {}
+    for entry in _read_tests(paths):
+        attempt = entry.get("attempt", 1)
+        if attempt > 1:
+            key = (entry.get("suite", ""), entry["nodeid"])
+            retried[key] = max(retried.get(key, 1), attempt)
+    return retried
+
+
+def iter_results(paths, retried=None):
+    """Yield the "test" entries of JSONL streams, one at a time
+
+    A line that does not parse (e.g. the half-written last line of a
+    stream that is still being written) is skipped. Earlier attempts of
+    retried tests are skipped too; pass final_attempts(paths) as retried
+    to avoid reading the streams one more time.
+    """
+    if retried is None:
+        retried = final_attempts(paths)
+    for entry in _read_tests(paths):
+        last = retried.get((entry.get("suite", ""), entry["nodeid"]), 1)
+        if entry.get("attempt", 1) >= last:
+            yield entry
+
+
+def summarize(paths, retried=None):
+    """Per-suite counts and total time of the final attempts
+
+    Returns:
+        dict: suite -> {"tests", "passed", "failed", "error", "skipped", "time", "start"}
+    """
+    suites = defaultdict(lambda: {"tests": 0, "passed": 0, "failed": 0, "error": 0,
+                                  "skipped": 0, "time": 0.0, "start": None})
+    for entry in iter_results(paths, retried):
+        totals = suites[entry.get("suite", "")]
+        totals["tests"] += 1
+        totals[entry["outcome"]] += 1
+        totals["time"] += entry.get("duration", 0.0)
+        start = entry.get("start")
+        if start is not None and (totals["start"] is None or start < totals["start"]):
+            totals["start"] = start
+    return dict(suites)
+
+
+def _timestamp(epoch):
+    if epoch is None:
+        return ""
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec="seconds")
+
+
+def _xml(text):
+    return escape(_XML_INVALID.sub("", text))
+
+
+def _xml_attr(text):
+    return quoteattr(_XML_INVALID.sub("", text))
+
+
+def write_junit(paths, out):
+    """Build a JUnit XML report from JSONL streams without loading them"""
+    retried = final_attempts(paths)
+    suites = summarize(paths, retried)
+    totals = {key: sum(suite[key] for suite in suites.values())
+              for key in ("tests", "failed", "error", "skipped", "time")}
+    out.write('<?xml version="1.0" encoding="utf-8"?>\n')
+    out.write(f'<testsuites tests="{totals["tests"]}" failures="{totals["failed"]}" '
+              f'errors="{totals["error"]}" skipped="{totals["skipped"]}" '
+              f'time="{totals["time"]:.3f}">\n')
+    for suite, counts in suites.items():
+        out.write(f'<testsuite name={_xml_attr(suite)} tests="{counts["tests"]}" '
+                  f'failures="{counts["failed"]}" errors="{counts["error"]}" '
+                  f'skipped="{counts["skipped"]}" time="{counts["time"]:.3f}" '
+                  f'timestamp={_xml_attr(_timestamp(counts["start"]))}>\n')
+        for entry in iter_results(paths, retried):
+            if entry.get("suite", "") != suite:
+                continue
+            out.write(f'<testcase classname={_xml_attr(entry["classname"])} '
+                      f'name={_xml_attr(entry["name"])} time="{entry["duration"]:.3f}">\n')
+            tag = {"failed": "failure", "error": "error", "skipped": "skipped"}.get(entry["outcome"])
+            if tag:
+                summary = entry.get("summary") or entry["outcome"]
+                out.write(f'<{tag} message={_xml_attr(summary[:200])}>'
+                          f'{_xml(entry.get("message") or "")}</{tag}>\n')
+            if entry.get("stdout"):
+                out.write(f'<system-out>{_xml(entry["stdout"])}</system-out>\n')
+            if entry.get("stderr"):
+                out.write(f'<system-err>{_xml(entry["stderr"])}</system-err>\n')
+            out.write("</testcase>\n")
+        out.write("</testsuite>\n")
+    out.write("</testsuites>\n")
+
+
+HTML_HEAD = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Test results</title><style>
+body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; width: 100%; }
+td, th { border-bottom: 1px solid #ddd; padding: 4px 8px; text-align: left; vertical-align: top; }
+.passed { color: #2e7d32; } .failed, .error { color: #c62828; } .skipped { color: #f9a825; }
+pre { white-space: pre-wrap; margin: 0; }
+</style></head><body>
+"""
+
+
+def write_html(paths, out):
+    """Build a single-page HTML report from JSONL streams without loading them"""
+    retried = final_attempts(paths)
+    suites = summarize(paths, retried)
+    out.write(HTML_HEAD)
+    out.write("<h1>Test results</h1>\n<table><tr><th>Suite</th><th>Tests</th>"
+              + "".join(f"<th>{outcome.capitalize()}</th>" for outcome in OUTCOMES)
+              + "<th>Time</th></tr>\n")
+    for suite, counts in suites.items():
+        out.write(f"<tr><td>{html.escape(suite)}</td><td>{counts['tests']}</td>"
+                  + "".join(f"<td class=\"{outcome}\">{counts[outcome]}</td>" for outcome in OUTCOMES)
+                  + f"<td>{counts['time']:.2f}s</td></tr>\n")
+    out.write("</table>\n<h2>Tests</h2>\n<table><tr><th>Outcome</th><th>Test</th>"
+              "<th>Duration</th></tr>\n")
+    for entry in iter_results(paths, retried):
+        attempt = entry.get("attempt", 1)
+        retries = f" (attempt {attempt})" if attempt > 1 else ""
+        details = "".join(
+            f"<details><summary>{label}</summary><pre>{html.escape(entry[key])}</pre></details>"
+            for key, label in (("message", "Details"), ("stdout", "stdout"),
+                               ("stderr", "stderr"), ("log", "log"))
+            if entry.get(key)
+        )
+        out.write(f"<tr><td class=\"{entry['outcome']}\">{entry['outcome']}</td>"
+                  f"<td>{html.escape(entry['nodeid'])}{retries}{details}</td>"
+                  f"<td>{entry['duration']:.3f}s</td></tr>\n")
+    out.write("</table>\n</body></html>\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m testkit.stream",
+        description="Merge JSONL result streams into JUnit XML and/or HTML reports.",
+    )
+    parser.add_argument("streams", nargs="+", help="JSONL files written by the stream reporters")
+    parser.add_argument("--junit", metavar="PATH", help="write a JUnit XML report")
+    parser.add_argument("--html", metavar="PATH", help="write an HTML report")
+    args = parser.parse_args(argv)
+    if not (args.junit or args.html):
+        parser.error("nothing to do: pass --junit and/or --html")
+    for path, write in ((args.junit, write_junit), (args.html, write_html)):
+        if path:
+            with open(path, "w", encoding="utf-8") as out:
+                write(args.streams, out)
+            print(f"wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())